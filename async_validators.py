@@ -0,0 +1,177 @@
+"""
+asyncio entry points for regex_validators
+- Large batches are validated in a shared executor, in chunks, so the event
+  loop keeps serving other tasks meanwhile
+- Small inputs are validated inline: handing them off costs more than they do
+- Cancelling the awaiting task stops any chunks that have not started
+- Streams are read and validated one chunk at a time, only when the consumer
+  asks for more rows (backpressure), so memory stays bounded
+"""
+import asyncio
+import collections
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+import regex_validators
+import stream_validators
+from stream_validators import DEFAULT_CHUNK_ROWS, StreamStats, _failed_columns, _resolve_columns
+
+# Inputs up to this many rows are validated inline on the event loop
+INLINE_MAX_ROWS = 1_000
+# Rows per executor job: enough to amortize the hand-off, few enough that a
+# job finishes in a few milliseconds
+OFFLOAD_CHUNK_ROWS = 5_000
+# Executor jobs in flight per avalidate_many call
+MAX_PENDING_CHUNKS = 2
+
+_shared_executor = None
+
+
+def get_executor():
+    """
+    Returns the shared executor, creating it on first use
+    - One thread: matching holds the GIL, so more threads would add event-loop
+      lag rather than throughput; pass a ProcessPoolExecutor as executor= to
+      avalidate_many for multi-core work
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        _shared_executor = ThreadPoolExecutor(1, thread_name_prefix='validators')
+    return _shared_executor
+
+
+def shutdown_executor():
+    """
+    Stops the shared executor's thread (a later call starts a new one)
+    """
+    global _shared_executor
+    if _shared_executor is not None:
+        _shared_executor.shutdown()
+        _shared_executor = None
+
+
+def _validate_chunk(kind, rows):
+    return regex_validators.validate_many(kind, rows)
+
+
+async def avalidate_many(kind, iterable, executor=None, chunk_size=OFFLOAD_CHUNK_ROWS):
+    """
+    Awaitable validate_many
+    - Returns the same bytearray of 1/0 results in input order
+    - Inputs of up to INLINE_MAX_ROWS rows are validated inline
+    - Larger ones go to executor (default: get_executor()) in chunks of
+      chunk_size rows, at most MAX_PENDING_CHUNKS at a time
+    - Thread executors run the resolved Validator itself; a
+      ProcessPoolExecutor is sent its registry name, which its workers must know
+    """
+    validator = regex_validators._resolve(kind)
+    rows = iterable if isinstance(iterable, list) else list(iterable)
+    if len(rows) <= INLINE_MAX_ROWS:
+        return regex_validators.validate_many(validator, rows)
+    loop = asyncio.get_running_loop()
+    executor = executor or get_executor()
+    # A Validator object does not survive the trip to another process
+    job_kind = validator.name if isinstance(executor, ProcessPoolExecutor) else validator
+    pending = collections.deque()
+    result = bytearray()
+    try:
+        for start in range(0, len(rows), chunk_size):
+            pending.append(loop.run_in_executor(executor, _validate_chunk, job_kind,
+                                                rows[start:start + chunk_size]))
+            if len(pending) >= MAX_PENDING_CHUNKS:
+                result += await pending.popleft()
+        while pending:
+            result += await pending.popleft()
+    finally:
+        # Only left over when cancelled (or a chunk failed): drop the rest
+        for future in pending:
+            future.cancel()
+    return result
+
+
+def _read_and_check(iterator, chunk_rows, resolved):
+    # Runs in the executor: reading the source may block too
+    chunk = list(islice(iterator, chunk_rows))
+    return chunk, _failed_columns(chunk, resolved)
+
+
+async def _checked_chunks(rows, resolved, chunk_rows, executor):
+    # Yields (chunk, failed columns per row), producing each chunk on demand
+    loop = asyncio.get_running_loop()
+    if hasattr(rows, '__aiter__'):
+        iterator = rows.__aiter__()
+        while True:
+            chunk = []
+            async for row in iterator:
+                chunk.append(row)
+                if len(chunk) == chunk_rows:
+                    break
+            if not chunk:
+                return
+            if len(chunk) <= INLINE_MAX_ROWS:
+                yield chunk, _failed_columns(chunk, resolved)
+            else:
+                yield chunk, await loop.run_in_executor(executor, _failed_columns, chunk, resolved)
+            if len(chunk) < chunk_rows:
+                return
+    else:
+        iterator = iter(rows)
+        while True:
+            chunk, failed = await loop.run_in_executor(executor, _read_and_check, iterator,
+                                                       chunk_rows, resolved)
+            if not chunk:
+                return
+            yield chunk, failed
+
+
+async def avalidate_rows(rows, columns, invalid_only=False, chunk_rows=DEFAULT_CHUNK_ROWS,
+                         stats=None, header=None, first_row_number=1, executor=None):
+    """
+    Async iterator version of stream_validators.validate_rows
+    - rows: an iterable or async iterable of already-split rows
+    - Yields (row_number, row, failed_columns) like validate_rows
+    - Plain iterables are read and validated in executor (default:
+      get_executor(), which must be a thread executor here)
+    - The next chunk is only read once the consumer has taken every row of
+      the current one
+    """
+    resolved = _resolve_columns(columns, header)
+    if chunk_rows < 1:
+        raise ValueError('chunk_rows must be at least 1')
+    if stats is None:
+        stats = StreamStats()
+    stats._start = time.perf_counter() - stats.elapsed
+    executor = executor or get_executor()
+    row_number = first_row_number
+    async for chunk, failed_columns in _checked_chunks(rows, resolved, chunk_rows, executor):
+        for offset, (row, failed) in enumerate(zip(chunk, failed_columns)):
+            if failed:
+                stats.invalid_rows += 1
+            if failed or not invalid_only:
+                yield row_number + offset, row, failed
+        row_number += len(chunk)
+        stats.rows += len(chunk)
+        stats.elapsed = time.perf_counter() - stats._start
+
+
+async def avalidate_csv(source, columns, header=False, invalid_only=False,
+                        chunk_rows=DEFAULT_CHUNK_ROWS, stats=None, executor=None, **csv_options):
+    """
+    Async iterator version of stream_validators.validate_csv
+    - Same arguments and (row_number, row, failed_columns) items
+    - File reads happen in executor, never on the event loop
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or get_executor()
+    with stream_validators._open(source) as f:
+        reader = csv.reader(f, **csv_options)
+        names = None
+        first_row_number = 1
+        if header:
+            names = await loop.run_in_executor(executor, next, reader, [])
+            first_row_number = 2
+        async for item in avalidate_rows(reader, columns, invalid_only, chunk_rows, stats, names,
+                                         first_row_number, executor):
+            yield item
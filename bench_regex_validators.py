@@ -0,0 +1,796 @@
+"""
+Benchmarks for regex_validators
+Run all:  python bench_regex_validators.py
+Run some: python bench_regex_validators.py registry
+"""
+import asyncio
+import datetime
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import async_validators
+import column_validators
+import incremental_validators
+import mmap_validators
+import parallel_validators
+import regex_validators as rv
+import scan_validators
+import schema_validators
+import server_validators
+import stream_validators
+
+# A few valid and invalid samples for every built-in validator
+SAMPLES = {
+    'military_time': ['0000', '1534', '2359', '2400', '12:34'],
+    'currency': ['$0.01', '$1,234.56', '$123,456,789.23', '$12,34.56', '123.45'],
+    'url': ['google.com', 'https://www.google.com/search', 'mail.google.com', 'google..com', 'google.c'],
+    'ssn': ['123-45-6789', '123 45 6789', '246813579', '666-12-3456', '123-45 6789'],
+    'phone': ['(253)123-4567', '253-123-4567', '2531234567', '(000)000-0000', '253.123.4567'],
+    'email': ['linda@uw.edu', 'john.doe@company.com', 'user@mail.google.com', 'user@domain', '@domain.com'],
+    'roster_name': ['Smith, John', 'Smith, John, L.', "O'Brien, Mary, A, B", 'smith, John', 'Smith,John'],
+    'address': ['123 Main St', '4567 Elm Street', '89 Martin Luther King Blvd', '123 Main Dr', 'Main St'],
+    'city_state_zip': ['Seattle, WA 98101', 'New York, NY 10001-1234', 'Austin, TX 78701', 'Nowhere, ZZ 99999', 'Seattle WA 98101'],
+    'date': ['01-15-2026', '2/29/2024', '12/31/1999', '02-30-2026', '01-15/2026'],
+    'password': ['Ab1!Cd2@Ef', 'XyZ9#aBc$1Q', 'P@ssW0rD!!x', 'password12!', 'Short1!'],
+    'ion_words': ['ion', 'union', 'onion', 'action', 'lion1'],
+}
+
+
+def calls_per_sec(func, inputs, min_time=0.1, repeat=3):
+    """
+    Calls func on every input repeatedly for at least min_time seconds
+    - Returns the best calls per second out of repeat rounds
+    """
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            for text in inputs:
+                func(text)
+            calls += len(inputs)
+            elapsed = time.perf_counter() - start
+        best = max(best, calls / elapsed)
+    return best
+
+
+def _uncompiled(validator):
+    # The pre-registry behaviour: look the pattern string up in re's cache on every call
+    pattern, flags, rule = validator.pattern, validator.regex.flags, validator.rule
+
+    def check(text):
+        match = re.match(pattern, text, flags)
+        if match is None:
+            return False
+        return True if rule is None else rule(match)
+    return check
+
+
+def bench_registry():
+    """Calls/sec per validator: per-call pattern strings (before) vs compiled registry (after)"""
+    print(f'{"validator":<16}{"before":>14}{"after":>14}{"speedup":>10}')
+    for name, inputs in SAMPLES.items():
+        validator = rv.get_validator(name)
+        before = calls_per_sec(_uncompiled(validator), inputs)
+        after = calls_per_sec(validator, inputs)
+        print(f'{name:<16}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x')
+
+
+def rows_per_sec(func, rows, repeat=3):
+    """
+    Runs func(rows) repeat times and returns the best rows per second
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+
+def bench_batch(rows=200_000):
+    """Rows/sec: per-row validate_* loop vs validate_many on dense and sparse columns"""
+    print(f'{"validator":<16}{"column":<8}{"loop":>14}{"map":>14}{"joined":>14}{"auto":>14}')
+    for name, inputs in SAMPLES.items():
+        validator = rv.get_validator(name)
+        # dense: every sample in turn; sparse: one sample among mostly-empty cells
+        columns = {
+            'dense': (inputs * (rows // len(inputs) + 1))[:rows],
+            'sparse': ([inputs[0]] + [''] * 19) * (rows // 20),
+        }
+        for shape, column in columns.items():
+            loop = rows_per_sec(lambda r: bytearray(validator(t) for t in r), column)
+            mapped = rows_per_sec(lambda r: rv.validate_many(validator, r, method='map'), column)
+            auto = rows_per_sec(lambda r: rv.validate_many(validator, r), column)
+            if validator.lines_regex is None:
+                joined = '-'
+            else:
+                joined = f'{rows_per_sec(lambda r: rv.validate_many(validator, r, method="joined"), column):,.0f}'
+            print(f'{name:<16}{shape:<8}{loop:>14,.0f}{mapped:>14,.0f}{joined:>14}{auto:>14,.0f}')
+
+
+def _write_csv(path, rows):
+    # Columns: name, ssn, phone, email; every fifth row has a bad SSN
+    ssns = SAMPLES['ssn']
+    with open(path, 'w', newline='') as f:
+        for i in range(rows):
+            f.write(f'Row{i},{ssns[i % len(ssns)]},253-123-4567,user{i}@uw.edu\n')
+
+
+def bench_stream(sizes=(100_000, 1_000_000)):
+    """Rows/sec and peak memory of validate_csv at two file sizes"""
+    columns = {1: 'ssn', 2: 'phone', 3: 'email'}
+    print(f'{"rows":>10}{"file MB":>10}{"rows/sec":>14}{"peak KB":>10}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f'{rows}.csv')
+            _write_csv(path, rows)
+            stats = stream_validators.StreamStats()
+            for _ in stream_validators.validate_csv(path, columns, invalid_only=True, stats=stats):
+                pass
+            # Second pass for memory only: tracemalloc slows everything down
+            tracemalloc.start()
+            for _ in stream_validators.validate_csv(path, columns, invalid_only=True):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            size = os.path.getsize(path) / 1e6
+            print(f'{rows:>10,}{size:>10.1f}{stats.rows_per_sec:>14,.0f}{peak / 1024:>10,.0f}')
+
+
+def bench_parallel(rows=1_000_000, max_workers=None):
+    """Rows/sec of ValidatorPool.validate_many from 1 to N worker processes"""
+    max_workers = max_workers or os.cpu_count() or 1
+    column = (SAMPLES['phone'] * (rows // len(SAMPLES['phone']) + 1))[:rows]
+    serial = rows_per_sec(lambda r: rv.validate_many('phone', r), column)
+    print(f'{"workers":>8}{"rows/sec":>14}{"scaling":>10}')
+    print(f'{"serial":>8}{serial:>14,.0f}{1:>9.2f}x')
+    for workers in range(1, max_workers + 1):
+        with parallel_validators.ValidatorPool(workers) as pool:
+            chunk_size = parallel_validators.chunk_size_for(rows, workers)
+            pool.validate_many('phone', column[:chunk_size * workers], chunk_size)  # start the workers
+            rate = rows_per_sec(lambda r: pool.validate_many('phone', r, chunk_size), column)
+        print(f'{workers:>8}{rate:>14,.0f}{rate / serial:>9.2f}x')
+
+
+def bench_fastpath():
+    """Calls/sec: regex check vs regex-free fast path for the fixed-width validators"""
+    print(f'{"validator":<16}{"regex":>14}{"fast path":>14}{"speedup":>10}')
+    for name, func in (('military_time', rv.validate_military_time), ('ssn', rv.validate_ssn)):
+        validator = rv.get_validator(name)
+        before = calls_per_sec(validator.check_regex, SAMPLES[name])
+        after = calls_per_sec(func, SAMPLES[name])
+        print(f'{name:<16}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x')
+
+
+_PASSWORD_SCANS = [re.compile(p) for p in (r'[A-Z]', r'[a-z]', r'\d', r'[!@#$%^&*(),.?":{}|<>]')]
+_PASSWORD_LOWER_RUN = re.compile(r'[a-z]{4,}')
+
+
+def _password_six_scans(text):
+    # The pre-policy implementation: length check plus five separate regex scans
+    if len(text) < 10:
+        return False
+    for scan in _PASSWORD_SCANS:
+        if not scan.search(text):
+            return False
+    return not _PASSWORD_LOWER_RUN.search(text)
+
+
+def bench_password():
+    """Calls/sec: five regex scans vs the single-pass PasswordPolicy"""
+    inputs = SAMPLES['password'] + ['AbcD3fGh!jKl#Mn0pQr', 'aB3$' * 8]
+    before = calls_per_sec(_password_six_scans, inputs)
+    after = calls_per_sec(rv.validate_password, inputs)
+    custom = calls_per_sec(rv.PasswordPolicy(min_length=12, max_lower_run=2), inputs)
+    print(f'{"regex scans":<24}{before:>14,.0f}')
+    print(f'{"default policy":<24}{after:>14,.0f}{after / before:>9.2f}x')
+    print(f'{"custom policy":<24}{custom:>14,.0f}{custom / before:>9.2f}x')
+
+
+def _date_rebuilt_per_call(month, day, year):
+    # The pre-table calendar check: list and leap expression rebuilt every call
+    if month < 1 or month > 12:
+        return False
+    days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    if (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0):
+        days_in_month[1] = 29
+    return 1 <= day <= days_in_month[month - 1]
+
+
+def _date_rule_rebuilt(match):
+    month, sep, day, year = match.groups()
+    return _date_rebuilt_per_call(int(month), int(day), int(year))
+
+
+def bench_date(rows=200_000):
+    """Date checks: per-call calendar rebuild vs precomputed tables, strings and int columns"""
+    old = rv.Validator('date_rebuilt', rv.DATE.pattern, _date_rule_rebuilt)
+    before = calls_per_sec(old, SAMPLES['date'])
+    after = calls_per_sec(rv.validate_date, SAMPLES['date'])
+    print(f'{"strings (calls/sec)":<28}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x')
+    dates = [(m % 13, d % 32, 1900 + y % 200) for m, d, y in zip(range(rows), range(0, rows * 7, 7), range(rows))]
+    before = rows_per_sec(lambda r: bytearray([_date_rebuilt_per_call(*t) for t in r]), dates)
+    after = rows_per_sec(rv.check_dates, dates)
+    print(f'{"int tuples (rows/sec)":<28}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x')
+    if rv.np is not None:
+        array = rv.np.array(dates)
+        vectorized = rows_per_sec(rv.check_dates, array)
+        print(f'{"NumPy array (rows/sec)":<28}{"":>14}{vectorized:>14,.0f}{vectorized / before:>9.2f}x')
+
+
+def bench_tables(rows=200_000):
+    """Rows/sec for area-code and state columns: set of strings vs array tables"""
+    codes = [(i * 37) % 1000 for i in range(rows)]
+    records = [f'({code:03d})123-4567'.encode() for code in codes]
+    states = [b'WA', b'ZZ', b'NY', b'TX', b'XX'] * (rows // 5)
+    area_set = rv.VALID_AREA_CODES
+    state_set = rv.VALID_STATES
+    results = [
+        ('area codes from ints: set', lambda r: bytearray([f'{c:03d}' in area_set for c in r]), codes),
+        ('area codes from ints: table', rv.area_codes_valid, codes),
+        ('area codes in bytes: set', lambda r: bytearray([r_[1:4].decode() in area_set for r_ in r]), records),
+        ('area codes in bytes: table', lambda r: bytearray([rv.area_code_valid_at(r_, 1) for r_ in r]), records),
+        ('states in bytes: set', lambda r: bytearray([s_.decode() in state_set for s_ in r]), states),
+        ('states in bytes: table', rv.states_valid, states),
+    ]
+    if rv.np is not None:
+        results.append(('area codes: NumPy table', rv.area_codes_valid, rv.np.array(codes)))
+        letters = rv.np.frombuffer(b''.join(states), dtype=rv.np.uint8).reshape(-1, 2)
+        results.append(('states: NumPy table', rv.states_valid, letters))
+    for label, func, column in results:
+        print(f'{label:<32}{rows_per_sec(func, column):>14,.0f}')
+
+
+def zipf_inputs(values, count, exponent=1.1, seed=483):
+    """
+    Draws count inputs from values with Zipf-distributed popularity
+    - values[0] is the most popular, values[k] has weight 1 / (k + 1) ** exponent
+    """
+    weights = [1 / (rank + 1) ** exponent for rank in range(len(values))]
+    return random.Random(seed).choices(values, weights, k=count)
+
+
+def bench_cache(distinct=50_000, calls=200_000, maxsize=4096):
+    """Calls/sec on Zipf-distributed inputs: no cache vs a bounded LRU cache"""
+    generators = {
+        'email': lambda i: f'user{i}@example{i % 97}.com',
+        'url': lambda i: f'https://www.site{i}.example.com/path/{i}',
+        'phone': lambda i: f'(253){i % 1000:03d}-{i % 10000:04d}',
+    }
+    print(f'{"validator":<12}{"no cache":>14}{"cached":>14}{"speedup":>10}{"hit rate":>10}{"evictions":>11}')
+    for name, make in generators.items():
+        inputs = zipf_inputs([make(i) for i in range(distinct)], calls)
+        func = getattr(rv, f'validate_{name}')
+        before = calls_per_sec(func, inputs, repeat=1)
+        rv.enable_cache(name, maxsize)
+        try:
+            after = calls_per_sec(func, inputs, repeat=1)
+            info = rv.cache_info(name)
+        finally:
+            rv.disable_cache(name)
+        hit_rate = info['hits'] / (info['hits'] + info['misses'])
+        print(f'{name:<12}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x'
+              f'{hit_rate:>10.1%}{info["evictions"]:>11,}')
+
+
+# Crafted inputs of about n characters that make backtracking patterns work hardest
+ADVERSARIAL = {
+    'url': [
+        lambda n: 'aa.' * (n // 3) + 'a',
+        lambda n: 'a' * (n - 3) + '.a1',
+        lambda n: 'a.' * (n // 2) + '!',
+        lambda n: 'a' + '-a' * (n // 2) + '-',
+        lambda n: ('a' * 20 + '.') * (n // 21) + '1',
+    ],
+    'email': [
+        lambda n: 'a@' + 'a.' * (n // 2) + '!',
+        lambda n: 'a@' + 'ab.' * (n // 3) + '1',
+        lambda n: 'a@' + 'a' * (n // 2) + '.' + 'a' * (n // 2) + '1',
+        lambda n: '.' * n + '@',
+        lambda n: 'a@' * (n // 2),
+    ],
+}
+
+
+def worst_latency(func, inputs, repeat=5):
+    """
+    Returns the slowest single call over inputs, in microseconds (best of repeat)
+    """
+    worst = 0.0
+    for text in inputs:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(text)
+            best = min(best, time.perf_counter() - start)
+        worst = max(worst, best)
+    return worst * 1e6
+
+
+def bench_adversarial(lengths=(256, 1024, 4096, 16384, 65536)):
+    """Worst-case microseconds per call on crafted inputs: backtracking regex vs linear parser"""
+    print(f'{"validator":<10}{"length":>8}{"regex us":>12}{"parser us":>12}')
+    for name, families in ADVERSARIAL.items():
+        validator = rv.get_validator(name)
+        for length in lengths:
+            inputs = [family(length) for family in families]
+            regex = worst_latency(validator.check_regex, inputs)
+            parser = worst_latency(validator, inputs)
+            print(f'{name:<10}{length:>8,}{regex:>12,.1f}{parser:>12,.1f}')
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _scan_per_kind(text, kinds):
+    # One pass per kind, the way separate searches would do it
+    spans = []
+    for kind in kinds:
+        spans += scan_validators.scan(text, (kind,))
+    spans.sort(key=lambda span: span[1])
+    return spans
+
+
+def bench_scan(paragraphs=2_000):
+    """MB/sec finding values in free text: one combined pass vs one pass per kind"""
+    paragraph = ('Customer Linda Miao, 123 Main St, Seattle, WA 98101 called from (253)123-4567 '
+                 'on 2/29/2024 about card 4111 1111 1111 1111; SSN 123-45-6789, refund $1,234.56, '
+                 'reply to linda@uw.edu. Ticket 000-00-0000 was closed as a duplicate.\n')
+    text = paragraph * paragraphs
+    megabytes = len(text) / 1e6
+    for kinds in (scan_validators.DEFAULT_SCAN_KINDS, tuple(scan_validators.SCAN_PATTERNS)):
+        assert scan_validators.scan(text, kinds) == _scan_per_kind(text, kinds)
+        combined = megabytes / min(_timed(scan_validators.scan, text, kinds) for _ in range(3))
+        separate = megabytes / min(_timed(_scan_per_kind, text, kinds) for _ in range(3))
+        print(f'{len(kinds)} kinds: combined {combined:6.1f} MB/sec   per kind {separate:6.1f} MB/sec')
+
+
+def _classify_every_validator(text):
+    # The pre-classifier approach: run every registered validator
+    return tuple(name for name, validator in rv.VALIDATORS.items() if validator(text))
+
+
+def bench_classify(rows=20_000):
+    """Values/sec: running every validator vs classify() with prefilters, and column inference"""
+    values = [value for samples in SAMPLES.values() for value in samples]
+    before = calls_per_sec(_classify_every_validator, values)
+    after = calls_per_sec(rv.classify, values)
+    print(f'classify one value: {before:,.0f} -> {after:,.0f} values/sec ({after / before:.2f}x)')
+    for name in ('phone', 'date', 'roster_name'):
+        column = SAMPLES[name][:3] * (rows // 3)
+        start = time.perf_counter()
+        every = [_classify_every_validator(value) for value in column]
+        kinds = set.intersection(*map(set, every))
+        full = time.perf_counter() - start
+        start = time.perf_counter()
+        inferred = rv.classify_column(column)
+        sampled = time.perf_counter() - start
+        assert set(inferred) == kinds
+        print(f'column of {len(column):,} {name:<12} every row: {full * 1e3:8.1f} ms   '
+              f'classify_column: {sampled * 1e3:6.2f} ms')
+
+
+def _fields_buffer(values, copies):
+    # One comma-separated UTF-8 buffer plus the (start, end) span of each field
+    buffer = bytearray()
+    spans = []
+    for value in values * copies:
+        encoded = value.encode()
+        spans.append((len(buffer), len(buffer) + len(encoded)))
+        buffer += encoded + b','
+    return bytes(buffer), spans
+
+
+def _decode_each(validator, view, spans):
+    return bytearray([validator.check(str(view[start:end], 'utf-8')) for start, end in spans])
+
+
+def bench_bytes(copies=4_000, large=1 << 20):
+    """Fields/sec decoding each field vs validate_spans in place, and the copy a large field costs"""
+    print(f'{"validator":<16}{"decode":>12}{"in place":>12}')
+    for name, values in SAMPLES.items():
+        validator = rv.get_validator(name)
+        buffer, spans = _fields_buffer(values, copies)
+        view = memoryview(buffer)
+        assert _decode_each(validator, view, spans) == rv.validate_spans(validator, view, spans)
+        decode = len(spans) / min(_timed(_decode_each, validator, view, spans) for _ in range(3))
+        in_place = len(spans) / min(_timed(rv.validate_spans, validator, view, spans) for _ in range(3))
+        print(f'{name:<16}{decode:>12,.0f}{in_place:>12,.0f}')
+    # One large field: decoding allocates a str as big as the field
+    view = memoryview(b'a' * large + b'tion')
+    for label, func in (('decode', lambda: rv.validate_ion_words(str(view, 'utf-8'))),
+                        ('in place', lambda: rv.validate_bytes('ion_words', view))):
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f'{large >> 20} MiB field, {label}: peak {peak / 1024:,.0f} KiB allocated')
+
+
+def _invalid_lines_python_io(kind, path):
+    # The old job: read line by line through Python I/O, one call per line
+    validator = rv.get_validator(kind)
+    offsets = []
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not validator(line.rstrip(b'\n').decode()):
+                offsets.append(offset)
+            offset += len(line)
+    return offsets
+
+
+def bench_mmap(lines=1_000_000, workers=None):
+    """MB/sec finding invalid lines in a file: Python line I/O vs mmap scan vs worker pool"""
+    workers = workers or os.cpu_count() or 1
+    print(f'{"validator":<10}{"invalid":>8}{"line I/O":>10}{"mmap":>10}{f"pool x{workers}":>10}  (MB/sec)')
+    with tempfile.TemporaryDirectory() as tmp, parallel_validators.ValidatorPool(workers) as pool:
+        for kind in ('phone', 'ssn'):
+            valid = [value for value in SAMPLES[kind] if rv.get_validator(kind)(value)]
+            invalid = [value for value in SAMPLES[kind] if not rv.get_validator(kind)(value)]
+            for rate in (0.01, 0.4):
+                rng = random.Random(483)
+                path = os.path.join(tmp, f'{kind}.txt')
+                with open(path, 'w') as f:
+                    for _ in range(lines):
+                        f.write(rng.choice(invalid if rng.random() < rate else valid) + '\n')
+                megabytes = os.path.getsize(path) / 1e6
+                expected = _invalid_lines_python_io(kind, path)
+                assert list(mmap_validators.validate_file(kind, path)) == expected
+                rates = [megabytes / min(_timed(func, kind, path) for _ in range(3))
+                         for func in (_invalid_lines_python_io, mmap_validators.validate_file,
+                                      pool.validate_file)]
+                print(f'{kind:<10}{rate:>8.0%}' + ''.join(f'{r:>10.1f}' for r in rates))
+
+
+async def _loop_lag(work, tick=0.001):
+    # Runs work() while a ticker measures how late the event loop wakes it up
+    lags = []
+    done = False
+
+    async def ticker():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(tick)
+            lags.append(time.perf_counter() - start - tick)
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(tick * 5)
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    lags.sort()
+    return elapsed, lags[int(len(lags) * 0.99)], lags[-1]
+
+
+def bench_async(rows=1_000_000):
+    """Event-loop lag while validating a big batch: validate_many on the loop vs avalidate_many"""
+    column = (SAMPLES['phone'] * (rows // len(SAMPLES['phone']) + 1))[:rows]
+
+    async def blocking():
+        rv.validate_many('phone', column)
+
+    async def offloaded():
+        await async_validators.avalidate_many('phone', column)
+
+    print(f'{"":<16}{"elapsed s":>10}{"p99 lag ms":>12}{"max lag ms":>12}')
+    for label, work in (('validate_many', blocking), ('avalidate_many', offloaded)):
+        elapsed, p99, worst = asyncio.run(_loop_lag(work))
+        print(f'{label:<16}{elapsed:>10.2f}{p99 * 1e3:>12.1f}{worst * 1e3:>12.1f}')
+    async_validators.shutdown_executor()
+
+
+def bench_metrics(calls=200_000):
+    """Calls/sec with metrics disabled vs enabled (valid and rejected inputs)"""
+    inputs = {
+        'phone': SAMPLES['phone'],
+        'ssn': SAMPLES['ssn'],
+        'email': SAMPLES['email'],
+    }
+    print(f'{"validator":<12}{"disabled":>14}{"enabled":>14}{"overhead":>10}')
+    for name, samples in inputs.items():
+        column = (samples * (calls // len(samples) + 1))[:calls]
+        func = getattr(rv, f'validate_{name}')
+        before = calls_per_sec(func, column, repeat=1)
+        rv.enable_metrics(name)
+        try:
+            after = calls_per_sec(func, column, repeat=1)
+        finally:
+            rv.disable_metrics(name)
+        print(f'{name:<12}{before:>14,.0f}{after:>14,.0f}{before / after - 1:>10.0%}')
+
+
+def import_time_us(module='regex_validators', runs=5):
+    """
+    Best (self, cumulative) microseconds python -X importtime reports for
+    importing module in a fresh interpreter
+    - Bytecode is cached in a temporary directory first, as in a deployment
+    """
+    code = f'import {module}'
+    best_self = best_total = float('inf')
+    with tempfile.TemporaryDirectory() as cache:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        command = [sys.executable, '-X', 'importtime', '-c', code]
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        for run in range(runs + 1):
+            report = subprocess.run(command, env=env, cwd=cwd, check=True, stderr=subprocess.PIPE,
+                                    universal_newlines=True).stderr
+            if run == 0:
+                continue  # this run wrote the bytecode cache
+            for line in report.splitlines():
+                fields = line.split('|')
+                if len(fields) == 3 and fields[2].strip() == module:
+                    best_self = min(best_self, int(fields[0].split(':')[1]))
+                    best_total = min(best_total, int(fields[1]))
+    return best_self, best_total
+
+
+def bench_import(runs=5):
+    """Import cost in a fresh interpreter, and what the first use of a validator adds"""
+    self_us, total_us = import_time_us('regex_validators', runs)
+    print(f'import regex_validators: {self_us / 1e3:.2f} ms own code, {total_us / 1e3:.2f} ms with dependencies')
+    code = ('import time; start = time.perf_counter(); import regex_validators as rv; '
+            'first = time.perf_counter(); rv.validate_phone("(253)123-4567"); '
+            'second = time.perf_counter(); [validator.regex for validator in rv.VALIDATORS.values()]; '
+            'print(first - start, second - first, time.perf_counter() - second)')
+    best = [float('inf')] * 3
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+        best = [min(old, float(new)) for old, new in zip(best, output.split())]
+    print(f'first validate_phone call: {best[1] * 1e3:.2f} ms (compiles its patterns)')
+    print(f'compiling every other validator: {best[2] * 1e3:.2f} ms (paid at import before they were lazy)')
+
+
+_NON_DIGITS = re.compile(r'\D')
+
+
+def _validate_then_normalize(kind):
+    # What callers did before parse_*: validate, then a second regex pass
+    validate = getattr(rv, f'validate_{kind}')
+    if kind == 'currency':
+        return lambda text: int(_NON_DIGITS.sub('', text)) if validate(text) else None
+    if kind == 'date':
+        def normalize(text):
+            if not validate(text):
+                return None
+            month, day, year = re.split(r'[-/]', text.strip())
+            return datetime.date(int(year), int(month), int(day))
+        return normalize
+    prefix = '+1' if kind == 'phone' else ''
+    return lambda text: prefix + _NON_DIGITS.sub('', text) if validate(text) else None
+
+
+def bench_parse():
+    """Calls/sec: validate_* followed by a normalizing regex vs one parse_* call"""
+    print(f'{"kind":<12}{"two passes":>14}{"parse":>14}{"speedup":>10}')
+    for kind in ('ssn', 'phone', 'currency', 'date'):
+        before = calls_per_sec(_validate_then_normalize(kind), SAMPLES[kind])
+        after = calls_per_sec(getattr(rv, f'parse_{kind}'), SAMPLES[kind])
+        print(f'{kind:<12}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x')
+
+
+def bench_columns(rows=200_000):
+    """Rows/sec for DataFrame-style columns: Series.map(validate_*) vs validate_many vs Arrow kernels"""
+    try:
+        import pandas
+        import pyarrow
+    except ImportError:
+        print('pandas and pyarrow are not installed; skipped')
+        return
+    print(f'{"validator":<16}{".map":>14}{"many":>14}{"series":>14}{"arrow":>14}{"vs .map":>10}')
+    for name, inputs in SAMPLES.items():
+        validator = rv.get_validator(name)
+        column = (inputs * (rows // len(inputs) + 1))[:rows]
+        series = pandas.Series(column, dtype=object)
+        array = pyarrow.array(column)
+        mapped = rows_per_sec(lambda r: series.map(validator), column)
+        many = rows_per_sec(lambda r: rv.validate_many(validator, r), column)
+        in_series = rows_per_sec(lambda r: column_validators.validate_series(validator, series), column)
+        arrow = rows_per_sec(lambda r: column_validators.validate_arrow(validator, array), column)
+        print(f'{name:<16}{mapped:>14,.0f}{many:>14,.0f}{in_series:>14,.0f}{arrow:>14,.0f}'
+              f'{arrow / mapped:>9.2f}x')
+
+
+# The i-th distinct valid value of a few validators, for columns of any cardinality
+_DISTINCT_VALUES = {
+    'email': lambda i: f'user{i}@uw.edu',
+    'phone': lambda i: f'(253){i // 10000 % 1000:03d}-{i % 10000:04d}',
+    'city_state_zip': lambda i: f'Town{i}, WA {i % 100000:05d}',
+    'url': lambda i: f'www.site{i}.com/page',
+}
+
+
+def bench_dedup(rows=200_000, distinct_shares=(1.0, 0.5, 0.1, 0.01, 0.001), repeat=3):
+    """Rows/sec of validate_many at different duplicate ratios: map vs dedup vs auto"""
+    rng = random.Random(23)
+    print(f'{"validator":<16}{"distinct":>10}{"map":>14}{"dedup":>14}{"auto":>14}{"speedup":>10}')
+    for name, value in _DISTINCT_VALUES.items():
+        for share in distinct_shares:
+            distinct = max(1, int(rows * share))
+            pool = [value(i) for i in range(distinct)]
+            picks = [rng.randrange(distinct) for _ in range(rows)]
+            rates = []
+            for method in ('map', 'dedup', 'auto'):
+                best = float('inf')
+                for _ in range(repeat):
+                    # New string objects for every row, as a file reader produces:
+                    # each one is hashed for the first time by the timed call
+                    column = [pool[i][:1] + pool[i][1:] for i in picks]
+                    start = time.perf_counter()
+                    rv.validate_many(name, column, method=method)
+                    best = min(best, time.perf_counter() - start)
+                rates.append(rows / best)
+            mapped, deduped, auto = rates
+            print(f'{name:<16}{share:>10.1%}{mapped:>14,.0f}{deduped:>14,.0f}{auto:>14,.0f}'
+                  f'{auto / mapped:>9.2f}x')
+
+
+def _keystrokes_per_sec(func, texts, min_time=0.2):
+    # Runs func over every text repeatedly for at least min_time seconds
+    keystrokes = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for text in texts:
+            func(text)
+        keystrokes += sum(map(len, texts))
+        elapsed = time.perf_counter() - start
+    return keystrokes / elapsed
+
+
+def bench_keystrokes(groups=(1, 10, 100, 1000)):
+    """Keystrokes/sec typing a value: validate_* on the whole text each time vs IncrementalValidator"""
+    def retyped(kind):
+        validator = rv.get_validator(kind)
+        return lambda text: [validator(text[:end]) for end in range(1, len(text) + 1)]
+
+    def incremental(kind):
+        def typed(text):
+            typing = incremental_validators.IncrementalValidator(kind)
+            return [typing.feed(char) for char in text]
+        return typed
+
+    print(f'{"validator":<16}{"length":>8}{"revalidate":>14}{"incremental":>14}{"speedup":>10}')
+    for kind in ('phone', 'date', 'currency'):
+        texts = SAMPLES[kind]
+        before = _keystrokes_per_sec(retyped(kind), texts)
+        after = _keystrokes_per_sec(incremental(kind), texts)
+        print(f'{kind:<16}{"~10":>8}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x')
+    # Long amounts: re-matching grows with the text, a keystroke does not
+    for count in groups:
+        text = '$1' + ',000' * count + '.00'
+        before = _keystrokes_per_sec(retyped('currency'), [text])
+        after = _keystrokes_per_sec(incremental('currency'), [text])
+        print(f'{"currency":<16}{len(text):>8,}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x')
+    # Long URLs: valid from the first path character on, up to MAX_URL_LENGTH
+    for count in groups:
+        text = 'https://example.com/' + 'a' * min(count * 4, rv.MAX_URL_LENGTH - 20)
+        before = _keystrokes_per_sec(retyped('url'), [text])
+        after = _keystrokes_per_sec(incremental('url'), [text])
+        print(f'{"url":<16}{len(text):>8,}{before:>14,.0f}{after:>14,.0f}{after / before:>9.2f}x')
+
+
+def bench_server(clients=(1, 16, 64), requests=2_000, rows=10, workers=1):
+    """Requests/sec and latency of server_validators over a Unix socket, with and without batching"""
+    if not hasattr(socket, 'AF_UNIX'):
+        print('Unix-domain sockets are not available; skipped')
+        return
+    here = os.path.dirname(os.path.abspath(__file__))
+    print(f'{"batching":<10}{"clients":>8}{"requests/s":>14}{"rows/s":>14}{"p50 ms":>10}{"p99 ms":>10}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for batching in (False, True):
+            path = os.path.join(tmp, f'batching-{batching}.sock')
+            command = [sys.executable, os.path.join(here, 'server_validators.py'), 'serve', path,
+                       '--workers', str(workers)] + ([] if batching else ['--no-batching'])
+            server = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+            try:
+                deadline = time.monotonic() + 10
+                while not os.path.exists(path) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                for count in clients:
+                    report = asyncio.run(server_validators.load_test(
+                        path, 'phone', SAMPLES['phone'], count, max(1, requests // count), rows))
+                    print(f'{"on" if batching else "off":<10}{count:>8}{report.requests_per_sec:>14,.0f}'
+                          f'{report.rows_per_sec:>14,.0f}{report.p50 * 1e3:>10.2f}{report.p99 * 1e3:>10.2f}')
+            finally:
+                server.terminate()
+                server.wait()
+
+
+# Fields of the synthetic customer records bench_records validates
+RECORD_FIELDS = ('roster_name', 'address', 'city_state_zip', 'phone', 'email', 'ssn')
+
+
+def _synthetic_records(rows, bad_share=0.03, distinct=1000):
+    # Dict records drawing each field from SAMPLES: valid values, except
+    # bad_share of fields that take one of the invalid samples
+    rng = random.Random(22)
+    pool = [{kind: rng.choice(SAMPLES[kind][3:] if rng.random() < bad_share else SAMPLES[kind][:3])
+             for kind in RECORD_FIELDS} for _ in range(distinct)]
+    return [pool[rng.randrange(distinct)] for _ in range(rows)]
+
+
+def bench_records(rows=1_000_000):
+    """Records/sec for dict records: hand-written validate_* chains vs a Schema"""
+    schema = schema_validators.Schema({kind: kind for kind in RECORD_FIELDS})
+    records = _synthetic_records(rows)
+    schema.tune(records)
+    checks = [(kind, rv.get_validator(kind)) for kind in RECORD_FIELDS]
+
+    def by_hand(records):
+        return [all(check(record[kind]) for kind, check in checks) for record in records]
+
+    def by_hand_errors(records):
+        return [tuple(kind for kind, check in checks if not check(record[kind])) for record in records]
+
+    valid = schema.validate_many(records).count(1)
+    print(f'{rows:,} records, {valid / rows:.1%} valid, checked in order {", ".join(schema.order)}')
+    print(f'{"mode":<12}{"by hand":>14}{"check":>14}{"many":>14}{"speedup":>10}')
+    hand = rows_per_sec(by_hand, records, repeat=1)
+    check = rows_per_sec(lambda r: list(map(schema.check, r)), records, repeat=1)
+    many = rows_per_sec(schema.validate_many, records, repeat=1)
+    print(f'{"fail-fast":<12}{hand:>14,.0f}{check:>14,.0f}{many:>14,.0f}{many / hand:>9.2f}x')
+    hand = rows_per_sec(by_hand_errors, records, repeat=1)
+    errors = rows_per_sec(lambda r: list(map(schema.errors, r)), records, repeat=1)
+    many = rows_per_sec(lambda r: schema.validate_many(r, collect=True), records, repeat=1)
+    print(f'{"collect-all":<12}{hand:>14,.0f}{errors:>14,.0f}{many:>14,.0f}{many / hand:>9.2f}x')
+
+
+BENCHMARKS = {
+    'registry': bench_registry,
+    'batch': bench_batch,
+    'stream': bench_stream,
+    'parallel': bench_parallel,
+    'fastpath': bench_fastpath,
+    'password': bench_password,
+    'date': bench_date,
+    'tables': bench_tables,
+    'cache': bench_cache,
+    'adversarial': bench_adversarial,
+    'scan': bench_scan,
+    'classify': bench_classify,
+    'bytes': bench_bytes,
+    'mmap': bench_mmap,
+    'async': bench_async,
+    'metrics': bench_metrics,
+    'import': bench_import,
+    'parse': bench_parse,
+    'columns': bench_columns,
+    'dedup': bench_dedup,
+    'records': bench_records,
+    'keystrokes': bench_keystrokes,
+    'server': bench_server,
+}
+
+
+def main(argv):
+    names = argv or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f'unknown benchmark {name!r} (known: {", ".join(BENCHMARKS)})')
+            return 2
+    for name in names:
+        print(f'== {name}: {BENCHMARKS[name].__doc__}')
+        BENCHMARKS[name]()
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,390 @@
+"""
+Reproducible performance suite for the built-in validators
+- Generates seeded datasets of four shapes for every validator: valid,
+  near-miss (one edit away from a valid value), adversarial (crafted to make
+  patterns backtrack) and long (about LONG_LENGTH characters)
+- Measures single-call latency (p50/p99), validate_many throughput and the
+  peak memory validate_many allocates, plus the module's import time
+- Saves results as JSON and compares a run against a saved baseline
+
+Command line:
+  python bench_suite.py [--rows N] [--processes N] [--save FILE] [--compare FILE] [--threshold 0.25] [validator ...]
+"""
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import regex_validators as rv
+from bench_regex_validators import ADVERSARIAL, import_time_us
+
+VALIDATOR_NAMES = ('military_time', 'currency', 'url', 'ssn', 'phone', 'email', 'roster_name',
+                   'address', 'city_state_zip', 'date', 'password', 'ion_words')
+SHAPES = ('valid', 'near_miss', 'adversarial', 'long')
+
+DEFAULT_SEED = 483
+DEFAULT_ROWS = 10_000
+# Fresh processes the command line runs the suite in; every metric keeps its best value
+DEFAULT_PROCESSES = 5
+# Length of the adversarial and long inputs
+LONG_LENGTH = 1024
+# Values timed one by one for the latency percentiles
+LATENCY_SAMPLE = 200
+# Relative change that counts as a regression when comparing
+DEFAULT_THRESHOLD = 0.25
+# Changes smaller than this are timer or allocator noise, whatever the ratio
+NOISE_FLOOR = {'latency_p50_ns': 50, 'latency_p99_ns': 200, 'rows_per_sec': 0, 'peak_kib': 16,
+               'self_us': 300, 'total_us': 1000}
+# Metrics where a larger value is worse
+LOWER_IS_BETTER = ('latency_p50_ns', 'latency_p99_ns', 'peak_kib', 'self_us', 'total_us')
+# Key of the import time entry (python -X importtime, in microseconds)
+IMPORT_KEY = 'import/regex_validators'
+
+
+def _words(rng, count, lower=string.ascii_lowercase):
+    return [rng.choice(string.ascii_uppercase) + ''.join(rng.choices(lower, k=rng.randint(2, 9)))
+            for _ in range(count)]
+
+
+def _password(rng):
+    # One of each class, then filler that never makes a run of 4 lowercase letters
+    chars = [rng.choice(string.ascii_uppercase), rng.choice(string.ascii_lowercase),
+             rng.choice(string.digits), rng.choice('!@#$%^&*')]
+    while len(chars) < rng.randint(10, 16):
+        chars.append(rng.choice(string.ascii_uppercase + string.digits + '!@#$%^&*'))
+    rng.shuffle(chars)
+    return ''.join(chars)
+
+
+def _date(rng):
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)
+    sep = rng.choice('-/')
+    return f'{month:0{rng.randint(1, 2)}d}{sep}{day:02d}{sep}{rng.randint(1900, 2099)}'
+
+
+# name -> function(rng) returning one valid value
+VALID = {
+    'military_time': lambda rng: f'{rng.randrange(24):02d}{rng.randrange(60):02d}',
+    'currency': lambda rng: f'${rng.randrange(10 ** rng.randint(1, 12)):,}.{rng.randrange(100):02d}',
+    'url': lambda rng: (rng.choice(('', 'http://', 'https://')) + '.'.join(w.lower() for w in _words(rng, rng.randint(1, 3)))
+                        + rng.choice(('.com', '.org', '.edu')) + rng.choice(('', '/', '/search?q=1'))),
+    'ssn': lambda rng: '{0:03d}{3}{1:02d}{3}{2:04d}'.format(
+        rng.choice([area for area in range(1, 900) if area != 666]), rng.randint(1, 99),
+        rng.randint(1, 9999), rng.choice(('-', ' ', ''))),
+    'phone': lambda rng: rng.choice(('({0}){1}-{2}', '{0}-{1}-{2}', '{0} {1} {2}', '{0}{1}{2}')).format(
+        rng.choice(sorted(rv.VALID_AREA_CODES)), f'{rng.randrange(1000):03d}', f'{rng.randrange(10000):04d}'),
+    'email': lambda rng: (f'{_words(rng, 1)[0].lower()}.{rng.randrange(1000)}@'
+                          f'{_words(rng, 1)[0].lower()}.{rng.choice(("com", "edu", "io"))}'),
+    'roster_name': lambda rng: ', '.join(_words(rng, 2) + [f'{c}.' for c in rng.sample(string.ascii_uppercase,
+                                                                                        rng.randint(0, 3))]),
+    'address': lambda rng: (f'{rng.randint(1, 99999)} {" ".join(_words(rng, rng.randint(1, 3)))} '
+                            f'{rng.choice(("St", "Street", "Rd", "Road", "Blvd", "Ave", "Avenue"))}'),
+    'city_state_zip': lambda rng: (f'{" ".join(_words(rng, rng.randint(1, 2)))}, '
+                                   f'{rng.choice(sorted(rv.VALID_STATES))} {rng.randrange(100000):05d}'
+                                   + rng.choice(('', f'-{rng.randrange(10000):04d}'))),
+    'date': _date,
+    'password': _password,
+    'ion_words': lambda rng: rng.choice(string.ascii_letters) * 2 * rng.randint(0, 6) + 'ion',
+}
+
+# name -> function(n) returning a crafted input of about n characters
+ADVERSARIAL_INPUTS = {
+    'military_time': lambda n: '1' * n,
+    'currency': lambda n: '$1' + ',000' * (n // 4) + '.0',
+    'url': ADVERSARIAL['url'][0],
+    'ssn': lambda n: '1' * n,
+    'phone': lambda n: '(253)' + ' ' * n,
+    'email': ADVERSARIAL['email'][0],
+    'roster_name': lambda n: 'A' + "a-'" * (n // 3) + ',',
+    'address': lambda n: '1 ' + 'a ' * (n // 2) + 'St.',
+    'city_state_zip': lambda n: 'a ' * (n // 2) + ', WA',
+    'date': lambda n: '1' * n,
+    'password': lambda n: 'A1!' + 'a' * n,
+    'ion_words': lambda n: 'a' * n + 'io',
+}
+
+# name -> function(n) returning a long input: valid where the format allows it
+LONG_INPUTS = {
+    'military_time': lambda n: '1234' + ' ' * n,
+    'currency': lambda n: '$1' + ',000' * (n // 4) + '.00',
+    'url': lambda n: 'https://www.example.com/' + 'a/' * (n // 2),
+    'ssn': lambda n: '123-45-6789' + ' ' * n,
+    'phone': lambda n: '(253)123-4567' + ' ' * n,
+    # Longer emails are rejected on length alone, so this one stops at MAX_EMAIL_LENGTH
+    'email': lambda n: 'a' * 64 + '@' + 'b' * min(n, rv.MAX_EMAIL_LENGTH - 69) + '.com',
+    'roster_name': lambda n: 'A' + 'b' * n + ', John',
+    'address': lambda n: '1 ' + 'Main ' * (n // 5) + 'St',
+    'city_state_zip': lambda n: 'New York ' * (n // 9) + ', NY 10001',
+    'date': lambda n: '01/15/2026' + ' ' * n,
+    'password': lambda n: 'Ab1!' * (n // 4),
+    'ion_words': lambda n: 'a' * (n // 2 * 2) + 'ion',
+}
+
+
+def _near_miss(rng, validator, value, attempts=100):
+    # One random edit (delete, insert, replace or swap) that the validator rejects
+    alphabet = sorted(set(value) | set('-./, 0aZ'))
+    for _ in range(attempts):
+        i = rng.randrange(len(value))
+        edit = rng.randrange(4)
+        if edit == 0:
+            candidate = value[:i] + value[i + 1:]
+        elif edit == 1:
+            candidate = value[:i] + rng.choice(alphabet) + value[i:]
+        elif edit == 2:
+            candidate = value[:i] + rng.choice(alphabet) + value[i + 1:]
+        else:
+            candidate = value[:i] + value[i + 1:i + 2] + value[i] + value[i + 2:]
+        if not validator(candidate):
+            return candidate
+    return candidate
+
+
+def make_dataset(name, shape, rows, seed=DEFAULT_SEED):
+    """
+    Returns a list of rows inputs of one shape for one built-in validator
+    - The same (name, shape, rows, seed) always gives the same list
+    - valid: accepted values; near_miss: values one edit away from a valid
+      one, rejected whenever such an edit was found (a few passwords survive
+      every edit tried); adversarial / long: about LONG_LENGTH characters, with a
+      little variation so the rows are not all identical
+    """
+    rng = random.Random(f'{seed}:{name}:{shape}')
+    make_valid = VALID[name]
+    if shape == 'valid':
+        return [make_valid(rng) for _ in range(rows)]
+    if shape == 'near_miss':
+        validator = rv.get_validator(name)
+        return [_near_miss(rng, validator, make_valid(rng)) for _ in range(rows)]
+    if shape == 'adversarial':
+        make = ADVERSARIAL_INPUTS[name]
+    elif shape == 'long':
+        make = LONG_INPUTS[name]
+    else:
+        raise ValueError(f'unknown shape {shape!r} (known: {", ".join(SHAPES)})')
+    # Long rows are built once per length and shared, so memory stays small
+    variants = [make(LONG_LENGTH + offset) for offset in range(16)]
+    return [variants[rng.randrange(len(variants))] for _ in range(rows)]
+
+
+def latency_percentiles(func, inputs, inner=20, repeat=5):
+    """
+    Times func on each input: the best of repeat passes of inner calls
+    - Passes go over all inputs in turn, so each input is timed at several
+      moments and a slow spell of the machine does not stick to one input
+    - Returns (p50, p99) nanoseconds per call across the inputs
+    """
+    clock = time.perf_counter_ns
+    per_call = [float('inf')] * len(inputs)
+    for _ in range(repeat):
+        for i, text in enumerate(inputs):
+            start = clock()
+            for _ in range(inner):
+                func(text)
+            per_call[i] = min(per_call[i], (clock() - start) / inner)
+    per_call.sort()
+    return per_call[len(per_call) // 2], per_call[min(len(per_call) - 1, len(per_call) * 99 // 100)]
+
+
+def batch_throughput(validator, rows, repeat=3):
+    """
+    Best rows per second of validate_many(validator, rows) over repeat runs
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rv.validate_many(validator, rows)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+
+def batch_peak_kib(validator, rows):
+    """
+    Peak KiB allocated while validate_many(validator, rows) runs (the input
+    list itself excluded)
+    """
+    tracemalloc.start()
+    try:
+        rv.validate_many(validator, rows)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(names=VALIDATOR_NAMES, rows=DEFAULT_ROWS, seed=DEFAULT_SEED, shapes=SHAPES, progress=None,
+              import_runs=3):
+    """
+    Measures every (validator, shape) pair once
+    - Returns {'meta': {...}, 'results': {'name/shape': {metric: value}}},
+      ready for json.dump
+    - Metrics: latency_p50_ns, latency_p99_ns, rows_per_sec, peak_kib
+    - Also records the import time of regex_validators under IMPORT_KEY
+      (self_us, total_us: best of import_runs fresh interpreters; 0 skips it)
+    - progress: optional callable given each 'name/shape' key as it finishes
+    """
+    results = {}
+    if import_runs:
+        self_us, total_us = import_time_us('regex_validators', import_runs)
+        results[IMPORT_KEY] = {'self_us': self_us, 'total_us': total_us}
+    for name in names:
+        validator = rv.get_validator(name)
+        for shape in shapes:
+            # Long inputs are slower per row: fewer rows keep the run short
+            count = rows if shape in ('valid', 'near_miss') else max(1, rows // 10)
+            dataset = make_dataset(name, shape, count, seed)
+            p50, p99 = latency_percentiles(validator, dataset[:LATENCY_SAMPLE])
+            key = f'{name}/{shape}'
+            results[key] = {
+                'latency_p50_ns': round(p50, 1),
+                'latency_p99_ns': round(p99, 1),
+                'rows_per_sec': round(batch_throughput(validator, dataset)),
+                'peak_kib': round(batch_peak_kib(validator, dataset), 1),
+            }
+            if progress is not None:
+                progress(key)
+    meta = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'seed': seed,
+        'rows': rows,
+        'long_length': LONG_LENGTH,
+    }
+    return {'meta': meta, 'results': results}
+
+
+def merge_best(runs):
+    """
+    Combines several run_suite results, keeping each metric's best value
+    - Timings of one process can be off by a constant factor (memory layout,
+      hash seed), so best-of-several-processes is what the command line saves
+    """
+    merged = {'meta': dict(runs[0]['meta'], processes=len(runs)), 'results': {}}
+    for run in runs:
+        for key, metrics in run['results'].items():
+            best = merged['results'].setdefault(key, dict(metrics))
+            for metric, value in metrics.items():
+                best[metric] = (min if metric in LOWER_IS_BETTER else max)(best[metric], value)
+    return merged
+
+
+def run_in_processes(names, rows=DEFAULT_ROWS, seed=DEFAULT_SEED, processes=DEFAULT_PROCESSES):
+    """
+    run_suite in processes fresh interpreters one after another, merged with
+    merge_best
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--worker', '--rows', str(rows),
+               '--seed', str(seed), *names]
+    runs = []
+    for number in range(processes):
+        print(f'process {number + 1}/{processes}', file=sys.stderr)
+        runs.append(json.loads(subprocess.run(command, check=True, stdout=subprocess.PIPE).stdout))
+    return merge_best(runs)
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Lists the metrics of current that regressed against baseline
+    - Both are run_suite results (or the JSON loaded back)
+    - A regression is a change for the worse of more than threshold
+      (0.25 = 25%) and more than the metric's NOISE_FLOOR
+    - Returns [(key, metric, baseline value, current value)]; pairs missing
+      from either run are skipped
+    """
+    regressions = []
+    for key, metrics in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None:
+            continue
+        for metric, value in metrics.items():
+            old = before.get(metric)
+            if old is None or abs(value - old) <= NOISE_FLOOR.get(metric, 0):
+                continue
+            if metric in LOWER_IS_BETTER:
+                worse = value > old * (1 + threshold)
+            else:
+                worse = value < old / (1 + threshold)
+            if worse:
+                regressions.append((key, metric, old, value))
+    return regressions
+
+
+def format_results(results):
+    lines = [f'{"validator/shape":<28}{"p50 ns":>10}{"p99 ns":>10}{"rows/sec":>14}{"peak KiB":>10}']
+    for key, metrics in results['results'].items():
+        if key == IMPORT_KEY:
+            continue
+        lines.append(f'{key:<28}{metrics["latency_p50_ns"]:>10,.0f}{metrics["latency_p99_ns"]:>10,.0f}'
+                     f'{metrics["rows_per_sec"]:>14,.0f}{metrics["peak_kib"]:>10,.1f}')
+    imported = results['results'].get(IMPORT_KEY)
+    if imported is not None:
+        lines.append(f'import regex_validators: {imported["self_us"]:,} us own code, '
+                     f'{imported["total_us"]:,} us with dependencies')
+    return '\n'.join(lines)
+
+
+def _parse_args(argv):
+    options = {'rows': DEFAULT_ROWS, 'seed': DEFAULT_SEED, 'processes': DEFAULT_PROCESSES, 'save': None,
+               'compare': None, 'threshold': DEFAULT_THRESHOLD, 'worker': False}
+    names = []
+    args = iter(argv)
+    for arg in args:
+        if arg == '--worker':
+            options['worker'] = True
+        elif arg.startswith('--'):
+            option = arg[2:]
+            if option not in options:
+                raise ValueError(f'unknown option {arg}')
+            value = next(args, None)
+            if value is None:
+                raise ValueError(f'{arg} needs a value')
+            options[option] = value
+        else:
+            names.append(arg)
+    for option in ('rows', 'seed', 'processes'):
+        options[option] = int(options[option])
+    options['threshold'] = float(options['threshold'])
+    unknown = [name for name in names if name not in VALIDATOR_NAMES]
+    if unknown:
+        raise ValueError(f'unknown validator {unknown[0]!r} (known: {", ".join(VALIDATOR_NAMES)})')
+    return names or list(VALIDATOR_NAMES), options
+
+
+def main(argv):
+    try:
+        names, options = _parse_args(argv)
+    except ValueError as e:
+        print(e)
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+    if options['worker']:
+        # One run for run_in_processes, as JSON on stdout
+        json.dump(run_suite(names, options['rows'], options['seed']), sys.stdout)
+        return 0
+    results = run_in_processes(names, options['rows'], options['seed'], options['processes'])
+    print(format_results(results))
+    if options['save']:
+        with open(options['save'], 'w') as f:
+            json.dump(results, f, indent=2)
+    if options['compare']:
+        with open(options['compare']) as f:
+            baseline = json.load(f)
+        if baseline['meta'] != results['meta']:
+            print(f'warning: baseline was recorded with {baseline["meta"]}', file=sys.stderr)
+        regressions = compare(baseline, results, options['threshold'])
+        for key, metric, old, new in regressions:
+            print(f'REGRESSION {key} {metric}: {old:,} -> {new:,}')
+        if regressions:
+            return 1
+        print(f'no regressions above {options["threshold"]:.0%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,341 @@
+"""
+Column validation for PyArrow arrays and pandas Series
+- validate_arrow returns a pyarrow BooleanArray; validate_series returns a
+  bool pandas Series aligned with its input
+- One pyarrow.compute regex pass per column (RE2: linear time on any
+  input), then the post-match rules (SSA numbering, area codes, states,
+  calendar dates, lengths, password classes) as array operations over the
+  matched rows; no Python code runs per row
+- Answers equal validate_many row for row; missing values are invalid
+- Neither library is imported here: passing a column in is what loads it
+"""
+import functools
+import re
+
+import regex_validators
+from regex_validators import PasswordPolicy, _resolve, check_dates, validate_many
+
+# Rows that \d, \s and case folding read differently in ASCII-only and Unicode
+# patterns (non-ASCII, and \x1c-\x1f which only str \s matches). The kernels
+# and their rules assume ASCII; rows with any of these are checked one by one.
+_NOT_PLAIN = r'[^\x00-\x1b\x20-\x7f]'
+
+# Python re flags a kernel may carry over from its validator
+_KERNEL_FLAGS = re.IGNORECASE
+
+
+class ColumnKernel:
+    """
+    How one validator runs over a whole column of plain ASCII text
+    - pattern: accepts what the validator's pattern accepts, but without
+      backreferences, so it can be rewritten for RE2 (None = every row goes
+      to the rule)
+    - flags: re.IGNORECASE or 0
+    - rule: optional post-match rule, called with a pyarrow array of the
+      matched texts; returns a NumPy bool array
+    """
+    __slots__ = ('pattern', 'flags', 'rule')
+
+    def __init__(self, pattern, flags=0, rule=None):
+        self.pattern = pattern
+        self.flags = flags
+        self.rule = rule
+
+    def __repr__(self):
+        return f'ColumnKernel({self.pattern!r})'
+
+
+def _bools(values):
+    # A writable NumPy bool array from a pyarrow or pandas boolean column
+    import numpy
+    return numpy.array(values, dtype=bool)
+
+
+def _all(masks):
+    import pyarrow.compute as pc
+    return _bools(functools.reduce(pc.and_, masks))
+
+
+def _is_in(values, allowed):
+    import pyarrow
+    import pyarrow.compute as pc
+    return _bools(pc.is_in(values, value_set=pyarrow.array(sorted(allowed), type=values.type)))
+
+
+# --- RULES ---
+
+# Rules only see texts their kernel pattern matched, so fields sit at known
+# places: slicing them out is cheaper than capturing groups in the match pass.
+# A matched text ends in at most one newline (the one $ lets through).
+
+def _ssn_rule(texts):
+    # 123-45-6789, 123 45 6789 or 123456789: the group moves with the separators
+    import pyarrow.compute as pc
+    texts = pc.utf8_rtrim(texts, '\n')
+    area = pc.utf8_slice_codeunits(texts, 0, 3)
+    group = pc.if_else(pc.equal(pc.utf8_length(texts), 11), pc.utf8_slice_codeunits(texts, 4, 6),
+                       pc.utf8_slice_codeunits(texts, 3, 5))
+    return _all([
+        pc.not_equal(area, '000'), pc.not_equal(area, '666'), pc.less(area, '900'),
+        pc.not_equal(group, '00'), pc.not_equal(pc.utf8_slice_codeunits(texts, -4), '0000'),
+    ])
+
+
+def _phone_rule(texts):
+    # The area code is the first three characters after an optional (
+    import pyarrow.compute as pc
+    return _is_in(pc.utf8_slice_codeunits(pc.utf8_ltrim(texts, '('), 0, 3), regex_validators.VALID_AREA_CODES)
+
+
+def _city_state_zip_rule(texts):
+    # The city has no commas, so the state follows the only one
+    import pyarrow.compute as pc
+    states = pc.struct_field(pc.extract_regex(texts, r',[\t\n\x0b\x0c\r ](?P<state>[A-Z]{2})'), 'state')
+    return _is_in(states, regex_validators.VALID_STATES)
+
+
+def _date_rule(layout):
+    # The rule for a date layout such as ('month', 'day', 'year'): the three
+    # numbers go through check_dates as an (N, 3) integer array
+    order = [layout.index(name) for name in ('month', 'day', 'year')]
+
+    def rule(texts):
+        import numpy
+        import pyarrow
+        import pyarrow.compute as pc
+        fields = pc.extract_regex(texts, r'^(?P<a>[0-9]+)[-/](?P<b>[0-9]+)[-/](?P<c>[0-9]+)')
+        return check_dates(numpy.column_stack([
+            numpy.asarray(pc.cast(pc.struct_field(fields, index), pyarrow.int64())) for index in order
+        ]))
+
+    return rule
+
+
+def _ion_words_rule(texts):
+    # The whole text counts, including a trailing newline $ let through
+    import pyarrow.compute as pc
+    return _bools(pc.equal(pc.bit_wise_and(pc.utf8_length(texts), 1), 1))
+
+
+def _length_cap(limit):
+    def rule(texts):
+        import pyarrow.compute as pc
+        return _bools(pc.less_equal(pc.utf8_length(texts), limit))
+
+    return rule
+
+
+def _char_class(chars):
+    # \xHH escapes read the same in Python's re and RE2
+    return '[' + ''.join(f'\\x{ord(char):02x}' for char in chars) + ']'
+
+
+def _password_kernel(policy):
+    # The policy's character classes, restricted to ASCII, as RE2 searches
+    members = {}
+    for point, code in policy._table.items():
+        members.setdefault(code, []).append(chr(point))
+    # A required class with no ASCII members fails every plain row
+    possible = all(code in members for code in policy._codes)
+    required = [_char_class(members[code]) for code in policy._codes if code in members]
+    run = None
+    if policy.max_lower_run is not None and 'l' in members:
+        run = f'{_char_class(members["l"])}{{{policy.max_lower_run + 1}}}'
+
+    def rule(texts):
+        import pyarrow.compute as pc
+        valid = _bools(pc.greater_equal(pc.utf8_length(texts), policy.min_length)) & possible
+        for pattern in required:
+            valid &= _bools(pc.match_substring_regex(texts, pattern))
+        if run is not None:
+            valid &= ~_bools(pc.match_substring_regex(texts, run))
+        return valid
+
+    return ColumnKernel(None, 0, rule)
+
+
+# --- KERNELS ---
+
+# The SSN and date patterns spell out each separator instead of repeating
+# the first one with a backreference, which RE2 does not have
+_SSN_PATTERN = r'^\d{3}(?:-\d{2}-| \d{2} |\d{2})\d{4}$'
+_DATE_PATTERN = r'^\d{1,2}(?:-\d{1,2}-|/\d{1,2}/)\d{4}$'
+
+# Validators that need a kernel of their own (for a rule, a backreference
+# or a length cap); the rest run their own pattern, see column_kernel
+KERNELS = {
+    regex_validators.SSN: ColumnKernel(_SSN_PATTERN, 0, _ssn_rule),
+    regex_validators.PHONE: ColumnKernel(regex_validators.PHONE.pattern, 0, _phone_rule),
+    regex_validators.CITY_STATE_ZIP: ColumnKernel(regex_validators.CITY_STATE_ZIP.pattern, 0,
+                                                  _city_state_zip_rule),
+    regex_validators.DATE: ColumnKernel(_DATE_PATTERN, 0, _date_rule(('month', 'day', 'year'))),
+    regex_validators.DATE_DMY: ColumnKernel(_DATE_PATTERN, 0, _date_rule(('day', 'month', 'year'))),
+    regex_validators.DATE_ISO: ColumnKernel(regex_validators.DATE_ISO.pattern, 0,
+                                            _date_rule(('year', 'month', 'day'))),
+    regex_validators.ION_WORDS: ColumnKernel(regex_validators.ION_WORDS.pattern, 0, _ion_words_rule),
+    regex_validators.MILITARY_TIME: ColumnKernel(regex_validators.MILITARY_TIME.pattern),
+    regex_validators.URL: ColumnKernel(regex_validators.URL.pattern, 0,
+                                       _length_cap(regex_validators.MAX_URL_LENGTH)),
+    regex_validators.EMAIL: ColumnKernel(regex_validators.EMAIL.pattern, 0,
+                                         _length_cap(regex_validators.MAX_EMAIL_LENGTH)),
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _derived_kernel(validator):
+    if isinstance(validator.fast, PasswordPolicy):
+        return _password_kernel(validator.fast)
+    # A fast path of a custom validator may disagree with its pattern
+    if validator.rule is not None or validator.fast is not None or validator._flags & ~_KERNEL_FLAGS:
+        return None
+    kernel = ColumnKernel(validator.pattern, validator._flags)
+    return kernel if _re2_pattern(kernel.pattern, kernel.flags) is not None else None
+
+
+def column_kernel(kind):
+    """
+    Returns the ColumnKernel a validator runs with over columns, or None
+    when rows have to go through the validator one by one (custom validators
+    with a rule, a fast path, flags other than IGNORECASE, or a pattern RE2
+    cannot run)
+    """
+    validator = _resolve(kind)
+    kernel = KERNELS.get(validator)
+    return kernel if kernel is not None else _derived_kernel(validator)
+
+
+@functools.lru_cache(maxsize=64)
+def _re2_pattern(pattern, flags):
+    # Rewrites a kernel pattern for RE2, or returns None when it cannot run
+    # there. On plain ASCII text the two engines differ in \s (RE2's lacks
+    # \x0b), $ (Python's also matches before one final newline), \Z, and
+    # RE2 has no backreferences or lookarounds.
+    if re.search(r'\(\?<?[=!]', pattern):
+        return None
+    out = ['(?i)'] if flags & re.IGNORECASE else []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escape = pattern[i:i + 2]
+            if escape[1:].isdigit():
+                return None
+            if escape == '\\s':
+                escape = '\\t\\n\\x0b\\x0c\\r ' if in_class else '[\\t\\n\\x0b\\x0c\\r ]'
+            elif escape == '\\S':
+                if in_class:
+                    return None
+                escape = '[^\\t\\n\\x0b\\x0c\\r ]'
+            elif escape == '\\Z':
+                escape = '\\z'
+            out.append(escape)
+            i += 2
+            continue
+        if char == '[' and not in_class:
+            in_class = True
+            opening = '[^' if pattern.startswith('[^', i) else '['
+            out.append(opening)
+            i += len(opening)
+            # A ] right after the opening bracket is a literal
+            if pattern.startswith(']', i):
+                out.append('\\]')
+                i += 1
+            continue
+        if char == ']' and in_class:
+            in_class = False
+        elif char == '$' and not in_class:
+            char = '(?:\\n?$)'
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+# --- PYARROW ---
+
+def _text_array(array):
+    # array as a pyarrow string column; None when it holds only nulls
+    import pyarrow
+    kind = array.type
+    if pyarrow.types.is_dictionary(kind):
+        kind = kind.value_type
+        array = array.cast(kind)
+    if pyarrow.types.is_null(kind):
+        return None
+    if not (pyarrow.types.is_string(kind) or pyarrow.types.is_large_string(kind)):
+        raise TypeError(f'expected a string array, got {array.type}')
+    return array
+
+
+def _run_kernel(kernel, texts):
+    # The kernel over plain ASCII, non-null texts; returns a NumPy bool array
+    import numpy
+    import pyarrow
+    import pyarrow.compute as pc
+    if kernel.pattern is None:
+        matched = numpy.ones(len(texts), dtype=bool)
+    else:
+        matched = _bools(pc.match_substring_regex(texts, _re2_pattern(kernel.pattern, kernel.flags)))
+    if kernel.rule is not None and matched.any():
+        matched[matched] = kernel.rule(pc.filter(texts, pyarrow.array(matched)))
+    return matched
+
+
+def validate_arrow(kind, array):
+    """
+    Validates every value of a pyarrow string column (Array or ChunkedArray,
+    e.g. a table column; dictionary-encoded columns are decoded)
+    - kind: a registry name or a Validator
+    - Returns a pyarrow BooleanArray: true for valid values, false for
+      invalid or null ones
+    - Non-ASCII rows, and every row of a validator without a kernel, are
+      checked one by one
+    """
+    import numpy
+    import pyarrow
+    import pyarrow.compute as pc
+    validator = _resolve(kind)
+    texts = _text_array(array)
+    if texts is None:
+        return pyarrow.array(numpy.zeros(len(array), dtype=bool))
+    present = _bools(pc.is_valid(texts))
+    result = present.copy()
+    kernel = column_kernel(validator)
+    if kernel is None:
+        single = present
+    else:
+        single = present & _bools(pc.fill_null(pc.match_substring_regex(texts, _NOT_PLAIN), False))
+        plain = present & ~single
+        result[plain] = _run_kernel(kernel, texts if plain.all() else pc.filter(texts, pyarrow.array(plain)))
+    if single.any():
+        rows = pc.take(texts, pyarrow.array(numpy.flatnonzero(single))).to_pylist()
+        result[single] = validate_many(validator, rows, as_numpy=True)
+    return pyarrow.array(result)
+
+
+# --- PANDAS ---
+
+def validate_series(kind, series):
+    """
+    Validates every value of a pandas Series of strings
+    - kind: a registry name or a Validator
+    - Returns a bool Series with the same index and name: True for valid
+      values, False for invalid or missing ones
+    - The column runs through validate_arrow: pyarrow-backed string dtypes
+      (pandas' default string dtype when pyarrow is installed) without a
+      copy, object and other string columns after one conversion. pandas'
+      own .str methods loop in Python on those columns and are slower than
+      validate_many, which is what runs when pyarrow is not installed.
+    """
+    import pandas
+    validator = _resolve(kind)
+    try:
+        import pyarrow
+    except ImportError:  # pyarrow is optional; validate_many needs nothing
+        present = _bools(series.notna())
+        result = present.copy()
+        if present.any():
+            result[present] = validate_many(validator, series[present].tolist(), as_numpy=True)
+    else:
+        result = _bools(validate_arrow(validator, pyarrow.array(series, from_pandas=True)))
+    return pandas.Series(result, index=series.index, name=series.name)
@@ -0,0 +1,646 @@
+"""
+As-you-type validation: the state of one input that grows a character at a time
+- IncrementalValidator(kind).feed(chars) reports COMPLETE (valid as typed),
+  VIABLE (not valid yet, but more characters could make it valid) or DEAD
+  (no continuation can be valid)
+- Built from the validator's own pattern: it is parsed into a state machine
+  whose states are worked out on demand, so each keystroke is one cached
+  transition instead of a new match over the whole text
+- The built-in rules are written into the machine too: area codes and states
+  as alternations, month/day bounds and leap years, the SSA exclusions, the
+  password policy, and the URL and email length caps as a character count.
+  COMPLETE always agrees with the validate_* function, and a DEAD text is
+  reported as soon as it can no longer become valid
+- A custom validator with a rule is only followed as far as its pattern:
+  VIABLE means the pattern could still match, and COMPLETE runs the rule on
+  the whole text whenever the pattern matches
+- Patterns with lookarounds, or backreferences to groups that can match
+  more than a few strings, raise ValueError
+- The patterns are read with re's private parser; if that is missing or
+  no longer has the expected shape, every validator falls back to a full
+  match per keystroke: COMPLETE as validate_* says, VIABLE otherwise
+"""
+import functools
+import re
+import sys
+import threading
+import unicodedata
+from collections import deque
+
+import regex_validators
+from regex_validators import PasswordPolicy, _resolve, alternation
+
+try:
+    from re import _parser as _sre  # Python 3.11+
+except ImportError:
+    try:
+        import sre_parse as _sre
+    except ImportError:
+        _sre = None
+
+COMPLETE = 'complete'
+VIABLE = 'viable'
+DEAD = 'dead'
+
+# Characters whose transition each state remembers; beyond this (an input
+# cycling through the whole of Unicode) transitions are worked out each time
+_MAX_CACHED_CHARS = 256
+# A backreferenced group is spelled out as one alternative per string it can
+# match; groups that match more than this many strings are not supported
+_MAX_GROUP_STRINGS = 16
+# Characters left to type when no continuation can match
+_NEVER = float('inf')
+
+# What may follow a complete match: re.match ignores the rest of the text
+_ANY_CHAR = re.compile('.', re.DOTALL).fullmatch
+try:
+    _CATEGORIES = {
+        _sre.CATEGORY_DIGIT: r'\d', _sre.CATEGORY_NOT_DIGIT: r'\D',
+        _sre.CATEGORY_SPACE: r'\s', _sre.CATEGORY_NOT_SPACE: r'\S',
+        _sre.CATEGORY_WORD: r'\w', _sre.CATEGORY_NOT_WORD: r'\W',
+    }
+    _CHAR_OPS = (_sre.LITERAL, _sre.NOT_LITERAL, _sre.ANY, _sre.IN)
+    _REPEAT_OPS = (_sre.MAX_REPEAT, _sre.MIN_REPEAT)
+except AttributeError:
+    # No usable parser: _machine falls back to full matches
+    _sre = None
+# What the private parser may raise if its internals change shape
+_PARSER_ERRORS = (AttributeError, TypeError, KeyError, IndexError, re.error)
+
+
+# --- RULES AS PATTERNS ---
+# The built-in rules rewritten as patterns the machine can follow. The rules
+# call int() on \d groups, which reads a decimal digit of any script, so
+# digits with a given value are written <values> ('<0>', '<1-9>', '<0-57-9>')
+# and stand for every decimal digit with one of those values.
+
+# <values> placeholders become private-use characters, one per set of values
+# (the set as a bit mask), before the pattern is parsed
+_VALUES_BASE = 0xF0000
+_VALUES_MASKS = 1 << 10
+
+
+def _by_value(template):
+    def placeholder(match):
+        mask = 0
+        for low, high in re.findall(r'(\d)(?:-(\d))?', match[1]):
+            for value in range(int(low), int(high or low) + 1):
+                mask |= 1 << value
+        return chr(_VALUES_BASE + mask)
+    return re.sub(r'<([\d-]+)>', placeholder, template)
+
+
+def _value_predicate(mask):
+    # Matches decimal digits whose value is in mask; anything else reads as 10
+    return lambda char: mask >> unicodedata.decimal(char, 10) & 1
+
+
+def _months_and_days(two_digits):
+    # Months with 31 days, with 30, and February, then the days each allows
+    # (February's without the 29th); two digits, or one or two digits
+    zero = '<0>' if two_digits else '<0>?'
+    months = (f'(?:{zero}<13578>|<1><02>)', f'(?:{zero}<469>|<1><1>)', f'{zero}<2>')
+    days = (rf'(?:{zero}<1-9>|<12>\d|<3><01>)', rf'(?:{zero}<1-9>|<12>\d|<3><0>)',
+            rf'(?:{zero}<1-9>|<1>\d|<2><0-8>)')
+    return months, days
+
+
+# Four-digit leap years: divisible by 4 but not 100, or by 400
+_LEAP_YEAR = r'(?:\d\d(?:<0><48>|<2468><048>|<13579><26>)|(?:<02468><048>|<13579><26>)<0><0>)'
+
+
+def _date_fold(day_first):
+    # DATE / DATE_DMY: each separator spelled out, since both must match
+    months, days = _months_and_days(False)
+    feb, leap_day = months[2], '<2><9>'
+    branches = []
+    for sep in '-/':
+        pairs = zip(days, months) if day_first else zip(months, days)
+        any_year = '|'.join(f'{first}{sep}{second}' for first, second in pairs)
+        feb_29 = f'{leap_day}{sep}{feb}' if day_first else f'{feb}{sep}{leap_day}'
+        branches.append(rf'(?:{any_year}){sep}\d{{4}}|{feb_29}{sep}{_LEAP_YEAR}')
+    return [(_by_value(f'^(?:{"|".join(branches)})$'), 0, True)], None
+
+
+def _date_iso_fold():
+    months, days = _months_and_days(True)
+    any_year = '|'.join(f'{month}-{day}' for month, day in zip(months, days))
+    pattern = rf'^(?:\d{{4}}-(?:{any_year})|{_LEAP_YEAR}-{months[2]}-<2><9>)$'
+    return [(_by_value(pattern), 0, True)], None
+
+
+def _ssn_fold():
+    # Area not 000, 666 or 900-999; group not 00; serial not 0000
+    area = r'(?:<0>(?:<0><1-9>|<1-9>\d)|<1-578>\d\d|<6>(?:<0-57-9>\d|<6><0-57-9>))'
+    group = r'(?:<0><1-9>|<1-9>\d)'
+    serial = r'(?:<0>(?:<0>(?:<0><1-9>|<1-9>\d)|<1-9>\d\d)|<1-9>\d{3})'
+    return [(_by_value(rf'^{area}([- ]?){group}\1{serial}$'), 0, True)], None
+
+
+def _any_of(words):
+    # Nothing matches an empty set
+    return alternation(words) if words else r'[^\s\S]'
+
+
+def _phone_fold():
+    codes = _any_of(regex_validators.current_reference_data().area_codes)
+    return [(rf'^(?:\({codes}\)|{codes})[\s-]?\d{{3}}[\s-]?\d{{4}}$', 0, False)], None
+
+
+def _city_state_zip_fold():
+    states = _any_of(regex_validators.current_reference_data().states)
+    return [(rf'^[A-Za-z\s]+,\s{states}\s\d{{5}}(?:-\d{{4}})?$', 0, False)], None
+
+
+def _ion_words_fold():
+    # Odd length counts the newline $ allows, so the letters before 'ion'
+    # are even in number without one and odd with one
+    return [(r'^(?:(?:[a-zA-Z]{2})*ion\Z|[a-zA-Z](?:[a-zA-Z]{2})*ion\n\Z)', 0, False)], None
+
+
+def _policy_fold(policy):
+    # All of: min_length characters, one character of each required class,
+    # and no run of lowercase letters longer than max_lower_run
+    punctuation = ''.join(map(re.escape, policy.punctuation))
+    classes = {'upper': '[A-Z]', 'lower': '[a-z]', 'digit': r'\d',
+               'punctuation': f'[{punctuation}]' if punctuation else r'[^\s\S]'}
+    parts = [(f'.{{{policy.min_length}}}', re.DOTALL, False)]
+    parts.extend((f'.*{classes[name]}', re.DOTALL, False) for name in policy.required)
+    if policy.max_lower_run is not None:
+        run = f'[a-z]{{0,{policy.max_lower_run}}}'
+        parts.append((rf'{run}(?:[^a-z]{run})*\Z', 0, False))
+    return parts, None
+
+
+# Validators whose rule or fast path is written out as patterns: each gives
+# (parts, max_length), where a text is valid when every part matches it and
+# it is at most max_length characters (None = no limit)
+_FOLDS = {
+    regex_validators.URL: lambda: ([(regex_validators.URL.pattern, 0, False)], regex_validators.MAX_URL_LENGTH),
+    regex_validators.EMAIL: lambda: ([(regex_validators.EMAIL.pattern, 0, False)],
+                                     regex_validators.MAX_EMAIL_LENGTH),
+    regex_validators.SSN: _ssn_fold,
+    regex_validators.PHONE: _phone_fold,
+    regex_validators.CITY_STATE_ZIP: _city_state_zip_fold,
+    regex_validators.DATE: lambda: _date_fold(False),
+    regex_validators.DATE_DMY: lambda: _date_fold(True),
+    regex_validators.DATE_ISO: _date_iso_fold,
+    regex_validators.ION_WORDS: _ion_words_fold,
+}
+
+
+def _fold(validator):
+    # (parts, max_length, exact): parts are (pattern, flags, digit values)
+    # triples; exact is False when a rule is left for the validator to check
+    fold = _FOLDS.get(validator)
+    if fold is not None:
+        return fold() + (True,)
+    if isinstance(validator.fast, PasswordPolicy):
+        return _policy_fold(validator.fast) + (True,)
+    # Otherwise a fast path must give the pattern's answers
+    return [(validator.pattern, validator._flags, False)], None, validator.rule is None
+
+
+# --- STATE MACHINE ---
+
+def _unsupported(validator, what):
+    return ValueError(f'validator {validator.name!r} cannot be checked incrementally: {what}')
+
+
+def _escape(code):
+    return f'\\U{code:08x}'
+
+
+def _char_source(op, av):
+    # A regex matching exactly the characters one pattern item accepts, so the
+    # item behaves as it does in re (Unicode \d, IGNORECASE, DOTALL, ...)
+    if op is _sre.LITERAL:
+        return _escape(av)
+    if op is _sre.NOT_LITERAL:
+        return f'[^{_escape(av)}]'
+    if op is _sre.ANY:
+        return '.'
+    parts = []
+    for item_op, item_av in av:
+        if item_op is _sre.NEGATE:
+            parts.insert(0, '^')
+        elif item_op is _sre.LITERAL:
+            parts.append(_escape(item_av))
+        elif item_op is _sre.RANGE:
+            parts.append(f'{_escape(item_av[0])}-{_escape(item_av[1])}')
+        elif item_op is _sre.CATEGORY and item_av in _CATEGORIES:
+            parts.append(_CATEGORIES[item_av])
+        else:
+            return None
+    return f'[{"".join(parts)}]'
+
+
+def _items(subpattern):
+    # The parser's tree as plain (op, av) lists that can be rewritten
+    items = []
+    for op, av in subpattern:
+        if op is _sre.BRANCH:
+            av = (None, [_items(alternative) for alternative in av[1]])
+        elif op is _sre.SUBPATTERN:
+            group, add_flags, del_flags, inner = av
+            av = (group, add_flags or del_flags, _items(inner))
+        elif op in _REPEAT_OPS:
+            av = (av[0], av[1], _items(av[2]))
+        items.append((op, av))
+    return items
+
+
+def _strings(items):
+    # Every string items can match, or None when there are too many or the
+    # items are not plain literals, classes, groups and bounded repeats
+    strings = ['']
+    for op, av in items:
+        if op is _sre.LITERAL:
+            options = [chr(av)]
+        elif op is _sre.IN and all(item_op in (_sre.LITERAL, _sre.RANGE) for item_op, _ in av):
+            options = []
+            for item_op, item_av in av:
+                low, high = (item_av, item_av) if item_op is _sre.LITERAL else item_av
+                if high - low >= _MAX_GROUP_STRINGS:
+                    return None
+                options.extend(map(chr, range(low, high + 1)))
+        elif op is _sre.SUBPATTERN and not av[1]:
+            options = _strings(av[2])
+            if options is None:
+                return None
+        elif op is _sre.BRANCH:
+            options = []
+            for alternative in av[1]:
+                found = _strings(alternative)
+                if found is None:
+                    return None
+                options.extend(found)
+        elif op in _REPEAT_OPS and av[1] < _MAX_GROUP_STRINGS:
+            once = _strings(av[2])
+            if once is None:
+                return None
+            options, repeated = [], ['']
+            for count in range(av[1] + 1):
+                if count >= av[0]:
+                    options.extend(repeated)
+                repeated = [head + tail for head in repeated for tail in once]
+                if len(options) + len(repeated) > _MAX_GROUP_STRINGS:
+                    return None
+        else:
+            return None
+        strings = [head + tail for head in strings for tail in options]
+        if len(strings) > _MAX_GROUP_STRINGS:
+            return None
+    return list(dict.fromkeys(strings))
+
+
+def _find_group(items, group, in_repeat=False):
+    # (items of the group, whether it sits inside a repeat), or None
+    for op, av in items:
+        if op is _sre.SUBPATTERN:
+            if av[0] == group:
+                return av[2], in_repeat
+            found = _find_group(av[2], group, in_repeat)
+        elif op is _sre.BRANCH:
+            found = next(filter(None, (_find_group(alt, group, in_repeat) for alt in av[1])), None)
+        elif op in _REPEAT_OPS:
+            found = _find_group(av[2], group, True)
+        else:
+            continue
+        if found is not None:
+            return found
+    return None
+
+
+def _backreferences(items):
+    for op, av in items:
+        if op is _sre.GROUPREF:
+            yield av
+        elif op is _sre.SUBPATTERN:
+            yield from _backreferences(av[2])
+        elif op is _sre.BRANCH:
+            for alternative in av[1]:
+                yield from _backreferences(alternative)
+        elif op in _REPEAT_OPS:
+            yield from _backreferences(av[2])
+
+
+def _substitute(items, group, text):
+    # items with the group and every backreference to it matching exactly text
+    literals = [(_sre.LITERAL, ord(char)) for char in text]
+    result = []
+    for op, av in items:
+        if op is _sre.GROUPREF and av == group:
+            result.extend(literals)
+        elif op is _sre.SUBPATTERN:
+            inner = literals if av[0] == group else _substitute(av[2], group, text)
+            result.append((op, (av[0], av[1], inner)))
+        elif op is _sre.BRANCH:
+            result.append((op, (None, [_substitute(alt, group, text) for alt in av[1]])))
+        elif op in _REPEAT_OPS:
+            result.append((op, (av[0], av[1], _substitute(av[2], group, text))))
+        else:
+            result.append((op, av))
+    return result
+
+
+class _PrefixMachine:
+    """
+    A validator's patterns as one state machine over the characters typed so far
+    - Built from _fold: a text is valid when every part matches it, it is at
+      most max_length characters long and, unless exact, the rule agrees
+    - Nodes are tuples of one set of pattern positions per part, interned on
+      first use; node 0 is the dead node that no continuation leaves
+    - accepting[node]: every part matches the text that led here
+    - to_go[node]: fewest further characters after which every part matches
+      (_NEVER if none do); a newline after $ does not count, as it cannot
+      make an invalid text valid. Exact for one part, a lower bound for more
+    - max_length: longest valid text (sys.maxsize when there is no cap)
+    """
+    __slots__ = ('start', 'accepting', 'to_go', 'max_length', 'exact', '_edges', '_eps', '_parts',
+                 '_accept', '_distance', '_predicates', '_sets', '_ids', '_next', '_lock')
+
+    def __init__(self, validator):
+        parts, max_length, self.exact = _fold(validator)
+        self.max_length = sys.maxsize if max_length is None else max_length
+        self._edges = []
+        self._eps = []
+        self._predicates = {}
+        self._parts = []
+        roots = [self._build_part(validator, *part) for part in parts]
+        self._accept = set().union(*(accept for accept, _ in self._parts))
+        self._distance = self._distances()
+
+        self._sets = [tuple(frozenset() for _ in parts)]
+        self._ids = {self._sets[0]: 0}
+        self._next = [{}]
+        self.accepting = [False]
+        self.to_go = [_NEVER]
+        self._lock = threading.Lock()
+        self.start = self._intern(tuple(self._closure([root]) for root in roots))
+
+    def _state(self, *edges):
+        self._edges.append(list(edges))
+        self._eps.append([])
+        return len(self._edges) - 1
+
+    def _build_part(self, validator, pattern, flags, digit_values):
+        # Adds one pattern's positions; returns its entry position
+        parsed = _sre.parse(pattern, flags)
+        flags = parsed.state.flags
+        if flags & re.MULTILINE:
+            raise _unsupported(validator, 'MULTILINE patterns')
+        items = _items(parsed)
+        # re.match is anchored at the start already
+        if items[:1] == [(_sre.AT, _sre.AT_BEGINNING)]:
+            items = items[1:]
+        for group in dict.fromkeys(_backreferences(items)):
+            found = _find_group(items, group)
+            strings = None if found is None or found[1] else _strings(found[0])
+            if strings is None:
+                raise _unsupported(validator, f'backreference to group {group}')
+            items = [(_sre.BRANCH, (None, [_substitute(items, group, text) for text in strings]))]
+
+        char_flags = flags & ~(re.VERBOSE | re.MULTILINE)
+        state = self._state
+
+        def predicate(op, av):
+            if digit_values and op is _sre.LITERAL and 0 <= av - _VALUES_BASE < _VALUES_MASKS:
+                key = av
+            else:
+                key = (_char_source(op, av), char_flags)
+                if key[0] is None:
+                    raise _unsupported(validator, f'character class {av!r}')
+            if key not in self._predicates:
+                self._predicates[key] = (_value_predicate(av - _VALUES_BASE) if key == av
+                                         else re.compile(*key).fullmatch)
+            return self._predicates[key]
+
+        # Where the pattern ends: re.match allows anything after it (final),
+        # a newline and nothing else after $ (end), nothing after \Z
+        final = state()
+        self._edges[final].append((_ANY_CHAR, final))
+        end_of_text = state()
+        end = state((predicate(_sre.LITERAL, ord('\n')), end_of_text))
+        self._parts.append(({final, end, end_of_text}, {end, end_of_text}))
+
+        def build(items, out):
+            # Entry state of items, continuing to out; built back to front
+            for op, av in reversed(items):
+                if op in _CHAR_OPS:
+                    out = state((predicate(op, av), out))
+                elif op is _sre.SUBPATTERN:
+                    if av[1]:
+                        raise _unsupported(validator, 'scoped inline flags')
+                    out = build(av[2], out)
+                elif op is _sre.BRANCH:
+                    entry = state()
+                    self._eps[entry].extend(build(alternative, out) for alternative in av[1])
+                    out = entry
+                elif op in _REPEAT_OPS:
+                    low, high, inner = av
+                    if high is _sre.MAXREPEAT:
+                        tail = state()
+                        self._eps[tail].extend((build(inner, tail), out))
+                    else:
+                        tail = out
+                        for _ in range(high - low):
+                            optional = state()
+                            self._eps[optional].extend((build(inner, tail), out))
+                            tail = optional
+                    for _ in range(low):
+                        tail = build(inner, tail)
+                    out = tail
+                elif op is _sre.AT and av in (_sre.AT_END, _sre.AT_END_STRING):
+                    if out != final:
+                        raise _unsupported(validator, '$ before the end of the pattern')
+                    out = end if av is _sre.AT_END else end_of_text
+                else:
+                    raise _unsupported(validator, f'{str(op).lower()} in the pattern')
+            return out
+
+        return build(items, final)
+
+    def _distances(self):
+        # Fewest characters from each pattern position to the end of its
+        # pattern (_NEVER when it cannot get there): a breadth-first search
+        # back from the accepting positions, where only characters cost one
+        reverse = [[] for _ in self._edges]
+        for source, edges in enumerate(self._edges):
+            for _, target in edges:
+                reverse[target].append((source, 1))
+            for target in self._eps[source]:
+                reverse[target].append((source, 0))
+        distance = [_NEVER] * len(self._edges)
+        pending = deque(self._accept)
+        for position in pending:
+            distance[position] = 0
+        while pending:
+            target = pending.popleft()
+            for source, cost in reverse[target]:
+                if distance[target] + cost < distance[source]:
+                    distance[source] = distance[target] + cost
+                    if cost:
+                        pending.append(source)
+                    else:
+                        pending.appendleft(source)
+        return distance
+
+    def _closure(self, states):
+        seen = set(states)
+        pending = list(states)
+        while pending:
+            for target in self._eps[pending.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    pending.append(target)
+        # Positions with nothing to match are only kept if they accept
+        return frozenset(s for s in seen if self._edges[s] or s in self._accept)
+
+    def _part_to_go(self, states, after_end):
+        distance = self._distance
+        return min((1 + distance[to] for s in states if s not in after_end for _, to in self._edges[s]),
+                   default=_NEVER)
+
+    def _intern(self, sets):
+        if not all(sets):
+            return 0  # some part can no longer match
+        node = self._ids.get(sets)
+        if node is None:
+            with self._lock:
+                node = self._ids.get(sets)
+                if node is None:
+                    node = len(self._sets)
+                    self._sets.append(sets)
+                    self._next.append({})
+                    self.accepting.append(all(not accept.isdisjoint(states)
+                                              for (accept, _), states in zip(self._parts, sets)))
+                    self.to_go.append(max(self._part_to_go(states, after_end)
+                                          for (_, after_end), states in zip(self._parts, sets)))
+                    self._ids[sets] = node
+        return node
+
+    def step(self, node, char):
+        """
+        The node reached from node by typing char
+        """
+        moves = self._next[node]
+        target = moves.get(char)
+        if target is None:
+            target = self._intern(tuple(
+                self._closure([to for s in states for match, to in self._edges[s] if match(char)])
+                for states in self._sets[node]))
+            if len(moves) < _MAX_CACHED_CHARS:
+                moves[char] = target
+        return target
+
+
+class _FullMatchMachine:
+    """
+    Stands in for _PrefixMachine when re's private parser cannot be used
+    - One node, from which every text could still become valid: the status
+      is COMPLETE when the validator accepts the whole text, VIABLE otherwise
+    """
+    __slots__ = ()
+    start = 0
+    accepting = (True,)
+    to_go = (0,)
+    max_length = sys.maxsize
+    exact = False
+
+    def step(self, node, char):
+        return 0
+
+
+_FULL_MATCH = _FullMatchMachine()
+
+
+@functools.lru_cache(maxsize=64)
+def _machine(validator, reference_data):
+    # reference_data only keys the cache: the phone and city_state_zip
+    # machines spell out the area codes and states installed when built
+    if _sre is None:
+        return _FULL_MATCH
+    try:
+        return _PrefixMachine(validator)
+    except _PARSER_ERRORS:
+        return _FULL_MATCH
+
+
+class IncrementalValidator:
+    """
+    Validation state of one input that is typed a character at a time
+    - kind: a registry name ('phone', 'date', 'currency', ...) or a Validator
+    - feed(chars) appends characters and returns the new status; backspace()
+      removes them again; both cost one cached step per character
+    - status: COMPLETE, VIABLE or DEAD
+    - COMPLETE means validate_*(text) is True; a COMPLETE text may still grow
+      into another valid one ('google.com' -> 'google.com/maps')
+    - For a custom validator with a rule, VIABLE only means the pattern can
+      still match, and each keystroke that completes the pattern runs the
+      validator over the whole text
+    """
+    __slots__ = ('validator', 'status', '_machine', '_chars', '_nodes')
+
+    def __init__(self, kind, text=''):
+        self.validator = _resolve(kind)
+        self._machine = _machine(self.validator, regex_validators.current_reference_data())
+        self.reset()
+        if text:
+            self.feed(text)
+
+    @property
+    def text(self):
+        return ''.join(self._chars)
+
+    def reset(self):
+        """
+        Clears the input
+        """
+        self._chars = []
+        self._nodes = [self._machine.start]
+        self.status = self._status()
+        return self.status
+
+    def feed(self, chars):
+        """
+        Appends chars (one keystroke or a pasted string) and returns the status
+        """
+        step = self._machine.step
+        node = self._nodes[-1]
+        for char in chars:
+            node = step(node, char)
+            self._chars.append(char)
+            self._nodes.append(node)
+        self.status = self._status()
+        return self.status
+
+    def backspace(self, count=1):
+        """
+        Removes the last count characters and returns the status
+        """
+        count = min(count, len(self._chars))
+        if count:
+            del self._chars[-count:]
+            del self._nodes[-count:]
+        self.status = self._status()
+        return self.status
+
+    def _status(self):
+        node = self._nodes[-1]
+        machine = self._machine
+        length = len(self._chars)
+        if (machine.accepting[node] and length <= machine.max_length
+                and (machine.exact or self.validator.check(self.text))):
+            return COMPLETE
+        return VIABLE if length + machine.to_go[node] <= machine.max_length else DEAD
+
+    def __repr__(self):
+        return f'IncrementalValidator({self.validator.name!r}, {self.text!r}) -> {self.status}'
+
+
+def prefix_status(kind, text):
+    """
+    COMPLETE, VIABLE or DEAD for text typed so far, without keeping any state
+    """
+    return IncrementalValidator(kind, text).status
@@ -0,0 +1,292 @@
+"""
+Validation of newline-delimited files through a memory mapping
+- One MULTILINE bytes pattern runs over the mapped file and finds the invalid
+  lines; valid lines never become Python objects at all
+- Reports the byte offset where each invalid line starts
+- line_ranges splits a mapping into line-aligned byte ranges, so ranges can
+  be scanned independently (see ValidatorPool.validate_file)
+
+Command line:
+  python mmap_validators.py phones.txt phone
+"""
+import functools
+import mmap
+import os
+import re
+import sys
+from array import array
+
+import regex_validators
+from regex_validators import _NOT_PLAIN_ASCII, _resolve, alternation
+
+
+# Flags a line pattern may carry; anything else (DOTALL, VERBOSE, ...) is
+# not rewritten and falls back to a slower mode
+_LINE_FLAGS = re.IGNORECASE | re.UNICODE
+
+
+def _ssn_line_pattern():
+    # _ssn_rule as lookaheads: area not 000, 666 or 9xx; group not 00; serial not 0000
+    return r'^(?!000|666|9\d\d)(\d{3})([- ]?)(?!00)(\d{2})\2(?!0000)(\d{4})$'
+
+
+def _phone_line_pattern():
+    codes = alternation(regex_validators.VALID_AREA_CODES)
+    return rf'^(\(({codes})\)|({codes}))[\s-]?\d{{3}}[\s-]?\d{{4}}$'
+
+
+def _city_state_zip_line_pattern():
+    states = alternation(regex_validators.VALID_STATES)
+    return rf'^[A-Za-z\s]+,\s({states})\s\d{{5}}(?:-\d{{4}})?$'
+
+
+# Validators whose post-match rule can be written into the pattern itself,
+# so a file scan needs no Python work per valid line. Built from the
+# installed reference data at scan time.
+RULE_PATTERNS = {
+    regex_validators.SSN: _ssn_line_pattern,
+    regex_validators.PHONE: _phone_line_pattern,
+    regex_validators.CITY_STATE_ZIP: _city_state_zip_line_pattern,
+}
+
+
+def _line_bound(pattern):
+    # Rewrites a pattern so it cannot match across a newline: \s loses \n and
+    # negated classes gain it. Returns None when that is not possible.
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escape = pattern[i:i + 2]
+            if escape in ('\\D', '\\W'):
+                return None
+            if escape == '\\s':
+                escape = ' \\t\\r\\x0b\\x0c' if in_class else '[ \\t\\r\\x0b\\x0c]'
+            out.append(escape)
+            i += 2
+            continue
+        if char == '[' and not in_class:
+            in_class = True
+            opening = '[^\\n' if pattern.startswith('[^', i) else '['
+            out.append(opening)
+            i += 2 if opening != '[' else 1
+            # A ] right after the opening bracket is a literal
+            if pattern.startswith(']', i):
+                out.append(']')
+                i += 1
+            continue
+        if char == ']' and in_class:
+            in_class = False
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_invalid_lines(pattern, flags):
+    bounded = _line_bound(pattern)
+    if bounded is None:
+        return None
+    try:
+        return re.compile(f'^(?!{bounded}).*'.encode('ascii'), re.MULTILINE | (flags & re.IGNORECASE))
+    except (UnicodeEncodeError, re.error):
+        return None
+
+
+def _invalid_lines_regex(validator):
+    # A MULTILINE bytes pattern matching exactly the lines validator rejects
+    # (up to the non-ASCII re-check), or None
+    if validator.lines_regex is None and validator not in RULE_PATTERNS:
+        return None
+    if validator.regex.flags & ~_LINE_FLAGS:
+        return None
+    if validator in RULE_PATTERNS:
+        pattern = RULE_PATTERNS[validator]()
+    elif validator.rule is None:
+        pattern = validator.pattern
+    else:
+        return None
+    return _compile_invalid_lines(pattern, validator.regex.flags)
+
+
+@functools.lru_cache(maxsize=64)
+def _valid_lines_pattern(validator):
+    # (MULTILINE bytes pattern, bytes rule) for joinable validators whose rule
+    # has a bytes version, or None when lines have to be checked one at a time
+    if validator.lines_regex is None or (validator.rule is not None and validator.bytes_rule is None):
+        return None
+    try:
+        regex = re.compile(validator.lines_regex.pattern.encode('ascii'),
+                           validator.lines_regex.flags & ~re.UNICODE)
+    except (UnicodeEncodeError, ValueError):
+        return None
+    return regex, validator.bytes_rule
+
+
+def _line_is_valid(validator, data, start, end):
+    # Only reached for lines the bytes pattern rejected: a line with bytes
+    # that str patterns read differently gets a second look through str
+    if not _NOT_PLAIN_ASCII.search(data, start, end):
+        return False
+    return validator.check_bytes(data, start, end)
+
+
+def _scan_invalid(validator, regex, data, start, end, offsets):
+    # Every match is an invalid line; valid lines cost no Python work at all
+    not_plain = _NOT_PLAIN_ASCII.search
+    if not not_plain(data, start, end):
+        # All plain ASCII (the usual case): every match is final
+        offsets.extend(match.start() for match in regex.finditer(data, start, end))
+        if offsets and offsets[-1] == end:
+            offsets.pop()  # the empty "line" after a final newline
+        return
+    append = offsets.append
+    for match in regex.finditer(data, start, end):
+        line_start, line_end = match.span()
+        if line_start == end:
+            break  # the empty "line" after a final newline
+        if not_plain(data, line_start, line_end) and validator.check_bytes(data, line_start, line_end):
+            continue
+        append(line_start)
+
+
+def _scan_valid(validator, regex, rule, data, start, end, offsets):
+    # Every match is a candidate valid line; lines in between are invalid
+    find = data.find
+    pos = start
+    for match in regex.finditer(data, start, end):
+        match_start, match_end = match.span()
+        # Lines the search skipped over did not match
+        while pos < match_start:
+            line_end = find(b'\n', pos, match_start)
+            if not _line_is_valid(validator, data, pos, line_end):
+                offsets.append(pos)
+            pos = line_end + 1
+        if find(b'\n', match_start, match_end) >= 0:
+            # A \s in the pattern matched a newline: check those lines one by one
+            while pos <= match_end:
+                line_end = find(b'\n', pos, end)
+                if line_end < 0:
+                    line_end = end
+                if not validator.check_bytes(data, pos, line_end):
+                    offsets.append(pos)
+                pos = line_end + 1
+            continue
+        if rule is not None and not rule(match):
+            offsets.append(match_start)
+        pos = match_end + 1
+    _scan_each(validator, data, pos, end, offsets, _line_is_valid)
+
+
+def _scan_each(validator, data, pos, end, offsets, is_valid):
+    find = data.find
+    while pos < end:
+        line_end = find(b'\n', pos, end)
+        if line_end < 0:
+            line_end = end
+        if not is_valid(validator, data, pos, line_end):
+            offsets.append(pos)
+        pos = line_end + 1
+
+
+def _check_line(validator, data, start, end):
+    return validator.check_bytes(data, start, end)
+
+
+def invalid_line_offsets(kind, data, start=0, end=None):
+    """
+    Finds the invalid lines of a newline-delimited bytes-like buffer or mmap
+    - kind: a registry name or a Validator
+    - start must be the start of a line; end the end of the buffer or just
+      past a newline
+    - Returns an array('q') of the byte offsets where invalid lines start
+    - Fastest for validators in RULE_PATTERNS and joinable validators without
+      a rule: one pattern finds the invalid lines and valid lines are never
+      touched from Python
+    """
+    validator = _resolve(kind)
+    if end is None:
+        end = len(data)
+    offsets = array('q')
+    regex = _invalid_lines_regex(validator)
+    if regex is not None:
+        _scan_invalid(validator, regex, data, start, end, offsets)
+        return offsets
+    lines = _valid_lines_pattern(validator)
+    if lines is not None:
+        _scan_valid(validator, *lines, data, start, end, offsets)
+    else:
+        _scan_each(validator, data, start, end, offsets, _check_line)
+    return offsets
+
+
+def line_ranges(data, parts, start=0, end=None):
+    """
+    Splits data[start:end] into up to parts (start, end) byte ranges
+    - Every range starts at a line start and ends just past a newline (or at end)
+    - Ranges are contiguous and cover the whole span
+    """
+    if end is None:
+        end = len(data)
+    bounds = [start]
+    for part in range(1, parts):
+        cut = data.find(b'\n', max(bounds[-1], start + (end - start) * part // parts), end)
+        if cut < 0:
+            break
+        if cut + 1 < end:
+            bounds.append(cut + 1)
+    bounds.append(end)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+
+
+def open_mapping(path):
+    """
+    Maps a file read-only for a sequential scan; returns None for an empty file
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mapped, 'madvise'):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+    return mapped
+
+
+def validate_file_range(kind, path, start=0, end=None):
+    """
+    invalid_line_offsets for one line-aligned range of a file, mapped here
+    - What ValidatorPool.validate_file runs in each worker
+    """
+    mapped = open_mapping(path)
+    if mapped is None:
+        return array('q')
+    with mapped:
+        return invalid_line_offsets(kind, mapped, start, end)
+
+
+def validate_file(kind, path):
+    """
+    Validates every line of a newline-delimited file through a memory mapping
+    - Returns an array('q') of the byte offsets of invalid lines, in file order
+    - A trailing newline does not add an empty line; \\r\\n line endings
+      leave a \\r on each line (which makes it invalid)
+    """
+    return validate_file_range(kind, path)
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+    path, kind = argv
+    offsets = validate_file(kind, path)
+    for offset in offsets:
+        print(f'invalid line at byte {offset}')
+    print(f'{len(offsets):,} invalid lines', file=sys.stderr)
+    return 1 if offsets else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
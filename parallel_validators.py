@@ -0,0 +1,194 @@
+"""
+Multi-core bulk validation with a reusable process pool
+- Regex matching holds the GIL, so bulk work is split across processes
+- Workers start once and are reused; each imports regex_validators a single
+  time, so compiled patterns, VALID_AREA_CODES and VALID_STATES are built
+  once per worker rather than once per task
+- Results come back in input order
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import mmap_validators
+import regex_validators
+
+# Below this many rows the pickling round trip costs more than it saves
+MIN_PARALLEL_ROWS = 20_000
+# Chunks smaller than this spend more time in pickling than in matching
+MIN_CHUNK_ROWS = 2_000
+# Chunks per worker: enough to even out slow chunks without flooding the queue
+CHUNKS_PER_WORKER = 4
+# Files smaller than this are scanned in this process
+MIN_PARALLEL_BYTES = 1 << 20
+
+
+def _init_worker(tables_path=None, reference=None):
+    # Runs once per worker process; with the fork start method the module is
+    # already imported and only the shared tables (if any) are mapped here.
+    # reference: (area codes, states) installed in the parent after the pool
+    # first started, which replace the tables
+    if reference is not None:
+        regex_validators.install_reference_data(regex_validators.ReferenceData(*reference))
+    elif tables_path is not None:
+        regex_validators.install_reference_data(regex_validators.map_reference_tables(tables_path))
+
+
+def _registered_name(kind):
+    # The registry name workers look kind up by; a Validator object must be
+    # the registered one, since workers only have the registry
+    if isinstance(kind, regex_validators.Validator):
+        if regex_validators.VALIDATORS.get(kind.name) is not kind:
+            raise ValueError(f'validator {kind.name!r} is not the registered one; worker processes '
+                             f'can only run registered validators')
+        return kind.name
+    regex_validators.get_validator(kind)  # fail fast on unknown names
+    return kind
+
+
+def _validate_chunk(kind, rows):
+    return bytes(regex_validators.validate_many(kind, rows))
+
+
+def chunk_size_for(rows, workers):
+    """
+    Picks a chunk size that gives each worker a few chunks
+    - Never below MIN_CHUNK_ROWS so per-chunk overhead stays small
+    """
+    return max(MIN_CHUNK_ROWS, -(-rows // (workers * CHUNKS_PER_WORKER)))
+
+
+class ValidatorPool:
+    """
+    A process pool for bulk validation
+    - workers: number of processes (defaults to os.cpu_count())
+    - tables_path: optional file from regex_validators.write_reference_tables;
+      every worker maps it instead of holding its own copy of the tables
+    - Processes start on first use and are reused until close()
+    - Workers follow this process's reference data: after install_reference_data
+      or reload_reference_data, the next call starts fresh workers with the
+      new area codes and states (tables_path is then no longer mapped)
+    - Usable as a context manager
+    """
+
+    def __init__(self, workers=None, tables_path=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.tables_path = tables_path
+        self._executor = None
+        # The reference data the workers run with, and the data that was
+        # installed when tables_path was first mapped
+        self._reference_data = None
+        self._tables_data = None
+
+    def _get_executor(self):
+        current = regex_validators.current_reference_data()
+        if self._executor is not None and current is not self._reference_data:
+            # Reference data was swapped since the workers started: tasks
+            # already queued finish on the old workers, new ones get new workers
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._executor is None:
+            if self._tables_data is None:
+                self._tables_data = current
+            if self.tables_path is not None and current is self._tables_data:
+                reference = None
+            else:
+                reference = (current.area_codes, current.states)
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                 initargs=(self.tables_path, reference))
+            self._reference_data = current
+        return self._executor
+
+    def validate_many(self, kind, iterable, chunk_size=None):
+        """
+        Validates every string in iterable across the worker processes
+        - kind: a registry name or a registered Validator (custom validators
+          must be registered at import time of a module the workers also
+          import); an unregistered or shadowed Validator raises ValueError
+        - Returns a bytearray of 1/0 results in input order
+        - Small inputs are validated in this process
+        """
+        kind = _registered_name(kind)
+        rows = iterable if isinstance(iterable, list) else list(iterable)
+        if chunk_size is None:
+            if len(rows) < MIN_PARALLEL_ROWS or self.workers == 1:
+                return regex_validators.validate_many(kind, rows)
+            chunk_size = chunk_size_for(len(rows), self.workers)
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        result = bytearray()
+        for part in self._get_executor().map(_validate_chunk, [kind] * len(chunks), chunks):
+            result += part
+        return result
+
+    def validate_file(self, kind, path, parts=None):
+        """
+        mmap_validators.validate_file across the worker processes
+        - The file is split into parts line-aligned byte ranges (default: a few
+          per worker); each worker maps the file itself, so no lines are pickled
+        - Returns an array('q') of invalid line offsets in file order
+        - Small files are scanned in this process
+        """
+        kind = _registered_name(kind)
+        mapped = mmap_validators.open_mapping(path)
+        if mapped is None:
+            return array('q')
+        with mapped:
+            if parts is None:
+                if len(mapped) < MIN_PARALLEL_BYTES or self.workers == 1:
+                    return mmap_validators.invalid_line_offsets(kind, mapped)
+                parts = self.workers * CHUNKS_PER_WORKER
+            ranges = mmap_validators.line_ranges(mapped, parts)
+        offsets = array('q')
+        for part in self._get_executor().map(mmap_validators.validate_file_range, [kind] * len(ranges),
+                                             [path] * len(ranges), *zip(*ranges)):
+            offsets += part
+        return offsets
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_shared_pool = None
+
+
+def get_pool():
+    """
+    Returns the process-wide shared ValidatorPool, creating it on first use
+    """
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = ValidatorPool()
+    return _shared_pool
+
+
+def validate_many_parallel(kind, iterable, chunk_size=None):
+    """
+    validate_many on the shared process pool
+    - Same arguments and bytearray result as ValidatorPool.validate_many
+    """
+    return get_pool().validate_many(kind, iterable, chunk_size)
+
+
+def validate_file_parallel(kind, path, parts=None):
+    """
+    ValidatorPool.validate_file on the shared process pool
+    """
+    return get_pool().validate_file(kind, path, parts)
+
+
+def shutdown_pool():
+    """
+    Stops the shared pool's worker processes (a later call starts new ones)
+    """
+    global _shared_pool
+    if _shared_pool is not None:
+        _shared_pool.close()
+        _shared_pool = None
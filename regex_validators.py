@@ -1,4 +1,33 @@
+import functools
+import marshal
+import os
 import re
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+
+# csv, json and mmap are imported where reference files are read, and NumPy
+# (optional) only when asked for: a script checking one field pays for none
+# of them
+
+
+def _ndarray_numpy(value):
+    # NumPy when value is a NumPy array, else None. An array argument means
+    # NumPy is already imported, so this never imports it.
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return numpy
+    return None
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:  # NumPy is optional; only the array-based helpers need it
+        return None
+    return numpy
+
 # --- EXTRA CREDIT DATA ---
 
 # Valid US state abbreviations (50 states + DC)
@@ -57,6 +86,673 @@ VALID_AREA_CODES = {
     '954', '956', '959', '970', '971', '972', '973', '975', '978', '979',
     '980', '984', '985', '986', '989'
 }
+
+# --- LOOKUP TABLES ---
+# Array-backed copies of VALID_AREA_CODES and VALID_STATES for bytes and
+# vectorized callers: they index by character values instead of building
+# and hashing a string. Plain str validators keep using the sets, which are
+# faster for a single Python-level lookup.
+
+def build_area_code_table(codes):
+    """
+    Builds a 1000-entry bytearray: entry N is 1 when area code N is valid
+    """
+    table = bytearray(1000)
+    for code in codes:
+        table[int(code)] = 1
+    return table
+
+
+def build_state_table(states):
+    """
+    Builds a 26x26 bytearray: entry (first - 'A') * 26 + (second - 'A') is 1
+    when that two-letter state abbreviation is valid
+    """
+    table = bytearray(26 * 26)
+    for state in states:
+        table[(ord(state[0]) - 65) * 26 + ord(state[1]) - 65] = 1
+    return table
+
+
+def area_code_valid_at(data, offset=0):
+    """
+    Checks the 3 ASCII digits at data[offset:offset + 3] against AREA_CODE_TABLE
+    - data: bytes, bytearray, memoryview or mmap; nothing is copied
+    """
+    if len(data) < offset + 3:
+        return False
+    first, second, third = data[offset] - 48, data[offset + 1] - 48, data[offset + 2] - 48
+    if not (0 <= first <= 9 and 0 <= second <= 9 and 0 <= third <= 9):
+        return False
+    return _reference_data.area_code_table[first * 100 + second * 10 + third] == 1
+
+
+def state_valid_at(data, offset=0):
+    """
+    Checks the 2 ASCII uppercase letters at data[offset:offset + 2] against STATE_TABLE
+    - data: bytes, bytearray, memoryview or mmap; nothing is copied
+    """
+    if len(data) < offset + 2:
+        return False
+    first, second = data[offset] - 65, data[offset + 1] - 65
+    if not (0 <= first < 26 and 0 <= second < 26):
+        return False
+    return _reference_data.state_table[first * 26 + second] == 1
+
+
+def area_codes_valid(codes):
+    """
+    Looks up a column of integer area codes
+    - A NumPy integer array gives a NumPy bool array (one table gather)
+    - Any other iterable of ints gives a bytearray of 1/0
+    - Codes outside 0-999 are invalid
+    """
+    table = _reference_data.area_code_table
+    np = _ndarray_numpy(codes)
+    if np is not None:
+        in_range = (codes >= 0) & (codes < 1000)
+        table = np.frombuffer(table, dtype=np.bool_)
+        return in_range & table[np.where(in_range, codes, 0)]
+    return bytearray([0 <= code < 1000 and table[code] for code in codes])
+
+
+def states_valid(letters):
+    """
+    Looks up a column of two-letter state abbreviations given as character codes
+    - A NumPy uint8 array of shape (N, 2) gives a NumPy bool array
+    - Any other iterable of 2-byte values (bytes, memoryview slices) gives a bytearray
+    """
+    np = _ndarray_numpy(letters)
+    if np is not None:
+        first = letters[:, 0].astype(np.intp) - 65
+        second = letters[:, 1].astype(np.intp) - 65
+        in_range = (first >= 0) & (first < 26) & (second >= 0) & (second < 26)
+        table = np.frombuffer(_reference_data.state_table, dtype=np.bool_)
+        return in_range & table[np.where(in_range, first * 26 + second, 0)]
+    return bytearray([len(pair) == 2 and state_valid_at(pair) for pair in letters])
+
+
+# --- REFERENCE DATA ---
+# The lookup data (VALID_AREA_CODES, VALID_STATES, their _BYTES twins,
+# AREA_CODE_TABLE, STATE_TABLE) can be replaced at runtime from a data file.
+# Validators read it without locks; install_reference_data swaps it all at
+# once. Only the two str sets are plain globals: the bytes sets and tables
+# are built on first use and reached through _reference_data (or the module
+# __getattr__ at the end of this section).
+
+# A whole list of entries, one per line, checked with a single match
+_AREA_CODE_LINES = re.compile(r'(?:[0-9]{3}\n)*\Z')
+_STATE_LINES = re.compile(r'(?:[A-Z]{2}\n)*\Z')
+_AREA_CODE_ENTRY = re.compile(r'[0-9]{3}\Z')
+_STATE_ENTRY = re.compile(r'[A-Z]{2}\Z')
+
+# Binary table file: magic, then the area-code table, then the state table
+_TABLES_MAGIC = b'RVT1'
+_TABLES_SIZE = len(_TABLES_MAGIC) + 1000 + 26 * 26
+# Snapshot file: magic, then the marshalled area codes, states and tables
+# (the bytes sets are not stored: they are derived from the installed sets)
+_SNAPSHOT_MAGIC = b'RVS2'
+# Environment variable naming a snapshot to use instead of the built-in lists
+SNAPSHOT_ENV = 'REGEX_VALIDATORS_SNAPSHOT'
+
+
+def _entries_match(entries, lines_regex, width):
+    # True when every entry matches; one regex call instead of one per entry
+    text = ''.join(entry + '\n' for entry in entries)
+    return len(text) == (width + 1) * len(entries) and lines_regex.match(text) is not None
+
+
+def alternation(words):
+    """
+    A regex matching exactly one of a set of equal-length words, as a trie
+    - {'201', '206', '253'} -> (?:2(?:0[16]|53)); Python's re tries plain
+      alternatives one by one, a trie reads each character once
+    - Used to write the area codes and states into patterns
+    """
+    if all(len(word) == 1 for word in words):
+        if len(words) == 1:
+            return re.escape(next(iter(words)))
+        return '[' + ''.join(sorted(map(re.escape, words))) + ']'
+    heads = {}
+    for word in words:
+        heads.setdefault(word[0], set()).add(word[1:])
+    branches = [re.escape(head) + alternation(tails) for head, tails in sorted(heads.items())]
+    return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+
+class ReferenceData:
+    """
+    One consistent snapshot of the lookup data
+    - area_codes / states: frozensets of strings
+    - area_codes_bytes / states_bytes: the same entries as bytes, for check_bytes
+    - area_code_table / state_table: the matching lookup tables (built from
+      the sets unless given, e.g. when mapped from a shared file)
+    - The bytes sets and tables are built on first access
+    - source / mtime: the file the snapshot was loaded from, if any
+    - Raises ValueError for malformed entries
+    """
+    __slots__ = ('area_codes', 'states', 'area_codes_bytes', 'states_bytes',
+                 'area_code_table', 'state_table', 'source', 'mtime')
+
+    def __init__(self, area_codes, states, area_code_table=None, state_table=None,
+                 source=None, mtime=None):
+        self.area_codes = frozenset(f'{code:03d}' if isinstance(code, int) else code for code in area_codes)
+        self.states = frozenset(states)
+        if not (_entries_match(self.area_codes, _AREA_CODE_LINES, 3)
+                and _entries_match(self.states, _STATE_LINES, 2)):
+            bad = sorted(code for code in self.area_codes if not _AREA_CODE_ENTRY.match(code))
+            bad += sorted(state for state in self.states if not _STATE_ENTRY.match(state))
+            raise ValueError(f'malformed reference entries: {", ".join(map(repr, bad[:10]))}')
+        if area_code_table is not None:
+            self.area_code_table = area_code_table
+        if state_table is not None:
+            self.state_table = state_table
+        self.source = source
+        self.mtime = mtime
+
+    def __getattr__(self, name):
+        # Only reached for a derived slot that has not been built yet
+        if name == 'area_codes_bytes':
+            value = frozenset(code.encode('ascii') for code in self.area_codes)
+        elif name == 'states_bytes':
+            value = frozenset(state.encode('ascii') for state in self.states)
+        elif name == 'area_code_table':
+            value = bytes(build_area_code_table(self.area_codes))
+        elif name == 'state_table':
+            value = bytes(build_state_table(self.states))
+        else:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+    def __repr__(self):
+        return (f'ReferenceData({len(self.area_codes)} area codes, {len(self.states)} states, '
+                f'source={self.source!r})')
+
+
+def load_reference_data(path):
+    """
+    Reads area codes and states from a JSON or CSV file into a ReferenceData
+    - JSON: {"area_codes": ["201", ...], "states": ["AL", ...]}
+    - CSV: one "area_code,201" or "state,AL" row per entry
+    - The file type is taken from the extension (.json, otherwise CSV)
+    """
+    import csv
+    import json
+    path = os.fspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            raw = json.load(f)
+            area_codes, states = raw['area_codes'], raw['states']
+        else:
+            area_codes, states = [], []
+            for row in csv.reader(f):
+                if not row:
+                    continue
+                kind, value = (field.strip() for field in row[:2])
+                if kind == 'area_code':
+                    area_codes.append(value)
+                elif kind == 'state':
+                    states.append(value)
+                else:
+                    raise ValueError(f'{path}: unknown entry kind {kind!r}')
+    return ReferenceData(area_codes, states, source=path, mtime=mtime)
+
+
+def install_reference_data(data):
+    """
+    Swaps in a ReferenceData for every validator
+    - Readers see either all of the old lookups or all of the new ones: the
+      globals are replaced by a single dict update while the GIL is held
+    - Returns the previously installed ReferenceData
+    """
+    previous = _reference_data
+    globals().update(
+        VALID_AREA_CODES=data.area_codes,
+        VALID_STATES=data.states,
+        _reference_data=data,
+    )
+    # Cached results may have been computed against the old lookups
+    for validator in VALIDATORS.values():
+        if validator.cache is not None:
+            validator.cache.clear()
+    return previous
+
+
+def current_reference_data():
+    """
+    Returns the installed ReferenceData
+    """
+    return _reference_data
+
+
+def reload_reference_data(path, only_if_changed=False):
+    """
+    Loads a JSON/CSV data file and installs it
+    - only_if_changed=True skips the load when the installed data came from the
+      same path with the same modification time (cheap enough to poll)
+    - Returns True when new data was installed
+    """
+    path = os.fspath(path)
+    current = _reference_data
+    if only_if_changed and current.source == path and current.mtime == os.stat(path).st_mtime_ns:
+        return False
+    install_reference_data(load_reference_data(path))
+    return True
+
+
+def _write_atomically(path, chunks):
+    # Written to a temporary name and renamed into place
+    path = os.fspath(path)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(temporary, path)
+
+
+def write_reference_tables(path, data=None):
+    """
+    Writes the lookup tables of data (default: the installed data) to a binary
+    file that map_reference_tables can share between processes
+    - The file is written to a temporary name and renamed into place
+    """
+    data = data or _reference_data
+    _write_atomically(path, (_TABLES_MAGIC, data.area_code_table, data.state_table))
+
+
+def map_reference_tables(path):
+    """
+    Memory-maps a file from write_reference_tables as a ReferenceData
+    - The tables are read-only views of the mapping, so every process that
+      maps the same file shares one copy of the pages
+    - Raises ValueError if the file is not a table file
+    """
+    import mmap
+    path = os.fspath(path)
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) != _TABLES_SIZE or mapped[:len(_TABLES_MAGIC)] != _TABLES_MAGIC:
+        mapped.close()
+        raise ValueError(f'{path} is not a reference table file')
+    view = memoryview(mapped)
+    start = len(_TABLES_MAGIC)
+    area_code_table = view[start:start + 1000]
+    state_table = view[start + 1000:]
+    area_codes = [f'{code:03d}' for code in range(1000) if area_code_table[code]]
+    states = [chr(65 + index // 26) + chr(65 + index % 26) for index in range(26 * 26) if state_table[index]]
+    return ReferenceData(area_codes, states, area_code_table, state_table,
+                         source=path, mtime=os.stat(path).st_mtime_ns)
+
+
+def write_reference_snapshot(path, data=None):
+    """
+    Saves data (default: the installed data) as a snapshot that
+    load_reference_snapshot reads back without parsing or rebuilding
+    - Holds the sets and the lookup tables, marshalled; the file is only
+      readable by the same Python version
+    - The file is written to a temporary name and renamed into place
+    """
+    data = data or _reference_data
+    payload = (data.area_codes, data.states, bytes(data.area_code_table), bytes(data.state_table))
+    _write_atomically(path, (_SNAPSHOT_MAGIC, marshal.dumps(payload)))
+
+
+def load_reference_snapshot(path):
+    """
+    Reads a file from write_reference_snapshot as a ReferenceData
+    - Much cheaper than load_reference_data: the entries were checked when
+      the snapshot was written, and the sets and tables come back ready-made
+    - Raises ValueError if the file is not a snapshot (or is from another
+      Python version)
+    """
+    path = os.fspath(path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+        mtime = os.fstat(f.fileno()).st_mtime_ns
+    try:
+        if raw[:len(_SNAPSHOT_MAGIC)] != _SNAPSHOT_MAGIC:
+            raise ValueError
+        area_codes, states, area_code_table, state_table = marshal.loads(raw[len(_SNAPSHOT_MAGIC):])
+    except (ValueError, EOFError, TypeError):
+        raise ValueError(f'{path} is not a reference snapshot') from None
+    data = ReferenceData.__new__(ReferenceData)
+    data.area_codes, data.states = area_codes, states
+    data.area_code_table, data.state_table = area_code_table, state_table
+    data.source, data.mtime = path, mtime
+    return data
+
+
+# The hard-coded lists above, installed at import time, unless SNAPSHOT_ENV
+# names a snapshot to install instead; then DEFAULT_REFERENCE_DATA is only
+# built if asked for (module __getattr__ below)
+_BUILTIN_LISTS = (VALID_AREA_CODES, VALID_STATES)
+if os.environ.get(SNAPSHOT_ENV):
+    _reference_data = load_reference_snapshot(os.environ[SNAPSHOT_ENV])
+else:
+    DEFAULT_REFERENCE_DATA = _reference_data = ReferenceData(*_BUILTIN_LISTS)
+# From here on the public sets are the installed snapshot's frozensets, so
+# code that used to add or remove entries in place gets AttributeError; build
+# a new ReferenceData and pass it to install_reference_data instead
+VALID_AREA_CODES = _reference_data.area_codes
+VALID_STATES = _reference_data.states
+
+# Module attributes that come from the installed ReferenceData
+_REFERENCE_ATTRIBUTES = {
+    'VALID_AREA_CODES_BYTES': 'area_codes_bytes',
+    'VALID_STATES_BYTES': 'states_bytes',
+    'AREA_CODE_TABLE': 'area_code_table',
+    'STATE_TABLE': 'state_table',
+}
+
+
+def __getattr__(name):
+    # Module attributes built on first use (PEP 562)
+    if name in _REFERENCE_ATTRIBUTES:
+        return getattr(_reference_data, _REFERENCE_ATTRIBUTES[name])
+    if name == 'DEFAULT_REFERENCE_DATA':
+        global DEFAULT_REFERENCE_DATA
+        DEFAULT_REFERENCE_DATA = ReferenceData(*_BUILTIN_LISTS)
+        return DEFAULT_REFERENCE_DATA
+    if name == 'np':
+        return _import_numpy()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+# --- COMPILED VALIDATOR REGISTRY ---
+
+class Prefilter:
+    """
+    Cheap conditions every string a validator accepts must meet
+    - first: ASCII characters the text may start with (None = anything)
+    - unicode_first: a non-ASCII first character may also pass (for \\d and \\s)
+    - min_length / max_length: length bounds, counting the one trailing
+      newline $ allows (max_length None = no limit)
+    - needs: the text must contain at least one of these characters
+    - Used by classify() to skip validators that cannot match
+    """
+    __slots__ = ('first', 'unicode_first', 'min_length', 'max_length', 'needs')
+
+    def __init__(self, first=None, unicode_first=False, min_length=0, max_length=None, needs=''):
+        self.first = first
+        self.unicode_first = unicode_first
+        self.min_length = min_length
+        self.max_length = max_length
+        self.needs = needs
+
+    def __repr__(self):
+        return (f'Prefilter(first={self.first!r}, unicode_first={self.unicode_first}, '
+                f'min_length={self.min_length}, max_length={self.max_length}, needs={self.needs!r})')
+
+
+class Validator:
+    """
+    A named validator whose pattern is compiled once: when it is created, or
+    on first use when created with lazy=True
+    - pattern: regex matched against the whole input with re.match
+    - rule: optional post-match check, called with the match object
+    - joinable: the pattern can also run over a newline-joined column
+      (it is anchored with ^ and the rule only looks at match groups)
+    - fast: optional regex-free check used instead of the pattern; it must give
+      the same answers, calling check_regex itself for input it cannot decide
+    - check: the function that does the work (fast, check_regex, or a cache
+      in front of either); the validate_* wrappers call it directly
+    - prefilter: optional Prefilter that lets classify() skip this validator
+    - metrics: ValidatorMetrics while instrumentation is enabled, else None
+    - bytes_rule: the rule for check_bytes matches, whose groups are bytes
+      (without one, a validator with a rule decodes bytes input instead)
+    - Calling the validator returns True/False like the validate_* functions
+    """
+    __slots__ = ('name', 'regex', 'lines_regex', 'bytes_regex', 'rule', 'bytes_rule', 'fast',
+                 'prefilter', 'cache', 'metrics', 'check', '_match', '_pattern', '_flags', '_joinable')
+
+    def __init__(self, name, pattern, rule=None, flags=0, joinable=True, fast=None, prefilter=None,
+                 bytes_rule=None, lazy=False):
+        self.name = name
+        self.rule = rule
+        self.bytes_rule = bytes_rule
+        self.fast = fast
+        self.prefilter = prefilter
+        self.cache = None
+        self.metrics = None
+        self.check = self.uncached_check
+        self._pattern = pattern
+        self._flags = flags
+        self._joinable = joinable
+        if not lazy:
+            self._compile()
+
+    def _compile(self):
+        # Fills the regex slots; until then, reading one lands in __getattr__
+        pattern, flags = self._pattern, self._flags
+        regex = re.compile(pattern, flags)
+        # Same pattern with ^/$ matching at every line, for validate_many
+        if self._joinable and pattern.startswith('^'):
+            self.lines_regex = re.compile(pattern, flags | re.MULTILINE)
+        else:
+            self.lines_regex = None
+        # Same pattern over bytes, for check_bytes. The leading ^ is dropped:
+        # match() at a start offset is anchored there, but ^ only matches at 0.
+        # Validators with a fast path keep it (a backtracking-prone pattern
+        # must not come back through the bytes door).
+        self.bytes_regex = None
+        if self.fast is None and (self.rule is None or self.bytes_rule is not None):
+            unanchored = pattern[1:] if pattern.startswith('^') else pattern
+            try:
+                self.bytes_regex = re.compile(unanchored.encode('ascii'), flags)
+            except (UnicodeEncodeError, ValueError):
+                pass  # non-ASCII pattern or str-only flags: decode instead
+        self._match = regex.match
+        self.regex = regex
+
+    def __getattr__(self, name):
+        # Only reached for an empty slot: the patterns of a lazy validator
+        # that has not been used yet
+        if name in ('regex', 'lines_regex', 'bytes_regex', '_match'):
+            self._compile()
+            return getattr(self, name)
+        raise AttributeError(name)
+
+    @property
+    def pattern(self):
+        return self._pattern
+
+    def __call__(self, text):
+        return self.check(text)
+
+    @property
+    def uncached_check(self):
+        return self.check_regex if self.fast is None else self.fast
+
+    def _update_check(self):
+        # check = metrics, in front of the cache, in front of fast path or pattern
+        check = self.uncached_check if self.cache is None else self.cache
+        if self.metrics is not None:
+            check = self.metrics.wrap(self, check)
+        self.check = check
+
+    def check_regex(self, text):
+        """
+        Validates with the pattern and rule only, skipping any fast path
+        """
+        match = self._match(text)
+        if match is None:
+            return False
+        if self.rule is None:
+            return True
+        return self.rule(match)
+
+    def check_bytes(self, data, start=0, end=None):
+        """
+        Validates data[start:end] in place; data is bytes, bytearray, memoryview or mmap
+        - Same answer as check() on the UTF-8 decoded field (invalid UTF-8 is invalid)
+        - Plain ASCII fields are matched by the bytes pattern without copying;
+          other fields, and validators without a bytes pattern, are decoded
+        """
+        if end is None:
+            end = len(data)
+        regex = self.bytes_regex
+        if regex is None or _NOT_PLAIN_ASCII.search(data, start, end):
+            try:
+                text = str(data[start:end], 'utf-8')
+            except UnicodeDecodeError:
+                return False
+            return self.check(text)
+        match = regex.match(data, start, end)
+        if match is None:
+            return False
+        if self.bytes_rule is None:
+            return True
+        return self.bytes_rule(match)
+
+    def __repr__(self):
+        return f'Validator({self.name!r}, {self._pattern!r})'
+
+
+# Bytes that \d and \s treat differently in str and bytes patterns (non-ASCII,
+# and \x1c-\x1f which only str \s matches): fields with any go through str
+_NOT_PLAIN_ASCII = re.compile(rb'[^\x00-\x1b\x20-\x7f]')
+
+# Every validator by name: 'phone', 'ssn', 'date', ... (plus custom ones)
+VALIDATORS = {}
+# Candidate validators by first character, rebuilt by classify() after registry changes
+_classifier_table = None
+
+
+def register_validator(name, pattern, rule=None, flags=0, joinable=True, fast=None, prefilter=None,
+                       bytes_rule=None, lazy=False):
+    """
+    Compiles a pattern and adds it to the registry under name
+    - Re-registering a name replaces the previous validator
+    - lazy=True compiles on first use instead (a bad pattern then raises
+      re.error there, not here); the built-in validators are lazy
+    - Returns the new Validator
+    """
+    global _classifier_table
+    validator = Validator(name, pattern, rule, flags, joinable, fast, prefilter, bytes_rule, lazy)
+    VALIDATORS[name] = validator
+    _classifier_table = None
+    return validator
+
+
+def get_validator(name):
+    """
+    Looks up a registered validator by name
+    - Raises KeyError listing the known names if name is not registered
+    """
+    try:
+        return VALIDATORS[name]
+    except KeyError:
+        known = ', '.join(sorted(VALIDATORS))
+        raise KeyError(f'unknown validator {name!r} (known: {known})') from None
+
+
+def _resolve(kind):
+    # Accept either a registry name or a Validator object
+    if isinstance(kind, Validator):
+        return kind
+    return get_validator(kind)
+
+
+# --- RESULT CACHE ---
+
+class ResultCache:
+    """
+    A bounded LRU cache of results in front of one validator's check
+    - maxsize: most distinct inputs kept; the least recently used is evicted
+    - max_length: longer inputs are validated but never cached, so large or
+      unique attacker-controlled strings cannot fill the cache
+    - info() reports hits, misses, evictions and uncached calls
+    """
+    __slots__ = ('maxsize', 'max_length', 'uncached', '_cached', '_check')
+
+    def __init__(self, check, maxsize=4096, max_length=256):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self.uncached = 0
+        self._check = check
+        self._cached = functools.lru_cache(maxsize)(check)
+
+    def __call__(self, text):
+        if len(text) > self.max_length:
+            self.uncached += 1
+            return self._check(text)
+        return self._cached(text)
+
+    def info(self):
+        stats = self._cached.cache_info()
+        return {
+            'hits': stats.hits,
+            'misses': stats.misses,
+            # Every miss adds an entry; whatever is no longer there was evicted
+            'evictions': stats.misses - stats.currsize,
+            'uncached': self.uncached,
+            'size': stats.currsize,
+            'maxsize': self.maxsize,
+        }
+
+    def clear(self):
+        self._cached.cache_clear()
+        self.uncached = 0
+
+
+def enable_cache(kind, maxsize=4096, max_length=256):
+    """
+    Puts a ResultCache in front of one validator (replacing any existing cache)
+    - Applies to the validate_* function, the registry object and validate_many
+    - Returns the ResultCache
+    """
+    validator = _resolve(kind)
+    validator.cache = ResultCache(validator.uncached_check, maxsize, max_length)
+    validator._update_check()
+    return validator.cache
+
+
+def disable_cache(kind):
+    """
+    Removes a validator's cache, if it has one
+    """
+    validator = _resolve(kind)
+    validator.cache = None
+    validator._update_check()
+
+
+def cache_info(kind):
+    """
+    Returns a validator's cache statistics, or None when it has no cache
+    """
+    cache = _resolve(kind).cache
+    return None if cache is None else cache.info()
+
+
+# --- VALIDATORS ---
+
+# Regex-free fast paths only decide plain ASCII input of the exact width;
+# anything else (Unicode digits, a trailing newline that $ tolerates) goes
+# to the regex
+
+# First characters for the classify() prefilters; \d and \s also match
+# non-ASCII digits and spaces, hence unicode_first wherever they lead
+_DIGITS = '0123456789'
+_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+_SPACES = ''.join(chr(code) for code in range(128) if chr(code).isspace())
+
+def _military_time_fast(text):
+    if type(text) is not str:
+        return MILITARY_TIME.check_regex(text)  # the pattern's TypeError
+    if len(text) != 4 or not text.isascii():
+        return 4 <= len(text) <= 5 and MILITARY_TIME.check_regex(text)
+    # All digits, and as a string no later than 2359 with minute tens <= 5
+    return text.isdigit() and text <= '2359' and text[2] <= '5'
+
+MILITARY_TIME = register_validator(
+    'military_time', r'^([01]\d|2[0-3])([0-5]\d)$', fast=_military_time_fast,
+    prefilter=Prefilter('012', min_length=4, max_length=5), lazy=True
+)
+
 def validate_military_time(text):
     """
     Validates military time format: 0000-2359
@@ -65,8 +761,10 @@ def validate_military_time(text):
     - Valid hours: 00-23
     - Valid minutes: 00-59
     """
-    pattern = r'^([01]\d|2[0-3])([0-5]\d)$'
-    return bool(re.match(pattern, text))
+    return MILITARY_TIME.check(text)
+
+CURRENCY = register_validator('currency', r'^\$\d{1,3}(,\d{3})*\.\d{2}$',
+                              prefilter=Prefilter('$', min_length=5, needs='.'), lazy=True)
 
 def validate_currency(text):
     """
@@ -75,8 +773,54 @@ def validate_currency(text):
     - Commas optional 
     - Must have decimal and cents
     """
-    pattern = r'^\$\d{1,3}(,\d{3})*\.\d{2}$'
-    return bool(re.match(pattern, text))
+    return CURRENCY.check(text)
+
+# Longest URL / email accepted; longer input is rejected before any parsing
+MAX_URL_LENGTH = 2048
+MAX_EMAIL_LENGTH = 254
+
+_HOST_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.-'
+_EMAIL_LOCAL_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-'
+_EMAIL_DOMAIN_CHARS = _HOST_CHARS
+
+# The URL and email parsers below accept exactly what their patterns accept
+# (up to the length caps), but split on '/', '@' and the last '.' and check
+# each piece with a few C-level str scans, so they run in linear time on any
+# input. The patterns backtrack heavily on long crafted hostnames; they only
+# see short input, where that is bounded and they are faster than the parser.
+_URL_REGEX_MAX_LENGTH = 32
+_EMAIL_REGEX_MAX_LENGTH = 64
+
+def _url_fast(text):
+    if len(text) <= _URL_REGEX_MAX_LENGTH:
+        return URL.regex.match(text) is not None
+    if len(text) > MAX_URL_LENGTH:
+        return False
+    # $ also matches before one trailing newline
+    if text[-1:] == '\n':
+        text = text[:-1]
+    if text.startswith('https://'):
+        text = text[8:]
+    elif text.startswith('http://'):
+        text = text[7:]
+    # The host ends at the first '/', where the optional path (no newlines) begins
+    host, slash, path = text.partition('/')
+    # host: labels of [a-zA-Z0-9] with inner hyphens, joined by dots, then
+    # a letters-only TLD of 2+ characters after the last dot
+    head, dot, tld = host.rpartition('.')
+    return (len(tld) >= 2 and tld.isalpha() and host.isascii()
+            and head != '' and not head.strip(_HOST_CHARS)
+            and head[0] != '-' and head[0] != '.' and head[-1] != '-' and head[-1] != '.'
+            and '..' not in head and '.-' not in head and '-.' not in head
+            and '\n' not in path)
+
+URL = register_validator(
+    'url',
+    r'^(https?://)?[a-zA-Z0-9]([a-zA-Z0-9\-]*[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]*[a-zA-Z0-9])?)*(\.[a-zA-Z]{2,})(\/.*)?$',
+    joinable=False, fast=_url_fast,
+    prefilter=Prefilter(_DIGITS + _LETTERS, min_length=4, max_length=MAX_URL_LENGTH, needs='.'),
+    lazy=True
+)
 
 def validate_url(text):
     """
@@ -84,33 +828,15 @@ def validate_url(text):
     - Optional http:// or https://
     - Domain name with optional subdomains
     - Optional path
+    - At most MAX_URL_LENGTH characters
     """
-    pattern = r'^(https?://)?[a-zA-Z0-9]([a-zA-Z0-9\-]*[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9\-]*[a-zA-Z0-9])?)*(\.[a-zA-Z]{2,})(\/.*)?$'
-    return bool(re.match(pattern, text))
-
-def validate_ssn(text):
-    """
-    Social Security Number validation (WITH EXTRA CREDIT)
-    - Accepts: 123-45-6789, 123 45 6789, 123456789
-    - Validates SSA numbering rules:
-      * Area number (first 3): Cannot be 000, 666, or 900-999
-      * Group number (middle 2): Cannot be 00
-      * Serial number (last 4): Cannot be 0000
-    """
-    # Pattern: must use same separator throughout OR no separators
-    pattern1 = r'^(\d{3})-(\d{2})-(\d{4})$'  # All dashes
-    pattern2 = r'^(\d{3}) (\d{2}) (\d{4})$'  # All spaces
-    pattern3 = r'^(\d{3})(\d{2})(\d{4})$'    # No separators
-    
-    match = re.match(pattern1, text) or re.match(pattern2, text) or re.match(pattern3, text)
-    
-    if not match:
-        return False
+    return URL.check(text)
 
+def _ssn_rule(match):
     # EXTRA CREDIT: Validate SSA rules
     area = int(match.group(1))
-    group = int(match.group(2))
-    serial = int(match.group(3))
+    group = int(match.group(3))
+    serial = int(match.group(4))
     
     # Area cannot be 000, 666, or 900-999
     if area == 0 or area == 666 or area >= 900:
@@ -126,27 +852,90 @@ def validate_ssn(text):
     
     return True
 
+def _ssn_fast(text):
+    # Non-str input gets the pattern's TypeError, as before the fast path
+    if type(text) is not str or not text.isascii() or text[-1:] == '\n':
+        return SSN.check_regex(text)
+    length = len(text)
+    if length == 9:
+        digits = text
+    elif length == 11:
+        # Dispatch on the separator: both must be the same dash or space
+        sep = text[3]
+        if (sep != '-' and sep != ' ') or text[6] != sep:
+            return False
+        digits = text[:3] + text[4:6] + text[7:]
+    else:
+        return False
+    if not digits.isdigit():
+        return False
+    area = digits[:3]
+    # Same SSA rules as _ssn_rule, compared as strings
+    return area != '000' and area != '666' and area < '900' and digits[3:5] != '00' and digits[5:] != '0000'
+
+# Pattern: must use same separator throughout (dash or space) OR no separators
+# _ssn_rule only calls int() on groups, so it also serves bytes matches
+SSN = register_validator('ssn', r'^(\d{3})([- ]?)(\d{2})\2(\d{4})$', _ssn_rule, fast=_ssn_fast,
+                         prefilter=Prefilter(_DIGITS, True, min_length=9, max_length=12),
+                         bytes_rule=_ssn_rule, lazy=True)
+
+def validate_ssn(text):
+    """
+    Social Security Number validation (WITH EXTRA CREDIT)
+    - Accepts: 123-45-6789, 123 45 6789, 123456789
+    - Validates SSA numbering rules:
+      * Area number (first 3): Cannot be 000, 666, or 900-999
+      * Group number (middle 2): Cannot be 00
+      * Serial number (last 4): Cannot be 0000
+    """
+    return SSN.check(text)
+
+def _phone_rule(match):
+    # EXTRA CREDIT: Validate area code
+    # Group 2 is area code with parens, Group 3 is without
+    area_code = match.group(2) if match.group(2) else match.group(3)
+    return area_code in VALID_AREA_CODES
+
+def _phone_bytes_rule(match):
+    # The bytes sets belong to the installed ReferenceData, so a reload
+    # replaces them together with VALID_AREA_CODES
+    return (match.group(2) or match.group(3)) in _reference_data.area_codes_bytes
+
+# Pattern: optional (XXX) or XXX, then XXX, then XXXX with optional separators
+# Groups 4 and 5 (exchange and line) are only read by parse_phone
+PHONE = register_validator('phone', r'^(\((\d{3})\)|(\d{3}))[\s-]?(\d{3})[\s-]?(\d{4})$', _phone_rule,
+                           prefilter=Prefilter('(' + _DIGITS, True, min_length=10, max_length=15),
+                           bytes_rule=_phone_bytes_rule, lazy=True)
+
 def validate_phone(text):
     """
     US Phone number validation (WITH EXTRA CREDIT)
     - Accepts: (253)123-4567, 253-123-4567, 2531234567, 253 123 4567
     - Validates official US area codes
     """
-    # Pattern: optional (XXX) or XXX, then XXX, then XXXX with optional separators
-    pattern = r'^(\((\d{3})\)|(\d{3}))[\s-]?\d{3}[\s-]?\d{4}$'
-    match = re.match(pattern, text)
-    
-    if not match:
-        return False
-    
-    # EXTRA CREDIT: Validate area code
-    # Group 2 is area code with parens, Group 3 is without
-    area_code = match.group(2) if match.group(2) else match.group(3)
-    
-    if area_code not in VALID_AREA_CODES:
+    return PHONE.check(text)
+
+def _email_fast(text):
+    if len(text) <= _EMAIL_REGEX_MAX_LENGTH:
+        return EMAIL.regex.match(text) is not None
+    if len(text) > MAX_EMAIL_LENGTH:
         return False
-    
-    return True
+    # $ also matches before one trailing newline (no class below allows another)
+    if text[-1:] == '\n':
+        text = text[:-1]
+    # local: [a-zA-Z0-9._-]+ up to the only '@'; domain: [a-zA-Z0-9.-]+ then
+    # '.' and a letters-only TLD, so the TLD starts after the last dot
+    local, at, domain = text.partition('@')
+    head, dot, tld = domain.rpartition('.')
+    return (len(tld) >= 2 and tld.isalpha() and text.isascii()
+            and local != '' and head != ''
+            and not local.strip(_EMAIL_LOCAL_CHARS) and not head.strip(_EMAIL_DOMAIN_CHARS))
+
+EMAIL = register_validator('email', r'^[a-zA-Z0-9._-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
+                           joinable=False, fast=_email_fast,
+                           prefilter=Prefilter(_EMAIL_LOCAL_CHARS, min_length=6,
+                                               max_length=MAX_EMAIL_LENGTH, needs='@'),
+                           lazy=True)
 
 def validate_email(text):
     """
@@ -156,9 +945,14 @@ def validate_email(text):
     - Must have @ symbol
     - Domain: letters, digits, hyphens
     - Must have valid TLD (.com, .org, etc - at least 2 chars)
+    - At most MAX_EMAIL_LENGTH characters
     """
-    pattern = r'^[a-zA-Z0-9._-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, text))
+    return EMAIL.check(text)
+
+# Pattern: Capitalized last, Capitalized first, optional MI
+ROSTER_NAME = register_validator('roster_name', r"^[A-Z][A-Za-z\-']*,\s[A-Z][A-Za-z\-']*(?:,\s[A-Z]\.?){0,3}$",
+                                 prefilter=Prefilter(_LETTERS[:26], min_length=4, needs=','), lazy=True)
+
 def validate_roster_name(text):
     """
     Name on class roster: Last, First, MI
@@ -166,19 +960,34 @@ def validate_roster_name(text):
     - Last name and first name required
     - Middle initials (0-3) are capital letters with optional dots
     """
-    # Pattern: Capitalized last, Capitalized first, optional MI
-    pattern = r"^[A-Z][A-Za-z\-']*,\s[A-Z][A-Za-z\-']*(?:,\s[A-Z]\.?){0,3}$"
-    return bool(re.match(pattern, text))
+    return ROSTER_NAME.check(text)
+
+# Pattern: number + single space + street name + single space + street type
+_STREET_TYPES = r'(?:St(?:reet)?|Rd|Road|Blvd|Boulevard|Ave(?:nue)?)'
+ADDRESS = register_validator('address', rf'^\d+\s[A-Za-z]+(\s[A-Za-z]+)*\s{_STREET_TYPES}$',
+                             prefilter=Prefilter(_DIGITS, True, min_length=6), lazy=True)
 
 def validate_address(text):
     """
     House address validation
     - Single spaces only between parts
     """
-    # Pattern: number + single space + street name + single space + street type
-    street_types = r'(?:St(?:reet)?|Rd|Road|Blvd|Boulevard|Ave(?:nue)?)'
-    pattern = rf'^\d+\s[A-Za-z]+(\s[A-Za-z]+)*\s{street_types}$'
-    return bool(re.match(pattern, text))
+    return ADDRESS.check(text)
+
+def _city_state_zip_rule(match):
+    # EXTRA CREDIT: Validate state abbreviation
+    return match.group(1) in VALID_STATES
+
+def _city_state_zip_bytes_rule(match):
+    return match.group(1) in _reference_data.states_bytes
+
+# Pattern: City, ST ZIP or City, ST ZIP-XXXX
+# Not joinable: [A-Za-z\s]+ would run across every row separator in a joined column
+CITY_STATE_ZIP = register_validator(
+    'city_state_zip', r'^[A-Za-z\s]+,\s([A-Z]{2})\s\d{5}(?:-\d{4})?$', _city_state_zip_rule,
+    joinable=False, prefilter=Prefilter(_LETTERS + _SPACES, True, min_length=11, needs=','),
+    bytes_rule=_city_state_zip_bytes_rule, lazy=True
+)
 
 def validate_city_state_zip(text):
     """
@@ -186,20 +995,57 @@ def validate_city_state_zip(text):
     - Format: Seattle, WA 98101 OR Seattle, WA 98101-1234
     - Validates official 2-letter state abbreviations
     """
-    # Pattern: City, ST ZIP or City, ST ZIP-XXXX
-    pattern = r'^[A-Za-z\s]+,\s([A-Z]{2})\s\d{5}(?:-\d{4})?$'
-    match = re.match(pattern, text)
-    
-    if not match:
-        return False
-    
-    # EXTRA CREDIT: Validate state abbreviation
-    state = match.group(1)
-    
-    if state not in VALID_STATES:
-        return False
-    
-    return True
+    return CITY_STATE_ZIP.check(text)
+
+# --- DATE ENGINE ---
+
+# Days per month, indexed [is_leap][month]; index 0 is unused
+_MONTH_DAYS = (
+    (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+    (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+)
+
+# Gregorian leap years repeat every 400 years: _LEAP_CYCLE[year % 400] is 1 for leap years
+_LEAP_CYCLE = bytes((year % 4 == 0 and year % 100 != 0) or year % 400 == 0 for year in range(400))
+
+
+def check_date(month, day, year):
+    """
+    Validates a pre-parsed date given as integers
+    - Month 1-12, day within that month, leap years handled
+    """
+    return 1 <= month <= 12 and 1 <= day <= _MONTH_DAYS[_LEAP_CYCLE[year % 400]][month]
+
+
+def check_dates(dates):
+    """
+    Validates a whole column of pre-parsed dates
+    - dates: (month, day, year) integer tuples, or a NumPy integer array of
+      shape (N, 3) with the same column order
+    - Tuples give a bytearray of 1/0; a NumPy array gives a NumPy bool array
+      computed with array operations only
+    """
+    np = _ndarray_numpy(dates)
+    if np is not None:
+        months, days, years = dates[:, 0], dates[:, 1], dates[:, 2]
+        leap = np.frombuffer(_LEAP_CYCLE, dtype=np.uint8)[years % 400]
+        limits = np.array(_MONTH_DAYS)[leap, np.clip(months, 0, 12)]
+        return (months >= 1) & (months <= 12) & (days >= 1) & (days <= limits)
+    return bytearray([check_date(month, day, year) for month, day, year in dates])
+
+
+def _date_rule(match):
+    month, sep, day, year = match.groups()
+    month = int(month)
+    return 1 <= month <= 12 and 1 <= int(day) <= _MONTH_DAYS[_LEAP_CYCLE[int(year) % 400]][month]
+
+# Pattern: MM separator DD separator YYYY
+# Shared by DATE and DATE_DMY: m/d/yyyy up to mm/dd/yyyy plus a trailing newline
+_DATE_PREFILTER = Prefilter(_DIGITS, True, min_length=8, max_length=11, needs='-/')
+# The date rules only call int() on groups, which works for bytes groups too
+DATE = register_validator('date', r'^(\d{1,2})([-/])(\d{1,2})\2(\d{4})$', _date_rule,
+                          prefilter=_DATE_PREFILTER, bytes_rule=_date_rule, lazy=True)
+
 def validate_date(text):
     """
     Date in MM-DD-YYYY format with validation
@@ -207,37 +1053,135 @@ def validate_date(text):
     - Must validate actual dates (no Feb 30, no April 31)
     - Must handle leap years correctly
     """
-    import re
-    
-    # Pattern: MM separator DD separator YYYY
-    pattern = r'^(\d{1,2})([-/])(\d{1,2})\2(\d{4})$'
-    match = re.match(pattern, text)
-    
-    if not match:
-        return False
-    
-    month, sep, day, year = match.groups()
+    return DATE.check(text)
+
+def _date_iso_rule(match):
+    year, month, day = match.groups()
     month = int(month)
-    day = int(day)
-    year = int(year)
-    
-    # Validate month
-    if month < 1 or month > 12:
-        return False
-    
-    # Days per month
-    days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-    
-    # Check for leap year
-    is_leap = (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
-    if is_leap:
-        days_in_month[1] = 29  # February has 29 days in leap year
-    
-    # Validate day
-    if day < 1 or day > days_in_month[month - 1]:
-        return False
-    
-    return True
+    return 1 <= month <= 12 and 1 <= int(day) <= _MONTH_DAYS[_LEAP_CYCLE[int(year) % 400]][month]
+
+# Pattern: YYYY-MM-DD
+DATE_ISO = register_validator('date_iso', r'^(\d{4})-(\d{2})-(\d{2})$', _date_iso_rule,
+                              prefilter=Prefilter(_DIGITS, True, min_length=10, max_length=11, needs='-'),
+                              bytes_rule=_date_iso_rule, lazy=True)
+
+def validate_date_iso(text):
+    """
+    Date in ISO YYYY-MM-DD format with validation
+    - Two-digit month and day, dashes only
+    - Same calendar rules as validate_date
+    """
+    return DATE_ISO.check(text)
+
+def _date_dmy_rule(match):
+    day, sep, month, year = match.groups()
+    month = int(month)
+    return 1 <= month <= 12 and 1 <= int(day) <= _MONTH_DAYS[_LEAP_CYCLE[int(year) % 400]][month]
+
+# Pattern: DD separator MM separator YYYY
+DATE_DMY = register_validator('date_dmy', r'^(\d{1,2})([-/])(\d{1,2})\2(\d{4})$', _date_dmy_rule,
+                              prefilter=_DATE_PREFILTER, bytes_rule=_date_dmy_rule, lazy=True)
+
+def validate_date_dmy(text):
+    """
+    Date in DD/MM/YYYY format with validation
+    - Separators can be dashes or slashes, used consistently
+    - Same calendar rules as validate_date
+    """
+    return DATE_DMY.check(text)
+
+class PasswordPolicy:
+    """
+    A password policy checked with one classifying pass over the text
+    - min_length: fewest characters allowed
+    - required: character classes that must each appear at least once,
+      from 'upper', 'lower', 'digit' and 'punctuation'
+    - max_lower_run: most consecutive lowercase letters allowed (None = no limit)
+    - punctuation: the characters that count as punctuation
+    - Calling the policy returns True/False
+    """
+    __slots__ = ('min_length', 'required', 'max_lower_run', 'punctuation', '_table', '_codes', '_run')
+
+    # One-letter code each character class is translated to
+    CLASS_CODES = {'upper': 'U', 'lower': 'l', 'digit': 'd', 'punctuation': 'p'}
+
+    def __init__(self, min_length=10, required=('upper', 'lower', 'digit', 'punctuation'),
+                 max_lower_run=3, punctuation='!@#$%^&*(),.?":{}|<>'):
+        unknown = set(required) - set(self.CLASS_CODES)
+        if unknown:
+            raise ValueError(f'unknown character classes: {", ".join(sorted(unknown))}')
+        self.min_length = min_length
+        self.required = tuple(required)
+        self.max_lower_run = max_lower_run
+        self.punctuation = punctuation
+        # Every ASCII character maps to its class code, anything else to '.'
+        # (non-ASCII digits are handled separately in __call__)
+        table = dict.fromkeys(range(128), '.')
+        for start, end, code in (('A', 'Z', 'U'), ('a', 'z', 'l'), ('0', '9', 'd')):
+            for point in range(ord(start), ord(end) + 1):
+                table[point] = code
+        for char in punctuation:
+            table[ord(char)] = 'p'
+        self._table = table
+        self._codes = tuple(self.CLASS_CODES[name] for name in self.required)
+        self._run = None if max_lower_run is None else 'l' * (max_lower_run + 1)
+
+    def __call__(self, text):
+        if len(text) < self.min_length:
+            return False
+        classes = text.translate(self._table)
+        if self._run is not None and self._run in classes:
+            return False
+        for code in self._codes:
+            if code not in classes:
+                # \d also accepts non-ASCII decimal digits
+                if code == 'd' and not text.isascii() and any(map(str.isdecimal, text)):
+                    continue
+                return False
+        return True
+
+    def explain(self, text):
+        """
+        Returns why text fails the policy ('too_short', 'lowercase_run' or
+        'missing_<class>'), or None when it passes
+        """
+        if len(text) < self.min_length:
+            return 'too_short'
+        if self(text):
+            return None
+        classes = text.translate(self._table)
+        if self._run is not None and self._run in classes:
+            return 'lowercase_run'
+        for name in self.required:
+            if self.CLASS_CODES[name] not in classes and not (
+                    name == 'digit' and any(map(str.isdecimal, text))):
+                return f'missing_{name}'
+        return None
+
+    def register(self, name):
+        """
+        Adds this policy to the validator registry under name
+        - Returns the new Validator, usable with validate_many
+        """
+        return register_validator(name, r'.*', lambda match: self(match.string),
+                                  re.DOTALL, joinable=False, fast=self,
+                                  prefilter=Prefilter(min_length=self.min_length))
+
+    def __repr__(self):
+        return (f'PasswordPolicy(min_length={self.min_length}, required={self.required!r}, '
+                f'max_lower_run={self.max_lower_run}, punctuation={self.punctuation!r})')
+
+
+# The assignment's policy: 10+ characters, all four classes, at most 3 lowercase in a row
+DEFAULT_PASSWORD_POLICY = PasswordPolicy()
+
+def _password_rule(match):
+    return DEFAULT_PASSWORD_POLICY(match.string)
+
+# Pattern: at least 10 characters of anything (the policy does the rest)
+PASSWORD = register_validator('password', r'.{10}', _password_rule, re.DOTALL, joinable=False,
+                              fast=DEFAULT_PASSWORD_POLICY,
+                              prefilter=Prefilter(min_length=DEFAULT_PASSWORD_POLICY.min_length), lazy=True)
 
 def validate_password(text):
     """
@@ -249,33 +1193,20 @@ def validate_password(text):
     - At least 1 punctuation mark
     - No more than 3 consecutive lowercase characters
     """
-    import re
-    
-    # Check length
-    if len(text) < 10:
-        return False
-    
-    # Check for at least one uppercase
-    if not re.search(r'[A-Z]', text):
-        return False
-    
-    # Check for at least one lowercase
-    if not re.search(r'[a-z]', text):
-        return False
-    
-    # Check for at least one digit
-    if not re.search(r'\d', text):
-        return False
-    
-    # Check for at least one punctuation
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', text):
-        return False
-    
-    # Check for NO MORE than 3 consecutive lowercase letters
-    if re.search(r'[a-z]{4,}', text):
-        return False  # Found 4 or more consecutive lowercase
-    
-    return True
+    return PASSWORD.check(text)
+
+def _ion_words_rule(match):
+    # Check if total length is odd
+    return len(match.string) % 2 == 1
+
+def _ion_words_bytes_rule(match):
+    # The field is data[pos:endpos], not the whole buffer
+    return (match.endpos - match.pos) % 2 == 1
+
+# Pattern: word characters ending in 'ion'
+ION_WORDS = register_validator('ion_words', r'^[a-zA-Z]*ion$', _ion_words_rule, joinable=False,
+                               prefilter=Prefilter(_LETTERS, min_length=3, needs='n'),
+                               bytes_rule=_ion_words_bytes_rule, lazy=True)
 
 def validate_ion_words(text):
     """
@@ -285,14 +1216,572 @@ def validate_ion_words(text):
     - Examples: "ion" (3 letters - odd), "action" (6 letters - even, NO), 
                 "region" (6 letters - even, NO), "union" (5 letters - odd, YES)
     """
-    # Pattern: word characters ending in 'ion'
-    pattern = r'^[a-zA-Z]*ion$'
-    
-    if not re.match(pattern, text):
+    return ION_WORDS.check(text)
+
+
+
+# --- BATCH VALIDATION ---
+
+# Columns shorter than this are not worth sampling for the joined scan
+_JOIN_MIN_ROWS = 256
+# Rows sampled from the front of a column to estimate how many will match
+_JOIN_SAMPLE_ROWS = 64
+# The joined scan wins when at most this fraction of the rows match
+_JOIN_MAX_MATCH_RATE = 0.2
+
+
+def _many_mapped(validator, rows):
+    if validator.fast is not None or validator.cache is not None or validator.metrics is not None:
+        return bytearray(map(validator.check, rows))
+    # One C-level pass of the compiled pattern over the rows; only rows that
+    # match go back through Python for their rule
+    matches = map(validator.regex.match, rows)
+    rule = validator.rule
+    if rule is None:
+        return bytearray(map(bool, matches))
+    return bytearray([False if match is None else rule(match) for match in matches])
+
+
+def _many_joined(validator, rows, buffer):
+    # One multiline finditer over the joined column; rows that never match
+    # cost no Python work at all
+    result = bytearray(len(rows))
+    rule = validator.rule
+    count = buffer.count
+    row = 0
+    pos = 0
+    for match in validator.lines_regex.finditer(buffer):
+        start, end = match.span()
+        row += count('\n', pos, start)
+        spanned = count('\n', start, end)
+        if spanned:
+            # A \s in the pattern matched a row separator: check those rows one by one
+            for i in range(row, row + spanned + 1):
+                result[i] = validator(rows[i])
+            row += spanned
+        elif rule is None or rule(match):
+            result[row] = 1
+        pos = end
+    return result
+
+
+def _prefers_joined(validator, rows):
+    if validator.lines_regex is None or validator.metrics is not None or len(rows) < _JOIN_MIN_ROWS:
         return False
-    
-    # Check if total length is odd
-    if len(text) % 2 == 1:  # Odd length
-        return True
-    
-    return False
\ No newline at end of file
+    sample = rows[:_JOIN_SAMPLE_ROWS]
+    matched = sum(map(bool, map(validator.regex.match, sample)))
+    return matched <= _JOIN_MAX_MATCH_RATE * len(sample)
+
+
+# Columns shorter than this are not worth sampling for duplicates
+_DEDUP_MIN_ROWS = 256
+# Rows sampled, evenly spaced through the column, to estimate its distinct values
+_DEDUP_SAMPLE_ROWS = 1024
+# Validating only the distinct values wins when there are at most this many per
+# row: hashing every row costs about as much as the cheapest validators, so a
+# column needs a 20x repeat rate before those come out ahead
+_DEDUP_MAX_DISTINCT_RATE = 0.05
+
+
+def _distinct_estimate(rows):
+    # Short columns are counted exactly. Otherwise the estimate comes from
+    # collisions between sampled rows: the k*(k-1)/2 pairs of a sample drawn
+    # from D equally likely values hold about k*(k-1)/2/D equal pairs, so it
+    # takes many more distinct values than the sample size to find none
+    if len(rows) <= _DEDUP_SAMPLE_ROWS:
+        return len(set(rows))
+    sample = rows[::len(rows) // _DEDUP_SAMPLE_ROWS][:_DEDUP_SAMPLE_ROWS]
+    pairs = sum(count * (count - 1) // 2 for count in Counter(sample).values())
+    if not pairs:
+        return len(rows)
+    return len(sample) * (len(sample) - 1) / 2 / pairs
+
+
+def _prefers_dedup(validator, rows):
+    # Metrics count rows, so a validator with metrics sees every row
+    if validator.metrics is not None or len(rows) < _DEDUP_MIN_ROWS:
+        return False
+    return _distinct_estimate(rows) <= _DEDUP_MAX_DISTINCT_RATE * len(rows)
+
+
+def _many_rows(validator, rows, method):
+    if method == 'joined' or (method == 'auto' and _prefers_joined(validator, rows)):
+        buffer = '\n'.join(rows)
+        # Rows that contain newlines themselves cannot be told apart in the buffer
+        if buffer.count('\n') == len(rows) - 1:
+            return _many_joined(validator, rows, buffer)
+    return _many_mapped(validator, rows)
+
+
+def _many_deduped(validator, rows):
+    # Dictionary-encodes the column: each distinct value is validated once
+    # and every row looks its result up
+    distinct = list(dict.fromkeys(rows))
+    valid = dict(zip(distinct, _many_rows(validator, distinct, 'auto')))
+    return bytearray(map(valid.__getitem__, rows))
+
+
+def validate_many(kind, iterable, as_numpy=False, method='auto'):
+    """
+    Validates every string in iterable with one validator
+    - kind: a registry name ('phone', 'email', ...) or a Validator
+    - Returns a bytearray holding 1 for each valid row and 0 for each invalid row,
+      or a NumPy bool array when as_numpy=True
+    - method='map' matches each row with the compiled pattern
+    - method='joined' runs one multiline finditer over the newline-joined column
+    - method='dedup' validates each distinct value once and copies its
+      result to every row holding it
+    - method='auto' samples the column: 'dedup' when at most one row in 20
+      looks distinct, otherwise 'joined' when few rows match
+    """
+    validator = _resolve(kind)
+    if method not in ('auto', 'map', 'joined', 'dedup'):
+        raise ValueError(f"method must be 'auto', 'map', 'joined' or 'dedup', not {method!r}")
+    np = _import_numpy() if as_numpy else None
+    if as_numpy and np is None:
+        raise ImportError('validate_many(as_numpy=True) requires NumPy')
+    rows = iterable if isinstance(iterable, list) else list(iterable)
+
+    if method == 'joined' and validator.lines_regex is None:
+        raise ValueError(f'validator {validator.name!r} cannot run over a joined column')
+    if method == 'dedup' or (method == 'auto' and _prefers_dedup(validator, rows)):
+        result = _many_deduped(validator, rows)
+    else:
+        result = _many_rows(validator, rows, method)
+
+    if as_numpy:
+        return np.frombuffer(result, dtype=np.bool_)
+    return result
+
+
+# --- CLASSIFIER ---
+
+# Slots in the classifier table after the 128 ASCII first characters
+_NON_ASCII_FIRST = 128
+_EMPTY_TEXT = 129
+
+
+def _build_classifier_table():
+    # For every possible first character, the validators (in registry order)
+    # whose prefilter lets it through, each with its length bounds and needs
+    global _classifier_table
+    table = [[] for _ in range(130)]
+    for validator in VALIDATORS.values():
+        prefilter = validator.prefilter
+        if prefilter is None:
+            prefilter = Prefilter(unicode_first=True)
+        max_length = sys.maxsize if prefilter.max_length is None else prefilter.max_length
+        entry = (validator, prefilter.min_length, max_length, prefilter.needs)
+        for code in range(128):
+            if prefilter.first is None or chr(code) in prefilter.first:
+                table[code].append(entry)
+        if prefilter.first is None or prefilter.unicode_first:
+            table[_NON_ASCII_FIRST].append(entry)
+        if prefilter.min_length == 0:
+            table[_EMPTY_TEXT].append(entry)
+    _classifier_table = [tuple(entries) for entries in table]
+    return _classifier_table
+
+
+def _candidates(text):
+    # Validators that survive the prefilters for this text
+    table = _classifier_table or _build_classifier_table()
+    if text:
+        code = ord(text[0])
+        entries = table[code if code < 128 else _NON_ASCII_FIRST]
+    else:
+        entries = table[_EMPTY_TEXT]
+    length = len(text)
+    return [validator for validator, min_length, max_length, needs in entries
+            if min_length <= length <= max_length
+            and (not needs or any(map(text.__contains__, needs)))]
+
+
+def classify(text):
+    """
+    Returns every validator kind text satisfies, in registry order
+    - Same answers as calling each validator, but prefilters on the first
+      character, the length and a few telltale characters ('@', '$', ',',
+      '-', '/', '.') rule out most validators without running them
+    - Validators registered without a prefilter are always run
+    """
+    return tuple([validator.name for validator in _candidates(text) if validator.check(text)])
+
+
+def classify_column(values, sample_size=200, min_ratio=1.0):
+    """
+    Infers which validator kinds a column of values holds
+    - Samples up to sample_size non-empty values (evenly spaced for lists and
+      tuples, the first ones for other iterables); None and '' are skipped
+    - Returns the kinds (registry order) that at least min_ratio of the
+      sampled values satisfy; () when nothing was sampled
+    - A kind stops being checked as soon as it has failed too often (or, with
+      min_ratio < 1, passed often enough) for the rest of the sample to matter,
+      and sampling stops once every kind is decided
+    """
+    if not 0 < min_ratio <= 1:
+        raise ValueError('min_ratio must be in (0, 1]')
+    if isinstance(values, (list, tuple)):
+        values = values[::max(1, len(values) // sample_size)]
+    max_failures = int((1 - min_ratio) * sample_size + 1e-9)
+    passes_needed = min_ratio * sample_size
+    passes = dict.fromkeys(VALIDATORS, 0)
+    failures = dict.fromkeys(VALIDATORS, 0)
+    undecided = set(VALIDATORS)
+    sampled = 0
+    for text in values:
+        if not text:
+            continue
+        passed = {validator.name for validator in _candidates(text)
+                  if validator.name in undecided and validator.check(text)}
+        for name in list(undecided):
+            if name in passed:
+                passes[name] += 1
+                if passes[name] >= passes_needed:
+                    undecided.discard(name)
+            else:
+                failures[name] += 1
+                if failures[name] > max_failures:
+                    undecided.discard(name)
+        sampled += 1
+        if sampled == sample_size or not undecided:
+            break
+    if not sampled:
+        return ()
+    return tuple(name for name in VALIDATORS
+                 if failures[name] <= max_failures and passes[name] >= min_ratio * sampled)
+
+
+# --- BYTES INPUT ---
+
+def validate_bytes(kind, data, start=0, end=None):
+    """
+    Validates the field data[start:end] of a bytes-like buffer without copying it
+    - kind: a registry name or a Validator
+    - data: bytes, bytearray, memoryview or mmap
+    - Same answer as the validate_* function on the decoded field
+    """
+    return _resolve(kind).check_bytes(data, start, end)
+
+
+def validate_spans(kind, data, spans):
+    """
+    Validates many fields of one buffer in place
+    - spans: (start, end) offsets of each field in data
+    - Returns a bytearray of 1/0 results in span order
+    """
+    check = _resolve(kind).check_bytes
+    return bytearray([check(data, start, end) for start, end in spans])
+
+
+# --- INSTRUMENTATION ---
+# Off by default: a validator's check only gains the timing wrapper while
+# its metrics are enabled, so disabled validators pay nothing.
+
+# Upper bounds (seconds) of the latency histogram buckets; the last is +Inf
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3, 1e-2)
+
+
+def _ascii_digits(text):
+    # \d also matches other Unicode decimal digits; canonical forms use 0-9
+    return text if text.isascii() else ''.join(str(int(char)) for char in text)
+
+
+def _ssn_digits_reason(digits):
+    # The SSA rule 9 ASCII digits break, or None; same rules as _ssn_rule
+    area = digits[:3]
+    if area == '000' or area == '666' or area >= '900':
+        return 'ssn_area'
+    if digits[3:5] == '00':
+        return 'ssn_group'
+    if digits[5:] == '0000':
+        return 'ssn_serial'
+    return None
+
+
+def _ssn_reason(match):
+    return _ssn_digits_reason(_ascii_digits(match.group(1) + match.group(3) + match.group(4)))
+
+
+def _date_reason(month, day):
+    return 'month' if not 1 <= int(month) <= 12 else 'day'
+
+
+# Why a match failed a validator's rule; rules missing here report 'rule'
+_RULE_REASONS = {
+    SSN: _ssn_reason,
+    PHONE: lambda match: 'area_code',
+    CITY_STATE_ZIP: lambda match: 'state',
+    DATE: lambda match: _date_reason(match.group(1), match.group(3)),
+    DATE_DMY: lambda match: _date_reason(match.group(3), match.group(1)),
+    DATE_ISO: lambda match: _date_reason(match.group(2), match.group(3)),
+    ION_WORDS: lambda match: 'even_length',
+}
+
+# Inputs over these lengths are rejected before any matching
+_LENGTH_CAPS = {URL: MAX_URL_LENGTH, EMAIL: MAX_EMAIL_LENGTH}
+
+
+def reject_reason(kind, text):
+    """
+    Explains why a validator rejects text, or returns None if it accepts it
+    - 'pattern': the regex did not match; 'too_long': over the length cap
+    - Rule failures name the rule: 'area_code' (phone), 'ssn_area',
+      'ssn_group', 'ssn_serial', 'state', 'month', 'day', 'even_length',
+      password reasons from PasswordPolicy.explain, otherwise 'rule'
+    """
+    validator = _resolve(kind)
+    if validator.uncached_check(text):
+        return None
+    if isinstance(validator.fast, PasswordPolicy):
+        return validator.fast.explain(text) or 'rule'
+    if validator in _LENGTH_CAPS and len(text) > _LENGTH_CAPS[validator]:
+        return 'too_long'
+    if validator.rule is None:
+        # No rule, so the pattern (or the fast path standing in for it) said no
+        return 'pattern'
+    match = validator._match(text)
+    if match is None:
+        return 'pattern'
+    explain = _RULE_REASONS.get(validator)
+    return 'rule' if explain is None else explain(match)
+
+
+class ValidatorMetrics:
+    """
+    Counters for one instrumented validator
+    - calls / rejects: checks made and how many returned False
+    - total_time: seconds spent inside the checks
+    - buckets: call counts per LATENCY_BUCKETS bucket (plus a final +Inf one)
+    - reasons: {reject reason: count}, see reject_reason
+    """
+    __slots__ = ('calls', 'rejects', 'total_time', 'buckets', 'reasons')
+
+    def __init__(self):
+        self.buckets = []
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.rejects = 0
+        self.total_time = 0.0
+        # Cleared in place: wrapped checks hold on to this list
+        self.buckets[:] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.reasons = {}
+
+    def wrap(self, validator, check):
+        # The timed check that stands in for validator.check while enabled
+        clock = time.perf_counter
+        buckets = self.buckets
+
+        def timed_check(text):
+            start = clock()
+            result = check(text)
+            elapsed = clock() - start
+            self.calls += 1
+            self.total_time += elapsed
+            buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            if not result:
+                # Explaining costs another check, but only for rejects
+                self.rejects += 1
+                reason = reject_reason(validator, text)
+                self.reasons[reason] = self.reasons.get(reason, 0) + 1
+            return result
+        return timed_check
+
+    def snapshot(self):
+        cumulative = 0
+        buckets = []
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), self.buckets):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return {'calls': self.calls, 'rejects': self.rejects, 'total_time': self.total_time,
+                'buckets': buckets, 'reasons': dict(self.reasons)}
+
+
+def _selected(kind):
+    return list(VALIDATORS.values()) if kind is None else [_resolve(kind)]
+
+
+def enable_metrics(kind=None):
+    """
+    Starts recording metrics for one validator, or for every registered one
+    - Counts calls through validate_*, the registry objects and validate_many
+      (method='joined' scans are not counted)
+    - Keeps existing counters when already enabled
+    """
+    for validator in _selected(kind):
+        if validator.metrics is None:
+            validator.metrics = ValidatorMetrics()
+            validator._update_check()
+
+
+def disable_metrics(kind=None):
+    """
+    Stops recording (and drops the counters) for one validator, or for all
+    """
+    for validator in _selected(kind):
+        validator.metrics = None
+        validator._update_check()
+
+
+def reset_metrics(kind=None):
+    """
+    Zeroes the counters of instrumented validators
+    """
+    for validator in _selected(kind):
+        if validator.metrics is not None:
+            validator.metrics.reset()
+
+
+def metrics_snapshot():
+    """
+    Returns {validator name: counters} for every instrumented validator
+    - Counters: calls, rejects, total_time, reasons, and buckets as
+      (upper bound, cumulative count) pairs ending with +Inf
+    """
+    return {name: validator.metrics.snapshot()
+            for name, validator in VALIDATORS.items() if validator.metrics is not None}
+
+
+def _prometheus_number(value):
+    return '+Inf' if value == float('inf') else repr(value)
+
+
+def prometheus_text():
+    """
+    The metrics snapshot in the Prometheus text exposition format
+    """
+    snapshot = metrics_snapshot()
+    lines = [
+        '# HELP regex_validator_calls_total Validator checks made.',
+        '# TYPE regex_validator_calls_total counter',
+    ]
+    lines += [f'regex_validator_calls_total{{validator="{name}"}} {counters["calls"]}'
+              for name, counters in snapshot.items()]
+    lines += [
+        '# HELP regex_validator_rejects_total Rejected inputs by reason.',
+        '# TYPE regex_validator_rejects_total counter',
+    ]
+    lines += [f'regex_validator_rejects_total{{validator="{name}",reason="{reason}"}} {count}'
+              for name, counters in snapshot.items()
+              for reason, count in sorted(counters['reasons'].items())]
+    lines += [
+        '# HELP regex_validator_latency_seconds Time spent in one check.',
+        '# TYPE regex_validator_latency_seconds histogram',
+    ]
+    for name, counters in snapshot.items():
+        lines += [f'regex_validator_latency_seconds_bucket{{validator="{name}",'
+                  f'le="{_prometheus_number(bound)}"}} {count}'
+                  for bound, count in counters['buckets']]
+        lines.append(f'regex_validator_latency_seconds_sum{{validator="{name}"}} {counters["total_time"]!r}')
+        lines.append(f'regex_validator_latency_seconds_count{{validator="{name}"}} {counters["calls"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path):
+    """
+    Writes prometheus_text() to path (e.g. for node_exporter's textfile
+    collector), via a temporary file renamed into place
+    """
+    path = os.fspath(path)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(temporary, path)
+
+
+# --- PARSING ---
+# parse_* validate and normalize with one match: the groups that decide
+# validity also give the canonical form, so callers need no second regex.
+# They use the pattern directly (not check), so caches and metrics do not
+# see these calls.
+
+
+class ParseResult:
+    """
+    The outcome of a parse_* call
+    - valid: the same answer as the matching validate_* function
+    - reason: None when valid, else the reject_reason code ('pattern',
+      'area_code', 'ssn_area', 'month', ...)
+    - value: the canonical form when valid, else None
+    - Falsy when invalid; unpacks as valid, reason, value
+    """
+    __slots__ = ('valid', 'reason', 'value')
+
+    def __init__(self, valid, reason=None, value=None):
+        self.valid = valid
+        self.reason = reason
+        self.value = value
+
+    def __bool__(self):
+        return self.valid
+
+    def __iter__(self):
+        return iter((self.valid, self.reason, self.value))
+
+    def __eq__(self, other):
+        if not isinstance(other, ParseResult):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f'ParseResult(valid={self.valid}, reason={self.reason!r}, value={self.value!r})'
+
+
+def parse_ssn(text):
+    """
+    validate_ssn plus the canonical form: the 9 digits without separators
+    - parse_ssn('123-45-6789').value == '123456789'
+    """
+    match = SSN._match(text)
+    if match is None:
+        return ParseResult(False, 'pattern')
+    area, sep, group, serial = match.groups()
+    digits = _ascii_digits(area + group + serial)
+    reason = _ssn_digits_reason(digits)
+    if reason is not None:
+        return ParseResult(False, reason)
+    return ParseResult(True, None, digits)
+
+
+def parse_phone(text):
+    """
+    validate_phone plus the canonical form: E.164, e.g. '+12531234567'
+    """
+    match = PHONE._match(text)
+    if match is None:
+        return ParseResult(False, 'pattern')
+    parenthesized, area_code, bare_area_code, exchange, line = match.groups()
+    area_code = area_code or bare_area_code
+    if area_code not in VALID_AREA_CODES:
+        return ParseResult(False, 'area_code')
+    return ParseResult(True, None, '+1' + area_code + _ascii_digits(exchange + line))
+
+
+def parse_currency(text):
+    """
+    validate_currency plus the canonical form: the amount in integer cents
+    - parse_currency('$1,234.56').value == 123456
+    """
+    match = CURRENCY._match(text)
+    if match is None:
+        return ParseResult(False, 'pattern')
+    amount = match.group()  # without the trailing newline $ allows
+    return ParseResult(True, None, int(amount[1:-3].replace(',', '')) * 100 + int(amount[-2:]))
+
+
+def parse_date(text):
+    """
+    validate_date plus the canonical form: a datetime.date
+    - Year 0000 passes validate_date but has no datetime.date: value is None
+    """
+    match = DATE._match(text)
+    if match is None:
+        return ParseResult(False, 'pattern')
+    month, sep, day, year = match.groups()
+    month, day, year = int(month), int(day), int(year)
+    if not check_date(month, day, year):
+        return ParseResult(False, _date_reason(month, day))
+    import datetime
+    return ParseResult(True, None, datetime.date(year, month, day) if year else None)
@@ -0,0 +1,129 @@
+"""
+Text scanning: find every SSN, phone number, email, card number, ... in a document
+- scan(text, kinds=...) returns (kind, start, end) spans, in text order
+- All requested kinds are combined into one alternation and found in a
+  single pass over the text
+- Each hit still has to pass the same post-match rules as the validators
+  (SSA numbering, official area codes and states, real calendar dates)
+"""
+import functools
+import re
+
+import regex_validators
+from regex_validators import _LEAP_CYCLE, _MONTH_DAYS
+
+# A hit may not be glued to a neighbouring word, number or address
+_BEFORE = r'(?<![\w.@-])'
+_AFTER = r'(?![\w@-])'
+
+
+def _ssn_rule(match):
+    # Same SSA rules as validate_ssn
+    area = int(match.group('ssn_area'))
+    return (area != 0 and area != 666 and area < 900
+            and int(match.group('ssn_group')) != 0 and int(match.group('ssn_serial')) != 0)
+
+
+def _phone_rule(match):
+    area_code = match.group('phone_area1') or match.group('phone_area2')
+    return area_code in regex_validators.VALID_AREA_CODES
+
+
+def _city_state_zip_rule(match):
+    return match.group('csz_state') in regex_validators.VALID_STATES
+
+
+def _date_rule(match):
+    month = int(match.group('date_month'))
+    return (1 <= month <= 12
+            and 1 <= int(match.group('date_day')) <= _MONTH_DAYS[_LEAP_CYCLE[int(match.group('date_year')) % 400]][month])
+
+
+def _card_rule(match):
+    # Luhn checksum over the digits, ignoring separators
+    digits = [int(char) for char in match.group('card') if char.isdigit()]
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        if position % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+# kind -> (unanchored pattern, post-match rule). Patterns use kind-prefixed
+# group names so they can share one alternation, and every repeat is bounded
+# so no start position can cost more than a fixed amount of work.
+SCAN_PATTERNS = {
+    'ssn': (r'(?P<ssn_area>\d{3})(?P<ssn_sep>[- ]?)(?P<ssn_group>\d{2})(?P=ssn_sep)(?P<ssn_serial>\d{4})',
+            _ssn_rule),
+    'phone': (r'(?:\((?P<phone_area1>\d{3})\)|(?P<phone_area2>\d{3}))[\s-]?\d{3}[\s-]?\d{4}',
+              _phone_rule),
+    'email': (r'[a-zA-Z0-9._-]{1,64}@[a-zA-Z0-9.-]{1,252}\.[a-zA-Z]{2,63}', None),
+    'card': (r'[0-9](?:[ -]?[0-9]){12,18}', _card_rule),
+    'currency': (r'\$\d{1,3}(?:,\d{3}){0,6}\.\d{2}', None),
+    'date': (r'(?P<date_month>\d{1,2})(?P<date_sep>[-/])(?P<date_day>\d{1,2})(?P=date_sep)(?P<date_year>\d{4})',
+             _date_rule),
+    'city_state_zip': (r'[A-Za-z]{1,30}(?: [A-Za-z]{1,30}){0,4},\s(?P<csz_state>[A-Z]{2})\s\d{5}(?:-\d{4})?',
+                       _city_state_zip_rule),
+}
+
+DEFAULT_SCAN_KINDS = ('ssn', 'phone', 'email', 'card')
+
+
+@functools.lru_cache(maxsize=64)
+def _compile(kinds):
+    # One alternation for the requested kinds, compiled once per combination
+    unknown = [kind for kind in kinds if kind not in SCAN_PATTERNS]
+    if unknown:
+        known = ', '.join(SCAN_PATTERNS)
+        raise KeyError(f'cannot scan for {", ".join(map(repr, unknown))} (known: {known})')
+    alternatives = '|'.join(f'(?P<{kind}>{SCAN_PATTERNS[kind][0]})' for kind in kinds)
+    rules = {kind: SCAN_PATTERNS[kind][1] for kind in kinds}
+    return re.compile(f'{_BEFORE}(?:{alternatives}){_AFTER}'), rules
+
+
+def _passing_match(text, match, kinds, rules):
+    # match, or the first other kind matching at the same offset, that
+    # passes its rule; None when every kind starting there is rejected
+    start, rejected = match.start(), ()
+    while match is not None:
+        rule = rules[match.lastgroup]
+        if rule is None or rule(match):
+            return match
+        rejected += (match.lastgroup,)
+        remaining = tuple(kind for kind in kinds if kind not in rejected)
+        match = _compile(remaining)[0].match(text, start) if remaining else None
+    return None
+
+
+def iter_scan(text, kinds=DEFAULT_SCAN_KINDS):
+    """
+    Yields (kind, start, end) for every value of the requested kinds in text
+    - When a candidate fails its rule (e.g. SSN area 666), the other kinds
+      are tried at the same offset, then scanning resumes one character
+      later, so another value starting there or just after is not hidden
+    """
+    if isinstance(kinds, str):
+        kinds = (kinds,)
+    kinds = tuple(kinds)
+    regex, rules = _compile(kinds)
+    pos = 0
+    while pos is not None:
+        resume, pos = pos, None
+        for match in regex.finditer(text, resume):
+            hit = _passing_match(text, match, kinds, rules)
+            if hit is not None:
+                yield hit.lastgroup, hit.start(), hit.end()
+            if hit is not match:
+                pos = match.start() + 1 if hit is None else hit.end()
+                break
+
+def scan(text, kinds=DEFAULT_SCAN_KINDS):
+    """
+    Finds every value of the requested kinds in text
+    - kinds: names from SCAN_PATTERNS (default: ssn, phone, email, card)
+    - Returns a list of (kind, start, end) spans in text order
+    """
+    return list(iter_scan(text, kinds))
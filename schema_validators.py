@@ -0,0 +1,207 @@
+"""
+Record validation: a Schema maps the fields of dict or tuple records to validators
+- Compiled into one per-record checker that stops at the first failed field
+  (check), or collects every failed field (errors)
+- Checks run cheapest and most selective first: tune() measures each field
+  on sample records and sorts by cost per row over the share of rows it rejects
+- validate_many works column by column over chunks of records: each field is
+  one regex_validators.validate_many over the records still valid, so a
+  record that failed costs nothing more
+"""
+import time
+from itertools import compress, islice
+from operator import itemgetter
+
+from regex_validators import _resolve, validate_many
+from stream_validators import DEFAULT_CHUNK_ROWS, iter_chunks
+
+# Records tune() measures each field on: enough to see rejection rates of a
+# few percent, few enough to cost well under a millisecond per field
+TUNE_SAMPLE_ROWS = 512
+
+def _field_value(record, key):
+    # record[key], or None for a missing key or a tuple that is too short
+    try:
+        return record[key]
+    except (KeyError, IndexError):
+        return None
+
+
+def _value_valid(value, validator, optional):
+    if value is None:
+        return optional
+    if optional and value == '':
+        return True
+    return validator.check(value)
+
+
+def _column(records, key):
+    # One field of every record, with None for missing fields
+    try:
+        return list(map(itemgetter(key), records))
+    except (KeyError, IndexError):
+        return [_field_value(record, key) for record in records]
+
+
+def _column_valid(validator, values, optional):
+    # bytearray of 1/0 for one field's values
+    if None in values or (optional and '' in values):
+        return bytearray([_value_valid(value, validator, optional) for value in values])
+    return validate_many(validator, values)
+
+
+def _zeros(flags):
+    # Positions of the 0s in a bytearray of 1/0, found by C-level searches
+    position = flags.find(0)
+    while position >= 0:
+        yield position
+        position = flags.find(0, position + 1)
+
+
+def _compile_check(schema):
+    # One function testing the fields in schema.order, stopping at the first
+    # failure; validator.check is looked up per call so a cache or metrics
+    # enabled later are used
+    steps = tuple((key, schema.fields[key], key in schema.optional) for key in schema.order)
+    slow = schema._check_slowly
+
+    def check(record):
+        try:
+            for key, validator, optional in steps:
+                value = record[key]
+                if value is None:
+                    # Never handed to the validator, as in errors()
+                    if not optional:
+                        return False
+                elif not (optional and value == '') and not validator.check(value):
+                    return False
+            return True
+        except (KeyError, IndexError, TypeError):
+            return slow(record)
+
+    return check
+
+
+class Schema:
+    """
+    Maps record fields to validators
+    - fields: {key: validator name or Validator}; keys are dict keys for dict
+      records and indexes for tuple or list records
+    - optional: keys whose value may be missing, None or ''
+    - Any other missing field or None value is invalid
+    - order: the order fields are checked in; the declared order until
+      tune() (or the first validate_many) measures a better one, unless
+      given here
+    - Calling the schema returns True/False for one record, like check
+    """
+    __slots__ = ('fields', 'optional', 'order', 'check', '_tuned')
+
+    def __init__(self, fields, optional=(), order=None):
+        self.fields = {key: _resolve(kind) for key, kind in fields.items()}
+        unknown = set(optional) - set(self.fields)
+        if unknown:
+            raise ValueError(f'optional fields not in the schema: {", ".join(map(repr, sorted(unknown, key=str)))}')
+        self.optional = frozenset(optional)
+        self._tuned = False
+        self.reorder(self.fields if order is None else order)
+        self._tuned = order is not None
+
+    def reorder(self, order):
+        """
+        Checks fields in this order from now on (every field exactly once)
+        """
+        order = tuple(order)
+        if len(order) != len(self.fields) or set(order) != set(self.fields):
+            raise ValueError('order must list every field of the schema once')
+        self.order = order
+        self.check = _compile_check(self)
+        self._tuned = True
+
+    def __call__(self, record):
+        return self.check(record)
+
+    def _check_slowly(self, record):
+        # check() for records with missing fields or None values
+        return all(_value_valid(_field_value(record, key), self.fields[key], key in self.optional)
+                   for key in self.order)
+
+    def errors(self, record):
+        """
+        Returns the keys of every failed field of one record, in declared
+        order (an empty tuple for a valid record)
+        """
+        return tuple(key for key, validator in self.fields.items()
+                     if not _value_valid(_field_value(record, key), validator, key in self.optional))
+
+    def tune(self, records, sample_rows=TUNE_SAMPLE_ROWS):
+        """
+        Reorders the checks for data like records
+        - Each field is timed over up to sample_rows records; fields are then
+          sorted by seconds per record divided by the share of records they
+          reject, which puts cheap, selective checks first
+        - Pass a list: an iterator would lose the sampled records
+        - Returns the new order
+        """
+        sample = list(islice(records, sample_rows))
+        if not sample:
+            return self.order
+        ranks = {}
+        for key in self.order:
+            validator, optional = self.fields[key], key in self.optional
+            values = _column(sample, key)
+            # Compile lazily built patterns outside the timed call
+            _column_valid(validator, values[:1], optional)
+            start = time.perf_counter()
+            valid = _column_valid(validator, values, optional)
+            elapsed = time.perf_counter() - start
+            # A field that never failed counts as half a rejection
+            ranks[key] = elapsed / max(valid.count(0), 0.5)
+        self.reorder(sorted(self.order, key=ranks.__getitem__))
+        return self.order
+
+    def _chunk_valid(self, records):
+        # Fail-fast over one chunk: each field only sees records that passed
+        # every field before it
+        result = bytearray(b'\x01') * len(records)
+        rows = records
+        positions = range(len(records))
+        for key in self.order:
+            if not rows:
+                break
+            valid = _column_valid(self.fields[key], _column(rows, key), key in self.optional)
+            if 0 in valid:
+                for failed in _zeros(valid):
+                    result[positions[failed]] = 0
+                rows = list(compress(rows, valid))
+                positions = list(compress(positions, valid))
+        return result
+
+    def _chunk_errors(self, records):
+        # Collect-all over one chunk: every field of every record
+        errors = [()] * len(records)
+        for key, validator in self.fields.items():
+            valid = _column_valid(validator, _column(records, key), key in self.optional)
+            for failed in _zeros(valid):
+                errors[failed] += (key,)
+        return errors
+
+    def validate_many(self, records, collect=False, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Validates an iterable of dict or tuple records
+        - Returns a bytearray of 1/0 per record, or with collect=True a list of
+          each record's failed keys (as errors() returns them)
+        - Records are read chunk_rows at a time, so a generator streams
+          through without being held in memory
+        - An untuned schema is tuned on the first chunk (not with collect=True:
+          every field is checked anyway, so the order cannot matter)
+        """
+        result = [] if collect else bytearray()
+        for chunk in iter_chunks(iter(records), chunk_rows):
+            if not collect and not self._tuned:
+                self.tune(chunk)
+            result += self._chunk_errors(chunk) if collect else self._chunk_valid(chunk)
+        return result
+
+    def __repr__(self):
+        fields = ', '.join(f'{key!r}: {validator.name!r}' for key, validator in self.fields.items())
+        return f'Schema({{{fields}}}, optional={sorted(self.optional, key=str)!r})'
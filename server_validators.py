@@ -0,0 +1,544 @@
+"""
+A shared validation server for other processes and languages
+- Listens on a Unix-domain socket (address is a path) or on localhost TCP
+  (address is a (host, port) tuple) and validates batches of strings with
+  any registered validator ('phone', 'ssn', 'date', ...)
+- Requests that arrive together from different clients are combined into
+  one validate_many call per validator. Batches never run on the event
+  loop: with one worker they run one at a time in a helper thread, with
+  more in a ValidatorPool; either way the next batch builds up meanwhile
+- Each connection may pipeline requests; replies come back in request order
+
+Protocol: every message is a 4-byte big-endian length, then that many bytes
+- Request: 1 byte name length, validator name (ASCII), 4-byte row count,
+  4-byte byte length of every row, then the rows as UTF-8, back to back
+- Reply: 1 status byte; status 0 is followed by one byte (1 valid, 0 invalid)
+  per row, status 1 by a UTF-8 error message
+- Rows that are not valid UTF-8 are invalid
+
+Command line:
+  python server_validators.py serve /tmp/validators.sock [--workers N] [--no-batching]
+  python server_validators.py load /tmp/validators.sock phone "(253)123-4567" [--clients N] [--requests N] [--rows N]
+"""
+import asyncio
+import os
+import socket
+import stat
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import parallel_validators
+import regex_validators
+
+# Largest message either side accepts
+MAX_MESSAGE_BYTES = 64 << 20
+# Most rows validated in one batch; bigger requests form a batch of their own
+BATCH_MAX_ROWS = 50_000
+# Requests read from one connection before its replies must be written
+MAX_PIPELINED = 64
+
+_LENGTH = struct.Struct('>I')
+_OK = b'\x00'
+_ERROR = b'\x01'
+
+
+def _frame(payload):
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def encode_request(kind, rows):
+    """
+    One request message (length prefix included) validating rows with kind
+    """
+    name = kind.encode('ascii')
+    if len(name) > 255:
+        raise ValueError('validator names are limited to 255 characters')
+    data = [row.encode('utf-8') for row in rows]
+    return _frame(b''.join((bytes([len(name)]), name, _LENGTH.pack(len(data)),
+                            struct.pack(f'>{len(data)}I', *map(len, data)), *data)))
+
+
+def _decode_request(body):
+    # (kind, rows, positions of rows that are not UTF-8); ValueError if malformed
+    try:
+        name_end = 1 + body[0]
+        kind = body[1:name_end].decode('ascii')
+        (count,) = _LENGTH.unpack_from(body, name_end)
+        lengths = struct.unpack_from(f'>{count}I', body, name_end + 4)
+    except (IndexError, UnicodeDecodeError, struct.error):
+        raise ValueError('malformed request') from None
+    start = name_end + 4 + 4 * count
+    if start + sum(lengths) != len(body):
+        raise ValueError('malformed request: row lengths do not add up')
+    data = body[start:]
+    rows = []
+    undecodable = []
+    if data.isascii():
+        # One decode for the whole request: byte offsets are character offsets
+        text = data.decode('ascii')
+        position = 0
+        for length in lengths:
+            rows.append(text[position:position + length])
+            position += length
+        return kind, rows, undecodable
+    position = 0
+    for i, length in enumerate(lengths):
+        try:
+            rows.append(str(data[position:position + length], 'utf-8'))
+        except UnicodeDecodeError:
+            rows.append('')
+            undecodable.append(i)
+        position += length
+    return kind, rows, undecodable
+
+
+def decode_reply(body):
+    """
+    The bytearray of 1/0 results in a reply message body
+    - Raises ValueError with the server's message for an error reply
+    """
+    if body[:1] == _OK:
+        return bytearray(body[1:])
+    raise ValueError(bytes(body[1:]).decode('utf-8', 'replace'))
+
+
+async def _read_message(reader):
+    # One message body, or None at a clean end of stream
+    try:
+        header = await reader.readexactly(4)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise
+        return None
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f'message of {length:,} bytes is over the {MAX_MESSAGE_BYTES:,} byte limit')
+    return await reader.readexactly(length)
+
+
+def _is_socket(path):
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+
+class ServerStats:
+    """
+    Counters for one server
+    - requests, rows: validated so far
+    - batches: validate_many calls those took (fewer than requests when
+      requests were combined)
+    """
+    __slots__ = ('requests', 'rows', 'batches')
+
+    def __init__(self):
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+
+    def __str__(self):
+        per_batch = self.requests / self.batches if self.batches else 0.0
+        return f'{self.requests:,} requests, {self.rows:,} rows in {self.batches:,} batches ({per_batch:.1f} requests/batch)'
+
+
+class ValidationServer:
+    """
+    Serves validate_many over a local socket
+    - address: a filesystem path for a Unix-domain socket, or a (host, port)
+      tuple for TCP (port 0 picks a free port; see .address once started)
+    - workers: processes validating batches (default os.cpu_count()); with
+      one worker batches are validated one at a time in a single thread, so
+      accepts, reads and replies for other clients go on meanwhile
+    - tables_path: reference tables file for the worker processes, as for
+      ValidatorPool
+    - batching=False validates every request on its own (for comparison)
+    - Use as an async context manager, or start() then serve_forever()
+    """
+
+    def __init__(self, address, workers=None, tables_path=None, batching=True):
+        if isinstance(address, str) and not hasattr(socket, 'AF_UNIX'):
+            raise ValueError('Unix-domain sockets are not available here; pass a (host, port) address')
+        self.address = address
+        self.workers = workers or os.cpu_count() or 1
+        self.batching = batching
+        self.stats = ServerStats()
+        if self.workers > 1:
+            self._pool = parallel_validators.ValidatorPool(self.workers, tables_path)
+            self._thread = None
+        else:
+            self._pool = None
+            self._thread = ThreadPoolExecutor(1, thread_name_prefix='validation-server')
+        self._server = None
+        self._connections = {}
+        self._pending = {}
+        self._in_flight = 0
+        self._dispatch_scheduled = False
+
+    async def start(self):
+        """
+        Starts listening; returns the address (with the real port for TCP)
+        """
+        if isinstance(self.address, str):
+            if _is_socket(self.address):
+                os.unlink(self.address)  # left behind by a server that did not shut down
+            self._server = await asyncio.start_unix_server(self._handle, self.address)
+        else:
+            host, port = self.address
+            self._server = await asyncio.start_server(self._handle, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self.address
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # Handlers see the end of their stream, answer what they have
+            # read and finish
+            handlers = list(self._connections)
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+            if isinstance(self.address, str) and _is_socket(self.address):
+                os.unlink(self.address)
+        if self._pool is not None:
+            self._pool.close()
+        if self._thread is not None:
+            self._thread.shutdown()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _handle(self, reader, writer):
+        handler = asyncio.current_task()
+        self._connections[handler] = writer
+        replies = asyncio.Queue(MAX_PIPELINED)
+        sender = asyncio.create_task(self._send_replies(replies, writer))
+        try:
+            while True:
+                body = await _read_message(reader)
+                if body is None:
+                    break
+                await replies.put(self._submit(body))
+        except ValueError as e:
+            # Oversized message: the rest of the stream cannot be framed
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(_frame(_ERROR + str(e).encode('utf-8')))
+            await replies.put(future)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            await replies.put(None)
+            await sender
+            writer.close()
+            del self._connections[handler]
+
+    async def _send_replies(self, replies, writer):
+        # Writes replies in request order as each one completes
+        try:
+            while True:
+                future = await replies.get()
+                if future is None:
+                    return
+                writer.write(await future)
+                if replies.empty():
+                    await writer.drain()
+        except ConnectionError:
+            # The client went away; the remaining replies have nowhere to go
+            future = await replies.get()
+            while future is not None:
+                future.cancel()
+                future = await replies.get()
+
+    def _submit(self, body):
+        # A future for the framed reply; valid requests wait for a batch
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            kind, rows, undecodable = _decode_request(body)
+            regex_validators.get_validator(kind)
+        except (ValueError, KeyError) as e:
+            future.set_result(_frame(_ERROR + str(e.args[0]).encode('utf-8')))
+            return future
+        self._pending.setdefault(kind, []).append((rows, undecodable, future))
+        if not self._dispatch_scheduled:
+            # After the callbacks already queued: requests read in the same
+            # turn of the event loop share a batch
+            self._dispatch_scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+
+    def _next_batch(self, kind):
+        # Pending requests for kind, up to BATCH_MAX_ROWS rows (at least one request)
+        pending = self._pending[kind]
+        take = 1
+        rows = len(pending[0][0])
+        if self.batching:
+            while take < len(pending) and rows + len(pending[take][0]) <= BATCH_MAX_ROWS:
+                rows += len(pending[take][0])
+                take += 1
+        batch = pending[:take]
+        del pending[:take]
+        if not pending:
+            del self._pending[kind]
+        return batch
+
+    def _dispatch(self):
+        self._dispatch_scheduled = False
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if self._in_flight >= self.workers:
+                return  # _batch_done dispatches again: meanwhile the next batches grow
+            kind = next(iter(self._pending))
+            batch = self._next_batch(kind)
+            rows = [row for request in batch for row in request[0]]
+            self._in_flight += 1
+            if self._pool is None:
+                job = loop.run_in_executor(self._thread, regex_validators.validate_many, kind, rows)
+            else:
+                job = loop.run_in_executor(self._pool._get_executor(), parallel_validators._validate_chunk,
+                                           kind, rows)
+            job.add_done_callback(lambda job, batch=batch: self._batch_done(batch, job))
+
+    def _batch_done(self, batch, job):
+        self._in_flight -= 1
+        if job.cancelled():
+            return
+        error = job.exception()
+        if error is not None:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(_frame(_ERROR + str(error).encode('utf-8')))
+        else:
+            self._deliver(batch, job.result())
+        if self._pending and not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            asyncio.get_running_loop().call_soon(self._dispatch)
+
+    def _deliver(self, batch, results):
+        self.stats.batches += 1
+        position = 0
+        for rows, undecodable, future in batch:
+            flags = results[position:position + len(rows)]
+            position += len(rows)
+            if undecodable:
+                flags = bytearray(flags)
+                for i in undecodable:
+                    flags[i] = 0
+            self.stats.requests += 1
+            self.stats.rows += len(rows)
+            if not future.done():
+                future.set_result(_frame(_OK + flags))
+
+
+async def serve(address, workers=None, tables_path=None, batching=True):
+    """
+    Runs a ValidationServer until cancelled
+    """
+    async with ValidationServer(address, workers, tables_path, batching) as server:
+        await server.serve_forever()
+
+
+# --- CLIENTS ---
+
+def _connect(address, timeout):
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address)
+        return sock
+    return socket.create_connection(address, timeout)
+
+
+def _receive_exactly(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError('server closed the connection')
+        received += count
+    return buffer
+
+
+class ValidationClient:
+    """
+    A blocking client for ValidationServer (one connection)
+    - validate_many(kind, rows) returns the same bytearray as
+      regex_validators.validate_many
+    - Usable as a context manager
+    """
+
+    def __init__(self, address, timeout=None):
+        self._sock = _connect(address, timeout)
+
+    def validate_many(self, kind, rows):
+        self._sock.sendall(encode_request(kind, rows))
+        (length,) = _LENGTH.unpack(_receive_exactly(self._sock, 4))
+        return decode_reply(_receive_exactly(self._sock, length))
+
+    def close(self):
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+async def _open_connection(address):
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+class LoadReport:
+    """
+    Results of load_test
+    - latencies: seconds from sending each request to reading its reply, sorted
+    - elapsed: wall-clock seconds for the whole test
+    """
+    __slots__ = ('latencies', 'rows', 'elapsed')
+
+    def __init__(self, latencies, rows, elapsed):
+        self.latencies = sorted(latencies)
+        self.rows = rows
+        self.elapsed = elapsed
+
+    def percentile(self, share):
+        if not self.latencies:
+            return 0.0
+        return self.latencies[min(len(self.latencies) - 1, int(share * len(self.latencies)))]
+
+    @property
+    def p50(self):
+        return self.percentile(0.50)
+
+    @property
+    def p99(self):
+        return self.percentile(0.99)
+
+    @property
+    def requests_per_sec(self):
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f'{len(self.latencies):,} requests in {self.elapsed:.2f}s: {self.requests_per_sec:,.0f} requests/sec, '
+                f'{self.rows_per_sec:,.0f} rows/sec, p50 {self.p50 * 1e3:.2f} ms, p99 {self.p99 * 1e3:.2f} ms')
+
+
+async def load_test(address, kind, samples, clients=16, requests=200, rows_per_request=10):
+    """
+    Measures a running server with concurrent clients
+    - clients connections each send requests requests, one after another,
+      of rows_per_request rows taken in turn from samples
+    - Every reply is checked against regex_validators.validate_many
+    - Returns a LoadReport
+    """
+    samples = list(samples)
+    if not samples:
+        raise ValueError('samples must not be empty')
+    if clients < 1 or requests < 1 or rows_per_request < 1:
+        raise ValueError('clients, requests and rows_per_request must be at least 1')
+    cycle = samples * (rows_per_request // len(samples) + 2)
+    batches = [cycle[i % len(samples):i % len(samples) + rows_per_request] for i in range(len(samples))]
+    messages = [encode_request(kind, rows) for rows in batches]
+    expected = [bytes(regex_validators.validate_many(kind, rows)) for rows in batches]
+    latencies = []
+
+    async def client(number):
+        reader, writer = await _open_connection(address)
+        try:
+            for i in range(requests):
+                which = (number + i) % len(messages)
+                start = time.perf_counter()
+                writer.write(messages[which])
+                body = await _read_message(reader)
+                latencies.append(time.perf_counter() - start)
+                if bytes(decode_reply(body)) != expected[which]:
+                    raise AssertionError(f'server answered {kind!r} differently from validate_many')
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    elapsed = time.perf_counter() - start
+    return LoadReport(latencies, clients * requests * rows_per_request, elapsed)
+
+
+def _parse_address(text):
+    host, _, port = text.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return text
+
+
+def _parse_options(argv, options):
+    args = []
+    argv = iter(argv)
+    for arg in argv:
+        if arg.startswith('--'):
+            option = arg[2:]
+            if option not in options:
+                raise ValueError(f'unknown option {arg}')
+            if isinstance(options[option], bool):
+                options[option] = True
+                continue
+            value = next(argv, None)
+            if value is None or not value.isdigit():
+                raise ValueError(f'{arg} needs a number')
+            options[option] = int(value)
+        else:
+            args.append(arg)
+    return args, options
+
+
+def main(argv):
+    usage = __doc__.strip().split('Command line:')[1].rstrip()
+    try:
+        if argv[:1] == ['serve']:
+            args, options = _parse_options(argv[1:], {'workers': 0, 'no-batching': False})
+            if len(args) != 1:
+                raise ValueError('serve needs an address')
+            address = _parse_address(args[0])
+            print(f'serving on {address}', file=sys.stderr)
+            try:
+                asyncio.run(serve(address, options['workers'] or None, batching=not options['no-batching']))
+            except KeyboardInterrupt:
+                pass
+            return 0
+        if argv[:1] == ['load']:
+            args, options = _parse_options(argv[1:], {'clients': 16, 'requests': 200, 'rows': 10})
+            if len(args) < 3:
+                raise ValueError('load needs an address, a validator and sample values')
+            report = asyncio.run(load_test(_parse_address(args[0]), args[1], args[2:], options['clients'],
+                                           options['requests'], options['rows']))
+            print(report)
+            return 0
+    except ValueError as e:
+        print(e)
+    print(usage)
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,165 @@
+"""
+Streaming CSV validation on top of regex_validators
+- Reads the file in fixed-size chunks of rows, so memory stays constant
+- Maps columns (by index or header name) to validator names
+- Yields per-row results, or only the invalid rows
+
+Command line:
+  python stream_validators.py export.csv 3=ssn 7=phone [--header] [--invalid-only]
+"""
+import contextlib
+import csv
+import sys
+import time
+from itertools import islice
+
+from regex_validators import get_validator, validate_many
+
+# Rows parsed and validated together; bounds memory use independently of file size
+DEFAULT_CHUNK_ROWS = 10_000
+
+
+class StreamStats:
+    """
+    Throughput counters for one streaming run
+    - rows: data rows validated so far
+    - invalid_rows: rows where at least one mapped column failed
+    - elapsed: seconds since the run started (updated after every chunk)
+    """
+    __slots__ = ('rows', 'invalid_rows', 'elapsed', '_start')
+
+    def __init__(self):
+        self.rows = 0
+        self.invalid_rows = 0
+        self.elapsed = 0.0
+        self._start = None
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f'{self.rows:,} rows ({self.invalid_rows:,} invalid) in {self.elapsed:.2f}s: '
+                f'{self.rows_per_sec:,.0f} rows/sec')
+
+
+def _open(source):
+    # Paths are opened (and closed) here; file objects belong to the caller
+    if hasattr(source, 'read'):
+        return contextlib.nullcontext(source)
+    return open(source, newline='', encoding='utf-8')
+
+
+def iter_chunks(reader, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yields lists of up to chunk_rows rows from any row iterator
+    - Only one chunk is held in memory at a time
+    """
+    if chunk_rows < 1:
+        raise ValueError('chunk_rows must be at least 1')
+    while True:
+        chunk = list(islice(reader, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _resolve_columns(columns, header):
+    # Turn {column: validator name} into [(key, index, Validator)]
+    resolved = []
+    for key, kind in columns.items():
+        if isinstance(key, int):
+            index = key
+        elif header is None:
+            raise ValueError(f'column {key!r} is a name, but the file is read without a header')
+        else:
+            try:
+                index = header.index(key)
+            except ValueError:
+                raise ValueError(f'column {key!r} is not in the header') from None
+        resolved.append((key, index, get_validator(kind)))
+    return resolved
+
+
+def _failed_columns(chunk, resolved):
+    # One validate_many per mapped column; returns each row's failed column keys
+    results = [
+        (key, validate_many(validator, [row[index] if index < len(row) else '' for row in chunk]))
+        for key, index, validator in resolved
+    ]
+    return [tuple(key for key, valid in results if not valid[offset]) for offset in range(len(chunk))]
+
+
+def validate_rows(rows, columns, invalid_only=False, chunk_rows=DEFAULT_CHUNK_ROWS,
+                  stats=None, header=None, first_row_number=1):
+    """
+    Validates an iterator of already-split rows chunk by chunk
+    - columns: {column index or header name: validator name}, e.g. {3: 'ssn', 7: 'phone'}
+    - Yields (row_number, row, failed_columns) for every row, or only rows
+      with failures when invalid_only=True
+    - Missing fields count as invalid
+    """
+    resolved = _resolve_columns(columns, header)
+    if stats is None:
+        stats = StreamStats()
+    stats._start = time.perf_counter() - stats.elapsed
+    row_number = first_row_number
+    for chunk in iter_chunks(iter(rows), chunk_rows):
+        for offset, (row, failed) in enumerate(zip(chunk, _failed_columns(chunk, resolved))):
+            if failed:
+                stats.invalid_rows += 1
+            if failed or not invalid_only:
+                yield row_number + offset, row, failed
+        row_number += len(chunk)
+        stats.rows += len(chunk)
+        stats.elapsed = time.perf_counter() - stats._start
+
+
+def validate_csv(source, columns, header=False, invalid_only=False,
+                 chunk_rows=DEFAULT_CHUNK_ROWS, stats=None, **csv_options):
+    """
+    Streams a CSV file (path or open text file) through the validators
+    - columns: {column index or header name: validator name}
+    - header=True reads the first row as column names (and does not validate it)
+    - Yields (row_number, row, failed_columns); row_number counts records from 1,
+      header included
+    - Pass a StreamStats as stats to read rows/sec while or after streaming
+    - Extra keyword arguments (delimiter, quotechar, ...) go to csv.reader
+    """
+    with _open(source) as f:
+        reader = csv.reader(f, **csv_options)
+        names = None
+        first_row_number = 1
+        if header:
+            names = next(reader, [])
+            first_row_number = 2
+        yield from validate_rows(reader, columns, invalid_only, chunk_rows, stats,
+                                 names, first_row_number)
+
+
+def _parse_column(spec):
+    column, _, kind = spec.partition('=')
+    if not kind:
+        raise ValueError(f'expected COLUMN=VALIDATOR, got {spec!r}')
+    return (int(column) if column.isdigit() else column), kind
+
+
+def main(argv):
+    args = [arg for arg in argv if not arg.startswith('--')]
+    flags = {arg for arg in argv if arg.startswith('--')}
+    if len(args) < 2:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+    columns = dict(_parse_column(spec) for spec in args[1:])
+    stats = StreamStats()
+    results = validate_csv(args[0], columns, header='--header' in flags,
+                           invalid_only='--invalid-only' in flags, stats=stats)
+    for row_number, row, failed in results:
+        if failed:
+            print(f'row {row_number}: invalid {", ".join(map(str, failed))}')
+    print(stats, file=sys.stderr)
+    return 1 if stats.invalid_rows else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import async_validators
+from async_validators import avalidate_csv, avalidate_many, avalidate_rows
+from regex_validators import Validator, validate_many
+from stream_validators import StreamStats
+
+ROWS = ["(253)123-4567", "(000)000-0000", "253-123-4567", "abc"] * 2000
+
+def _collect(agen):
+    async def run():
+        return [item async for item in agen]
+    return asyncio.run(run())
+
+def test_async_many_matches_serial():
+    assert asyncio.run(avalidate_many('phone', ROWS, chunk_size=1500)) == validate_many('phone', ROWS)
+
+def test_async_many_small_input_inline():
+    assert asyncio.run(avalidate_many('ssn', ["123-45-6789", "000-00-0000"])) == bytearray([1, 0])
+
+def test_async_many_custom_executor():
+    with ThreadPoolExecutor(2) as executor:
+        result = asyncio.run(avalidate_many('phone', ROWS, executor=executor, chunk_size=999))
+    assert result == validate_many('phone', ROWS)
+
+def test_async_many_unregistered_validator():
+    digits = Validator('test_async_digits', r'^\d+$')
+    rows = ["123", "12a"] * 1000
+    assert asyncio.run(avalidate_many(digits, rows, chunk_size=300)) == bytearray([1, 0]) * 1000
+
+def test_async_many_unknown_validator():
+    with pytest.raises(KeyError):
+        asyncio.run(avalidate_many('nope', ROWS))
+
+def test_async_many_cancel_stops_remaining_chunks(monkeypatch):
+    started = []
+    original = async_validators._validate_chunk
+
+    def counted_chunk(kind, rows):
+        started.append(len(rows))
+        return original(kind, rows)
+
+    async def run():
+        task = asyncio.ensure_future(avalidate_many('phone', ROWS, chunk_size=100))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.05)
+
+    monkeypatch.setattr(async_validators, '_validate_chunk', counted_chunk)
+    asyncio.run(run())
+    assert len(started) < len(ROWS) // 100
+
+def test_async_rows_sync_source():
+    rows = [["Row", "123-45-6789"], ["Row", "666-12-3456"], ["Row"]] * 10
+    items = _collect(avalidate_rows(rows, {1: 'ssn'}, invalid_only=True, chunk_rows=4))
+    assert [number for number, _, _ in items] == [n for n in range(1, 31) if n % 3 != 1]
+    assert items[0] == (2, ["Row", "666-12-3456"], (1,))
+
+def test_async_rows_async_source():
+    async def rows():
+        for i in range(2500):
+            yield ["2400" if i % 5 == 0 else "1200"]
+    items = _collect(avalidate_rows(rows(), {0: 'military_time'}, invalid_only=True, chunk_rows=1200))
+    assert [number for number, _, _ in items] == list(range(1, 2501, 5))
+
+def test_async_rows_backpressure():
+    pulled = []
+
+    def source():
+        for i in range(100):
+            pulled.append(i)
+            yield ["1200"]
+
+    async def run():
+        agen = avalidate_rows(source(), {0: 'military_time'}, chunk_rows=10)
+        first = await agen.__anext__()
+        await agen.aclose()
+        return first
+
+    assert asyncio.run(run()) == (1, ["1200"], ())
+    assert len(pulled) == 10
+
+def test_async_csv_with_header(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("name,ssn\nA,123-45-6789\nB,666-12-3456\n")
+    stats = StreamStats()
+    items = _collect(avalidate_csv(path, {'ssn': 'ssn'}, header=True, invalid_only=True, stats=stats))
+    assert items == [(3, ["B", "666-12-3456"], ('ssn',))]
+    assert (stats.rows, stats.invalid_rows) == (2, 1)
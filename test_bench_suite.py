@@ -0,0 +1,83 @@
+import json
+import pytest
+import regex_validators
+from bench_suite import (IMPORT_KEY, LONG_LENGTH, SHAPES, VALIDATOR_NAMES, compare, format_results, main,
+                         make_dataset, merge_best, run_suite)
+
+def _run(results):
+    return {'meta': {}, 'results': {'ssn/valid': dict(results)}}
+
+BASE = _run({'latency_p50_ns': 1000, 'latency_p99_ns': 2000, 'rows_per_sec': 100_000, 'peak_kib': 100})
+
+# --- DATASETS ---
+def test_datasets_cover_every_validator():
+    assert set(VALIDATOR_NAMES) == {name for name in regex_validators.VALIDATORS
+                                    if name not in ('date_dmy', 'date_iso')}
+
+def test_datasets_are_reproducible():
+    assert make_dataset('phone', 'near_miss', 50) == make_dataset('phone', 'near_miss', 50)
+    assert make_dataset('phone', 'valid', 50) != make_dataset('phone', 'valid', 50, seed=1)
+
+@pytest.mark.parametrize('name', VALIDATOR_NAMES)
+def test_valid_datasets_are_valid(name):
+    validator = regex_validators.get_validator(name)
+    assert all(map(validator, make_dataset(name, 'valid', 300)))
+
+@pytest.mark.parametrize('name', VALIDATOR_NAMES)
+def test_near_miss_datasets_are_rejected(name):
+    validator = regex_validators.get_validator(name)
+    assert sum(map(validator, make_dataset(name, 'near_miss', 300))) <= 15
+
+@pytest.mark.parametrize('name', VALIDATOR_NAMES)
+def test_long_inputs_are_long(name):
+    for shape in ('adversarial', 'long'):
+        rows = make_dataset(name, shape, 20)
+        assert len(rows) == 20
+        assert min(map(len, rows)) >= min(LONG_LENGTH, regex_validators.MAX_EMAIL_LENGTH)
+
+def test_unknown_shape():
+    with pytest.raises(ValueError):
+        make_dataset('ssn', 'huge', 10)
+
+# --- RESULTS ---
+def test_run_suite_metrics():
+    results = run_suite(['ssn'], rows=50, shapes=SHAPES, import_runs=0)
+    assert list(results['results']) == [f'ssn/{shape}' for shape in SHAPES]
+    for metrics in results['results'].values():
+        assert set(metrics) == {'latency_p50_ns', 'latency_p99_ns', 'rows_per_sec', 'peak_kib'}
+        assert metrics['latency_p99_ns'] >= metrics['latency_p50_ns'] > 0
+    assert json.loads(json.dumps(results)) == results
+
+def test_merge_best_keeps_best_values():
+    slower = _run({'latency_p50_ns': 1500, 'latency_p99_ns': 1800, 'rows_per_sec': 90_000, 'peak_kib': 90})
+    merged = merge_best([BASE, slower])
+    assert merged['results']['ssn/valid'] == {'latency_p50_ns': 1000, 'latency_p99_ns': 1800,
+                                              'rows_per_sec': 100_000, 'peak_kib': 90}
+    assert merged['meta']['processes'] == 2
+
+# --- COMPARE ---
+def test_compare_flags_regressions():
+    current = _run({'latency_p50_ns': 1400, 'latency_p99_ns': 2100, 'rows_per_sec': 70_000, 'peak_kib': 100})
+    assert compare(BASE, current) == [('ssn/valid', 'latency_p50_ns', 1000, 1400),
+                                      ('ssn/valid', 'rows_per_sec', 100_000, 70_000)]
+    assert compare(BASE, current, threshold=0.5) == []
+
+def test_compare_ignores_improvements_and_noise():
+    faster = _run({'latency_p50_ns': 500, 'latency_p99_ns': 1000, 'rows_per_sec': 200_000, 'peak_kib': 50})
+    assert compare(BASE, faster) == []
+    tiny = _run({'latency_p50_ns': 20, 'latency_p99_ns': 40, 'rows_per_sec': 100_000, 'peak_kib': 1})
+    assert compare(tiny, _run({'latency_p50_ns': 60, 'latency_p99_ns': 200, 'rows_per_sec': 100_000,
+                               'peak_kib': 10})) == []
+
+def test_compare_skips_missing_pairs():
+    assert compare({'meta': {}, 'results': {}}, BASE) == []
+
+def test_main_rejects_unknown_validator(capsys):
+    assert main(['nope']) == 2
+    assert 'unknown validator' in capsys.readouterr().out
+
+def test_run_suite_records_import_time():
+    results = run_suite(['ssn'], rows=10, shapes=('valid',), import_runs=1)
+    imported = results['results'][IMPORT_KEY]
+    assert imported['total_us'] >= imported['self_us'] > 0
+    assert 'import regex_validators' in format_results(results)
@@ -0,0 +1,123 @@
+import re
+import sys
+
+import pytest
+import regex_validators
+from column_validators import _re2_pattern, column_kernel, validate_arrow, validate_series
+from regex_validators import VALIDATORS, PasswordPolicy, Validator, validate_many
+
+ROWS = ["0000", "2359\n", "2360", "$1,234.56", "$1234.5", "google.com", "http://a.b.example.org/x y",
+        "-bad.com", "123-45-6789", "123 45 6789", "123456789", "123-45 6789", "123-456789",
+        "000-12-3456", "666-12-3456", "900-12-3456", "123-00-4567", "123-45-0000", "123-45-6789\n",
+        "123-45-6789\n\n", "١٢٣-45-6789", "123\x1c45\x1c6789", "(253)123-4567", "253\x0b123\x0b4567",
+        "(000)123-4567", "(253123-4567", "linda@uw.edu", "a@b.c", "Smith, John, Q.", "smith, John",
+        "123 Main St", "123  Main St", "Seattle, WA 98101", "Seattle, XX 98101", "Seattle,\x0bWA 98101",
+        "2/29/2024", "2/29/2023", "02-29-1900", "02/29/2000", "12-31/2024", "13/01/2024", "31/12/1999",
+        "2024-02-29", "2023-02-29", "Ab1!Cd2@Ef", "abcd1!ABCD", "Ab1!Cd2@E", "ÀBc!1xxxxx", "Ab1!Cd2@Ef\n",
+        "union", "union\n", "action", "ion", "", "\n", "x" * 3000, "http://" + "a" * 2100 + ".com"]
+
+def _expected(validator, rows):
+    return [False if row is None else validator(row) for row in rows]
+
+# --- PYARROW ---
+
+def test_arrow_matches_validators_for_every_kind():
+    pa = pytest.importorskip('pyarrow')
+    rows = ROWS + [None]
+    for name, validator in VALIDATORS.items():
+        assert validate_arrow(name, pa.array(rows)).to_pylist() == _expected(validator, rows), name
+
+def test_arrow_matches_validators_on_mutated_rows():
+    pa = pytest.importorskip('pyarrow')
+    import random
+    rng = random.Random(21)
+    rows = []
+    for _ in range(2000):
+        chars = list(rng.choice(ROWS[:-2]))
+        for _ in range(rng.randint(1, 2)):
+            if chars:
+                chars[rng.randrange(len(chars))] = rng.choice("0123456789-/ ()\n\x0b,$.@aZ")
+        rows.append("".join(chars))
+    for name, validator in VALIDATORS.items():
+        assert validate_arrow(name, pa.array(rows)).to_pylist() == _expected(validator, rows), name
+
+def test_arrow_chunked_dictionary_and_large_string():
+    pa = pytest.importorskip('pyarrow')
+    expected = _expected(regex_validators.SSN, ROWS)
+    chunked = pa.chunked_array([ROWS[:10], ROWS[10:]])
+    assert validate_arrow('ssn', chunked).to_pylist() == expected
+    assert validate_arrow('ssn', pa.array(ROWS).dictionary_encode()).to_pylist() == expected
+    assert validate_arrow('ssn', pa.array(ROWS, pa.large_string())).to_pylist() == expected
+
+def test_arrow_nulls_and_empty():
+    pa = pytest.importorskip('pyarrow')
+    assert validate_arrow('phone', pa.array([None, None])).to_pylist() == [False, False]
+    assert validate_arrow('phone', pa.array([None, "253-123-4567"])).to_pylist() == [False, True]
+    assert validate_arrow('phone', pa.array([], pa.string())).to_pylist() == []
+
+def test_arrow_rejects_non_string_arrays():
+    pa = pytest.importorskip('pyarrow')
+    with pytest.raises(TypeError):
+        validate_arrow('ssn', pa.array([1, 2]))
+
+def test_arrow_follows_reloaded_reference_data():
+    pa = pytest.importorskip('pyarrow')
+    try:
+        regex_validators.install_reference_data(regex_validators.ReferenceData(["999"], ["ZZ"]))
+        assert validate_arrow('phone', pa.array(["(999)123-4567", "(253)123-4567"])).to_pylist() == [True, False]
+        assert validate_arrow('city_state_zip', pa.array(["Oz, ZZ 12345", "Oz, WA 12345"])).to_pylist() == [True, False]
+    finally:
+        regex_validators.install_reference_data(regex_validators.DEFAULT_REFERENCE_DATA)
+
+def test_arrow_custom_validators():
+    pa = pytest.importorskip('pyarrow')
+    rows = ["ABCD", "ab12", "aa", "ab", "12", "13", "ffff\n", "ǅǅ", "4242", None]
+    custom = [
+        Validator('test_hex', r'^[a-f0-9]{4}$', flags=re.IGNORECASE),
+        Validator('test_pair', r'^(\w)\1$'),
+        Validator('test_even', r'^\d+$', lambda m: int(m.group()) % 2 == 0),
+        Validator('test_pin', r'.*', flags=re.DOTALL, fast=PasswordPolicy(4, ('digit',), None, '')),
+    ]
+    for validator in custom:
+        assert validate_arrow(validator, pa.array(rows)).to_pylist() == _expected(validator, rows), validator
+
+def test_column_kernels_cover_every_builtin():
+    assert all(column_kernel(name) is not None for name in VALIDATORS)
+    assert column_kernel(Validator('test_pair', r'^(\w)\1$')) is None
+    assert column_kernel(Validator('test_even', r'^\d+$', lambda m: True)) is None
+
+def test_re2_pattern_rewrites():
+    assert _re2_pattern(r'^\d\s[\s-]$', 0) == r'^\d[\t\n\x0b\x0c\r ][\t\n\x0b\x0c\r -](?:\n?$)'
+    assert _re2_pattern(r'^[$]x$', re.IGNORECASE) == r'(?i)^[$]x(?:\n?$)'
+    assert _re2_pattern(r'^(a)\1$', 0) is None
+    assert _re2_pattern(r'^(?!0)\d$', 0) is None
+
+# --- PANDAS ---
+
+def test_series_matches_validators():
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('pyarrow')
+    rows = ROWS + [None]
+    for dtype in (object, pd.StringDtype('python'), pd.StringDtype('pyarrow'), 'category'):
+        series = pd.Series(rows, dtype=dtype)
+        for name, validator in VALIDATORS.items():
+            assert validate_series(name, series).tolist() == _expected(validator, rows), (name, dtype)
+
+def test_series_keeps_index_and_name():
+    pd = pytest.importorskip('pandas')
+    series = pd.Series(["253-123-4567", None, "x"], index=[7, 3, 7], name='phone')
+    result = validate_series('phone', series)
+    assert result.dtype == bool and result.name == 'phone' and list(result.index) == [7, 3, 7]
+    assert result.tolist() == [True, False, False]
+
+def test_series_without_pyarrow(monkeypatch):
+    pd = pytest.importorskip('pandas')
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    series = pd.Series(ROWS + [None], dtype=object)
+    assert validate_series('date', series).tolist() == _expected(regex_validators.DATE, ROWS) + [False]
+
+def test_series_dataframe_column():
+    pd = pytest.importorskip('pandas')
+    frame = pd.DataFrame({'ssn': ["123-45-6789", "000-12-3456"], 'phone': ["(253)123-4567", "(000)123-4567"]})
+    assert (validate_series('ssn', frame['ssn']) & validate_series('phone', frame['phone'])).tolist() == [True, False]
+    assert list(validate_many('ssn', frame['ssn'])) == [1, 0]
@@ -0,0 +1,185 @@
+import random
+import re
+import threading
+
+import pytest
+import incremental_validators
+import regex_validators
+from incremental_validators import COMPLETE, DEAD, VIABLE, IncrementalValidator, prefix_status
+from regex_validators import VALIDATORS, PasswordPolicy, Validator
+
+ROWS = ["0000", "2359\n", "$1,234.56", "$1234.5", "google.com", "google.com/x\ny", "123-45-6789",
+        "123 45 6789", "123-45 6789", "666-12-3456", "123-45-6789\n", "١٢٣-45-6789", "(253)123-4567",
+        "253 123 4567", "(000)123-4567", "(253)123-4567\n", "linda@uw.edu", "Smith, John, Q.",
+        "123 Main St", "Seattle, WA 98101", "2/29/2024", "2/29/2023", "12-31/2024", "2024-02-29",
+        "31/12/1999", "Ab1!Cd2@Ef", "Ab1!Cd2@Ef\n", "union", "action", ""]
+
+def _statuses(kind, text):
+    typing = IncrementalValidator(kind)
+    return [typing.status] + [typing.feed(char) for char in text]
+
+# --- STATUS ---
+
+def test_phone_as_typed():
+    assert _statuses('phone', "(253)123-4567") == [VIABLE] * 13 + [COMPLETE]
+    assert _statuses('phone', "(25a") == [VIABLE] * 4 + [DEAD]
+    assert prefix_status('phone', "253-123-45678") == DEAD
+
+def test_date_as_typed():
+    assert _statuses('date', "2/29/2024")[-2:] == [VIABLE, COMPLETE]
+    assert prefix_status('date', "2/29/2023") == DEAD
+    assert prefix_status('date', "2/29-") == DEAD
+    assert prefix_status('date', "02-29-") == VIABLE
+
+def test_currency_as_typed():
+    assert _statuses('currency', "$1,234.56") == [VIABLE] * 9 + [COMPLETE]
+    assert prefix_status('currency', "$123") == VIABLE
+    assert prefix_status('currency', "$1234") == DEAD
+    assert prefix_status('currency', "1") == DEAD
+
+def test_complete_text_can_keep_growing():
+    assert prefix_status('url', "google.com") == COMPLETE
+    assert prefix_status('url', "google.com/") == COMPLETE
+    assert prefix_status('ssn', "123-45-6789") == COMPLETE
+    assert prefix_status('ssn', "123-45-67890") == DEAD
+
+def test_rule_failure_with_nothing_left_to_type_is_dead():
+    assert prefix_status('phone', "(000)123-4567") == DEAD
+    assert prefix_status('phone', "(000)123-4567\n") == DEAD
+
+def test_rules_make_prefixes_dead_as_soon_as_typed():
+    for kind, text in [('phone', "(000"), ('phone', "(999"), ('date', "13"), ('date', "02/30/"),
+                       ('date_dmy', "31/04/"), ('date_iso', "2023-02-29"), ('ssn', "666-"),
+                       ('ssn', "000"), ('password', "abcd"), ('city_state_zip', "Seattle, WX")]:
+        assert prefix_status(kind, text) == DEAD, (kind, text)
+    assert prefix_status('date', "2/29/19") == VIABLE
+    assert prefix_status('ion_words', "action") == VIABLE  # "action\n" is valid
+
+def test_rules_read_digits_of_any_script():
+    assert prefix_status('ssn', "\u0660\u0660\u0660") == DEAD
+    assert prefix_status('date', "\u0662/\u0662\u0669/\u0662\u0660\u0662\u0664") == COMPLETE
+
+def test_length_caps_count_characters():
+    assert prefix_status('url', "a" * 2045) == VIABLE  # room for ".co"
+    assert prefix_status('url', "a" * 2046) == DEAD
+    assert prefix_status('url', "a" * 2044 + ".co") == COMPLETE
+    assert prefix_status('url', "google.com/" + "a" * 2100) == DEAD
+    assert prefix_status('email', "a@" + "b" * 250) == DEAD
+
+def test_folded_rules_never_revalidate(monkeypatch):
+    def whole_text_check(text):
+        raise AssertionError('validated the whole text')
+    monkeypatch.setattr(regex_validators.URL, 'check', whole_text_check)
+    monkeypatch.setattr(regex_validators.PHONE, 'check', whole_text_check)
+    typing = IncrementalValidator('url', "google.com/")
+    assert [typing.feed("x") for _ in range(3000)][-1] == DEAD
+    assert typing.backspace(1000) == COMPLETE
+    assert prefix_status('phone', "(253)123-4567") == COMPLETE
+
+def test_complete_matches_validators_for_every_kind():
+    for name, validator in VALIDATORS.items():
+        for row in ROWS:
+            assert (prefix_status(name, row) == COMPLETE) == validator(row), (name, row)
+
+def test_valid_text_is_never_dead_on_the_way():
+    rng = random.Random(24)
+    for name, validator in VALIDATORS.items():
+        for _ in range(300):
+            chars = list(rng.choice(ROWS))
+            for _ in range(rng.randint(0, 2)):
+                if chars:
+                    chars[rng.randrange(len(chars))] = rng.choice("0123456789-/ ()\n,$.@aZ")
+            text = "".join(chars)
+            statuses = _statuses(name, text)
+            assert (statuses[-1] == COMPLETE) == validator(text), (name, text)
+            if validator(text):
+                assert DEAD not in statuses, (name, text)
+
+# --- EDITING ---
+
+def test_backspace_restores_earlier_status():
+    typing = IncrementalValidator('phone', "(253)123-456")
+    assert typing.feed("78") == DEAD
+    assert typing.backspace() == COMPLETE and typing.text == "(253)123-4567"
+    assert typing.backspace(5) == VIABLE and typing.text == "(253)123"
+    assert typing.backspace(99) == VIABLE and typing.text == ""
+
+def test_reset_and_paste():
+    typing = IncrementalValidator('date')
+    assert typing.feed("12/31/1999") == COMPLETE
+    assert typing.reset() == VIABLE and typing.text == ""
+    assert "'date'" in repr(typing)
+
+def test_follows_reloaded_reference_data():
+    try:
+        regex_validators.install_reference_data(regex_validators.ReferenceData(["999"], ["ZZ"]))
+        assert prefix_status('phone', "(999)123-4567") == COMPLETE
+        assert prefix_status('phone', "(253)123-4567") == DEAD
+    finally:
+        regex_validators.install_reference_data(regex_validators.DEFAULT_REFERENCE_DATA)
+
+def test_shared_machine_across_threads():
+    texts = ["(253)123-4567", "2/29/2024", "$1,234.56"] * 20
+    results = []
+
+    def worker(text):
+        kind = {'(': 'phone', '$': 'currency'}.get(text[0], 'date')
+        results.append(prefix_status(kind, text))
+
+    threads = [threading.Thread(target=worker, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [COMPLETE] * len(texts)
+
+# --- CUSTOM PATTERNS ---
+
+def test_custom_validators():
+    hex4 = Validator('test_hex', r'^[a-f0-9]{4}$', flags=re.IGNORECASE)
+    assert prefix_status(hex4, "AB") == VIABLE and prefix_status(hex4, "ABCD") == COMPLETE
+    assert prefix_status(hex4, "ABCDE") == DEAD
+    open_ended = Validator('test_prefix', r'ab')
+    assert prefix_status(open_ended, "abzzz") == COMPLETE
+
+def test_custom_password_policy():
+    pin = PasswordPolicy(min_length=4, required=('digit',), max_lower_run=None).register('test_pin')
+    try:
+        assert prefix_status(pin, "abc") == VIABLE
+        assert prefix_status(pin, "abcd1") == COMPLETE
+    finally:
+        del VALIDATORS['test_pin']
+
+def test_custom_rule_is_viable_for_the_pattern_only():
+    short = Validator('test_short', r'^\d+$', rule=lambda match: len(match.group()) < 3)
+    assert prefix_status(short, "12") == COMPLETE
+    # No continuation of "123" passes the rule, but the pattern could still match
+    assert prefix_status(short, "123") == VIABLE
+
+def test_unsupported_patterns_raise():
+    with pytest.raises(ValueError):
+        IncrementalValidator(Validator('test_pair', r'^(\w)\1$'))
+    with pytest.raises(ValueError):
+        IncrementalValidator(Validator('test_nonzero', r'^(?!0)\d+$'))
+    with pytest.raises(ValueError):
+        IncrementalValidator(Validator('test_word', r'^\bx$'))
+
+class _ChangedParser:
+    # re's private parser after an incompatible change
+    @staticmethod
+    def parse(pattern, flags=0):
+        raise TypeError('parse() takes 1 positional argument')
+
+def test_falls_back_to_full_matches_without_the_parser(monkeypatch):
+    try:
+        for parser in (None, _ChangedParser):
+            monkeypatch.setattr(incremental_validators, '_sre', parser)
+            incremental_validators._machine.cache_clear()
+            assert _statuses('phone', "(253)123-4567") == [VIABLE] * 13 + [COMPLETE]
+            # Nothing is DEAD without the machine, but COMPLETE still agrees
+            assert prefix_status('phone', "(000") == VIABLE
+            for name, validator in VALIDATORS.items():
+                for row in ROWS:
+                    assert (prefix_status(name, row) == COMPLETE) == validator(row), (name, row)
+    finally:
+        incremental_validators._machine.cache_clear()
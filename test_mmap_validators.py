@@ -0,0 +1,83 @@
+import pytest
+import regex_validators
+from mmap_validators import invalid_line_offsets, line_ranges, validate_file
+from regex_validators import VALIDATORS
+
+LINES = [b"(253)123-4567", b"(000)000-0000", b"253-123-4567", b"", b"253.123.4567", b"2531234567"]
+DATA = b"\n".join(LINES) + b"\n"
+
+@pytest.fixture
+def restore_reference_data():
+    yield
+    regex_validators.install_reference_data(regex_validators.DEFAULT_REFERENCE_DATA)
+
+def _offsets(lines, bad):
+    result, offset = [], 0
+    for index, line in enumerate(lines):
+        if index in bad:
+            result.append(offset)
+        offset += len(line) + 1
+    return result
+
+def test_mmap_invalid_phone_lines():
+    assert list(invalid_line_offsets('phone', DATA)) == _offsets(LINES, {1, 3, 4})
+
+def test_mmap_no_trailing_newline():
+    assert list(invalid_line_offsets('phone', DATA[:-1])) == _offsets(LINES, {1, 3, 4})
+
+def test_mmap_empty_input():
+    assert list(invalid_line_offsets('ssn', b"")) == []
+
+def test_mmap_ssn_rules_in_pattern():
+    lines = [b"123-45-6789", b"000-12-3456", b"666-12-3456", b"900-12-3456", b"123-00-4567",
+             b"123-45-0000", b"246813579", b"123-45 6789"]
+    assert list(invalid_line_offsets('ssn', b"\n".join(lines))) == _offsets(lines, {1, 2, 3, 4, 5, 7})
+
+def test_mmap_matches_validators_for_every_kind():
+    lines = [b"0000", b"$1,234.56", b"google.com", b"123 45 6789", b"253 123 4567", b"linda@uw.edu",
+             b"Smith, John", b"123 Main St", b"Seattle, WA 98101", b"Seattle,\nWA 98101", b"2/29/2024",
+             b"2024-02-29", b"31/12/1999", b"Ab1!Cd2@Ef", b"union", b"253", b"123 4567",
+             "(253)123-456٣".encode(), b"123\x1c45\x1c6789", b"1200\r", b"\xff"]
+    data = b"\n".join(lines)
+    for name, validator in VALIDATORS.items():
+        expected, offset = [], 0
+        for line in data.split(b"\n"):
+            if not validator.check_bytes(line):
+                expected.append(offset)
+            offset += len(line) + 1
+        assert list(invalid_line_offsets(name, data)) == expected, name
+
+def test_mmap_pattern_cannot_span_lines():
+    # "253" + newline + "1234567" would be one phone number if \s could match \n
+    data = b"253\n1234567\n"
+    assert list(invalid_line_offsets('phone', data)) == [0, 4]
+
+def test_mmap_follows_reloaded_area_codes(restore_reference_data):
+    regex_validators.install_reference_data(regex_validators.ReferenceData(["999"], ["WA"]))
+    assert list(invalid_line_offsets('phone', b"(999)123-4567\n(253)123-4567\n")) == [14]
+
+def test_mmap_line_ranges_are_aligned():
+    ranges = line_ranges(DATA, 4)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(DATA)
+    for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert end == next_start and DATA[end - 1:end] == b"\n"
+    joined = [offset for start, end in ranges for offset in invalid_line_offsets('phone', DATA, start, end)]
+    assert joined == list(invalid_line_offsets('phone', DATA))
+
+def test_mmap_line_ranges_more_parts_than_lines():
+    assert line_ranges(b"a\nb", 10) == [(0, 2), (2, 3)]
+    assert line_ranges(b"", 3) == []
+
+def test_mmap_validate_file(tmp_path):
+    path = tmp_path / "phones.txt"
+    path.write_bytes(DATA)
+    assert list(validate_file('phone', path)) == _offsets(LINES, {1, 3, 4})
+
+def test_mmap_validate_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert list(validate_file('phone', path)) == []
+
+def test_mmap_unknown_validator():
+    with pytest.raises(KeyError):
+        invalid_line_offsets('nope', DATA)
@@ -0,0 +1,79 @@
+import pytest
+from parallel_validators import ValidatorPool, chunk_size_for, shutdown_pool, validate_many_parallel
+from mmap_validators import validate_file
+from regex_validators import Validator, get_validator, validate_many
+
+ROWS = ["(253)123-4567", "(000)000-0000", "253-123-4567", "abc"] * 1000
+
+@pytest.fixture(scope="module")
+def pool():
+    with ValidatorPool(workers=2) as pool:
+        yield pool
+
+def test_parallel_matches_serial(pool):
+    assert pool.validate_many('phone', ROWS, chunk_size=500) == validate_many('phone', ROWS)
+
+def test_parallel_keeps_input_order(pool):
+    rows = ["0000"] * 700 + ["2400"] * 700 + ["1200"]
+    assert pool.validate_many('military_time', rows, chunk_size=300) == bytearray([1] * 700 + [0] * 700 + [1])
+
+def test_parallel_accepts_validator_object(pool):
+    assert pool.validate_many(get_validator('ssn'), ["123-45-6789", "000-00-0000"], chunk_size=1) == bytearray([1, 0])
+
+def test_parallel_rejects_unregistered_or_shadowed_validators(pool):
+    with pytest.raises(ValueError, match='registered'):
+        pool.validate_many(Validator('test_digits', r'^\d+$'), ["1"] * 10, chunk_size=5)
+    with pytest.raises(ValueError, match='registered'):
+        pool.validate_file(Validator('ssn', r'^\d+$'), "unused.txt")
+
+def test_parallel_small_input_runs_inline(pool):
+    assert pool.validate_many('email', ["linda@uw.edu", "user@"]) == bytearray([1, 0])
+
+def test_parallel_unknown_validator(pool):
+    with pytest.raises(KeyError):
+        pool.validate_many('nope', ["x"])
+
+def test_parallel_chunk_size_for():
+    assert chunk_size_for(1_000_000, 4) == 62_500
+    assert chunk_size_for(10, 4) == 2_000
+
+def test_parallel_shared_pool():
+    try:
+        assert validate_many_parallel('date', ["2/29/2024", "2/29/2023"]) == bytearray([1, 0])
+    finally:
+        shutdown_pool()
+
+def test_parallel_workers_map_shared_tables(tmp_path):
+    from regex_validators import ReferenceData, write_reference_tables
+    path = tmp_path / "tables.bin"
+    write_reference_tables(path, ReferenceData(["999"], ["WA"]))
+    with ValidatorPool(workers=2, tables_path=str(path)) as pool:
+        result = pool.validate_many('phone', ["(999)123-4567", "(253)123-4567"] * 10, chunk_size=5)
+    assert result == bytearray([1, 0] * 10)
+
+def test_parallel_workers_follow_reloaded_reference_data(tmp_path):
+    from regex_validators import DEFAULT_REFERENCE_DATA, ReferenceData, install_reference_data, write_reference_tables
+    path = tmp_path / "tables.bin"
+    write_reference_tables(path, DEFAULT_REFERENCE_DATA)
+    rows = ["(999)123-4567", "(253)123-4567"] * 10
+    with ValidatorPool(workers=2, tables_path=str(path)) as pool:
+        assert pool.validate_many('phone', rows, chunk_size=5) == bytearray([0, 1] * 10)
+        try:
+            install_reference_data(ReferenceData(["999"], ["WA"]))
+            assert pool.validate_many('phone', rows, chunk_size=5) == bytearray([1, 0] * 10)
+        finally:
+            install_reference_data(DEFAULT_REFERENCE_DATA)
+        assert pool.validate_many('phone', rows, chunk_size=5) == bytearray([0, 1] * 10)
+
+def test_parallel_validate_file(pool, tmp_path):
+    path = tmp_path / "ssn.txt"
+    lines = ["123-45-6789", "666-12-3456", "246813579", "123-45 6789"] * 500
+    path.write_text("\n".join(lines) + "\n")
+    expected = list(validate_file('ssn', path))
+    assert len(expected) == 1000
+    assert list(pool.validate_file('ssn', path, parts=7)) == expected
+
+def test_parallel_validate_file_small_runs_inline(pool, tmp_path):
+    path = tmp_path / "phones.txt"
+    path.write_text("(253)123-4567\nabc\n")
+    assert list(pool.validate_file('phone', path)) == [14]
@@ -693,4 +693,884 @@ def test_ec_state_invalid_aa():
 def test_ec_state_valid_all_50_states():
     # Test a few more states to confirm
     assert validate_city_state_zip("Austin, TX 78701") == True
-    assert validate_city_state_zip("Portland, OR 97201") == True
\ No newline at end of file
+    assert validate_city_state_zip("Portland, OR 97201") == True
+
+# --- VALIDATOR REGISTRY ---
+from regex_validators import VALIDATORS, Validator, get_validator, register_validator
+
+def test_registry_has_all_twelve_validators():
+    for name in ('military_time', 'currency', 'url', 'ssn', 'phone', 'email',
+                 'roster_name', 'address', 'city_state_zip', 'date', 'password', 'ion_words'):
+        assert isinstance(VALIDATORS[name], Validator)
+
+def test_registry_validator_matches_function():
+    assert get_validator('phone')("(253)123-4567") == validate_phone("(253)123-4567")
+    assert get_validator('phone')("(000)000-0000") == False
+
+def test_registry_patterns_are_compiled():
+    assert get_validator('ssn').regex.match("123-45-6789") is not None
+
+def test_registry_unknown_name():
+    with pytest.raises(KeyError):
+        get_validator('nope')
+
+def test_registry_custom_validator():
+    validator = register_validator('test_zip5', r'^\d{5}$')
+    try:
+        assert get_validator('test_zip5') is validator
+        assert validator("98101") == True
+        assert validator("9810") == False
+    finally:
+        del VALIDATORS['test_zip5']
+
+def test_registry_custom_validator_with_rule():
+    validator = register_validator('test_even', r'^(\d+)$', lambda m: int(m.group(1)) % 2 == 0)
+    try:
+        assert validator("42") == True
+        assert validator("43") == False
+    finally:
+        del VALIDATORS['test_even']
+
+
+# --- BATCH VALIDATION ---
+from regex_validators import validate_many
+
+def test_many_returns_bytearray():
+    assert validate_many('phone', ["(253)123-4567", "(000)000-0000", "253-123-4567"]) == bytearray([1, 0, 1])
+
+def test_many_empty_input():
+    assert validate_many('email', []) == bytearray()
+
+def test_many_accepts_generator():
+    assert validate_many('military_time', (t for t in ["0000", "2400"])) == bytearray([1, 0])
+
+def test_many_accepts_validator_object():
+    assert validate_many(get_validator('ssn'), ["123-45-6789", "666-12-3456"]) == bytearray([1, 0])
+
+def test_many_joined_matches_single_calls():
+    rows = ["$1,234.56", "n/a", "", "$12,34.56", "$0.01"] * 100
+    expected = bytearray(validate_currency(row) for row in rows)
+    assert validate_many('currency', rows, method='joined') == expected
+    assert validate_many('currency', rows, method='auto') == expected
+
+def test_many_joined_applies_rules():
+    rows = ["(253)123-4567", "(000)000-0000", "253 123 4567"]
+    assert validate_many('phone', rows, method='joined') == bytearray([1, 0, 1])
+
+def test_many_state_rule():
+    rows = ["Seattle, WA 98101", "Nowhere, ZZ 99999", "Austin, TX 78701"]
+    assert validate_many('city_state_zip', rows) == bytearray([1, 0, 1])
+
+def test_many_joined_whitespace_cannot_span_rows():
+    # [\s-]? could match the newline joining "253" and "123-4567"
+    rows = ["253", "123-4567", "253-123-4567"]
+    assert validate_many('phone', rows, method='joined') == bytearray([0, 0, 1])
+
+def test_many_joined_rows_with_newlines():
+    assert validate_many('ssn', ["123-45-6789\n", "1\n2"], method='joined') == bytearray([1, 0])
+
+def test_many_joined_rejected_for_whole_string_rules():
+    with pytest.raises(ValueError):
+        validate_many('password', ["Ab1!Cd2@Ef"], method='joined')
+
+def test_many_dedup_matches_single_calls():
+    rows = ["Seattle, WA 98101", "Nowhere, ZZ 99999", "", "Austin, TX 78701\n", "Austin, TX 78701"] * 100
+    expected = bytearray(validate_city_state_zip(row) for row in rows)
+    assert validate_many('city_state_zip', rows, method='dedup') == expected
+    assert validate_many('city_state_zip', rows, method='auto') == expected
+    assert validate_many('password', ["Ab1!Cd2@Ef", "short"] * 2, method='dedup') == bytearray([1, 0, 1, 0])
+
+def test_many_auto_dedups_low_cardinality_columns(monkeypatch):
+    import regex_validators
+    calls = []
+    deduped = regex_validators._many_deduped
+    monkeypatch.setattr(regex_validators, '_many_deduped', lambda v, rows: calls.append(len(rows)) or deduped(v, rows))
+    repeated = [f"user{i % 50}@uw.edu" for i in range(5000)]
+    distinct = [f"user{i}@uw.edu" for i in range(5000)]
+    assert validate_many('email', repeated) == bytearray([1]) * 5000
+    assert validate_many('email', distinct) == bytearray([1]) * 5000
+    assert validate_many('email', repeated[:100]) == bytearray([1]) * 100
+    assert calls == [5000]
+
+def test_many_bad_method():
+    with pytest.raises(ValueError):
+        validate_many('ssn', [], method='fast')
+
+def test_many_as_numpy():
+    np = pytest.importorskip('numpy')
+    result = validate_many('ion_words', ["union", "action"], as_numpy=True)
+    assert result.dtype == np.bool_
+    assert result.tolist() == [True, False]
+
+
+# --- FAST PATHS (differential against the regex) ---
+import itertools
+import random
+
+_FAST_ALPHABET = "0123456789 -:\n٣a"
+
+def test_fast_military_time_matches_regex_exhaustively():
+    validator = get_validator('military_time')
+    for length in range(3, 6):
+        for chars in itertools.product("01234569 :\n٣a", repeat=length):
+            text = ''.join(chars)
+            assert validator(text) == validator.check_regex(text), text
+
+def test_fast_military_time_all_times():
+    for hour in range(100):
+        for minute in range(100):
+            text = f"{hour:02d}{minute:02d}"
+            assert validate_military_time(text) == (hour < 24 and minute < 60), text
+
+def test_fast_ssn_matches_regex_on_edge_cases():
+    validator = get_validator('ssn')
+    cases = ["000-12-3456", "666-12-3456", "899-12-3456", "900-12-3456", "123-00-4567",
+             "123-45-0000", "123-45-6789\n", "123456789\n", "١٢٣456789",
+             "123-45 6789", "123 45-6789", "12345-6789", "123-456789", "", "-", "123-45-678"]
+    for text in cases:
+        assert validator(text) == validator.check_regex(text), text
+
+def test_fast_paths_reject_non_str_like_the_pattern():
+    for validate in (validate_ssn, validate_military_time):
+        for value in (None, 123456789, b"123-45-6789"):
+            with pytest.raises(TypeError):
+                validate(value)
+
+def test_fast_ssn_matches_regex_on_random_input():
+    validator = get_validator('ssn')
+    rng = random.Random(483)
+    for _ in range(20000):
+        digits = [rng.choice("0123456789") for _ in range(9)]
+        sep = rng.choice(["", "-", " "])
+        text = ''.join(digits[:3]) + sep + ''.join(digits[3:5]) + sep + ''.join(digits[5:])
+        # Mutate one position a third of the time
+        if rng.random() < 0.33:
+            pos = rng.randrange(len(text) + 1)
+            text = text[:pos] + rng.choice(_FAST_ALPHABET) + text[pos + rng.randint(0, 1):]
+        assert validator(text) == validator.check_regex(text), text
+
+def test_fast_path_used_by_validate_many():
+    rows = ["0000", "2400", "1٣3٣", "123-45-6789"]
+    assert validate_many('military_time', rows) == bytearray([1, 0, 1, 0])
+
+
+# --- PASSWORD POLICY ---
+import re
+from regex_validators import DEFAULT_PASSWORD_POLICY, PasswordPolicy
+
+def _password_by_regex_scans(text):
+    # The original six-scan implementation, kept as a reference
+    return (len(text) >= 10 and bool(re.search(r'[A-Z]', text)) and bool(re.search(r'[a-z]', text))
+            and bool(re.search(r'\d', text)) and bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', text))
+            and not re.search(r'[a-z]{4,}', text))
+
+def test_policy_matches_regex_scans_on_random_input():
+    rng = random.Random(483)
+    alphabet = "aAbBzZ09!@{}|<> _-~\n٣é"
+    for _ in range(20000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(8, 16)))
+        assert DEFAULT_PASSWORD_POLICY(text) == _password_by_regex_scans(text), text
+
+def test_policy_unicode_digit_counts_as_digit():
+    assert validate_password("AbC!dEf٣gH") == True
+
+def test_policy_custom_min_length():
+    policy = PasswordPolicy(min_length=6)
+    assert policy("Ab1!Cd") == True
+    assert policy("Ab1!C") == False
+
+def test_policy_custom_required_classes():
+    policy = PasswordPolicy(required=('lower', 'digit'), max_lower_run=None)
+    assert policy("password12") == True
+    assert policy("passwordxx") == False
+
+def test_policy_custom_lower_run():
+    assert PasswordPolicy(max_lower_run=5)("ABcdefg1!X") == True
+    assert PasswordPolicy(max_lower_run=4)("ABcdefg1!X") == False
+
+def test_policy_custom_punctuation():
+    policy = PasswordPolicy(punctuation="_")
+    assert policy("Ab1_Cd2_Ef") == True
+    assert policy("Ab1!Cd2@Ef") == False
+
+def test_policy_unknown_class():
+    with pytest.raises(ValueError):
+        PasswordPolicy(required=('symbol',))
+
+def test_policy_register():
+    validator = PasswordPolicy(min_length=4, required=('digit',)).register('test_pin')
+    try:
+        assert validate_many('test_pin', ["1234", "abcd", "12"]) == bytearray([1, 0, 0])
+        assert validator.check_regex("1234") == True
+    finally:
+        del VALIDATORS['test_pin']
+
+
+# --- DATE ENGINE ---
+import datetime
+from regex_validators import check_date, check_dates, validate_date_dmy, validate_date_iso
+
+def _real_date(month, day, year):
+    try:
+        datetime.date(year, month, day)
+        return True
+    except ValueError:
+        return False
+
+def test_date_engine_matches_datetime():
+    for year in (1, 1900, 1999, 2000, 2023, 2024, 2100, 2400, 9999):
+        for month in range(0, 14):
+            for day in range(0, 33):
+                assert check_date(month, day, year) == _real_date(month, day, year), (month, day, year)
+
+def test_date_engine_year_zero_is_leap():
+    assert check_date(2, 29, 0) == True
+    assert validate_date("02/29/0000") == True
+
+def test_date_engine_columns_of_tuples():
+    assert check_dates([(2, 29, 2024), (2, 29, 2023), (4, 31, 2026), (12, 31, 1999)]) == bytearray([1, 0, 0, 1])
+
+def test_date_engine_numpy_columns():
+    np = pytest.importorskip('numpy')
+    dates = np.array([[2, 29, 2024], [2, 29, 2023], [13, 1, 2026], [0, 1, 2026], [12, 31, 1999]])
+    assert check_dates(dates).tolist() == [True, False, False, False, True]
+
+def test_valid_date_iso():
+    assert validate_date_iso("2024-02-29") == True
+    assert validate_date_iso("1999-12-31") == True
+
+def test_invalid_date_iso():
+    assert validate_date_iso("2023-02-29") == False
+    assert validate_date_iso("2024-2-29") == False
+    assert validate_date_iso("2024/02/29") == False
+    assert validate_date_iso("02-29-2024") == False
+
+def test_valid_date_dmy():
+    assert validate_date_dmy("31/12/1999") == True
+    assert validate_date_dmy("29-2-2024") == True
+
+def test_invalid_date_dmy():
+    assert validate_date_dmy("12/31/1999") == False
+    assert validate_date_dmy("29/02/2023") == False
+    assert validate_date_dmy("31/12-1999") == False
+
+
+# --- LOOKUP TABLES ---
+from regex_validators import (AREA_CODE_TABLE, STATE_TABLE, VALID_AREA_CODES, VALID_STATES,
+                              area_code_valid_at, area_codes_valid, state_valid_at, states_valid)
+
+def test_tables_match_sets():
+    assert {f"{code:03d}" for code in range(1000) if AREA_CODE_TABLE[code]} == VALID_AREA_CODES
+    assert sum(STATE_TABLE) == len(VALID_STATES)
+
+def test_tables_area_code_at_offset():
+    record = b"(253)123-4567"
+    assert area_code_valid_at(record, 1) == True
+    assert area_code_valid_at(memoryview(record), 1) == True
+    assert area_code_valid_at(b"(000)", 1) == False
+
+def test_tables_area_code_not_digits():
+    assert area_code_valid_at(b"2a3") == False
+    assert area_code_valid_at(b"25") == False
+
+def test_tables_state_at_offset():
+    record = b"Seattle, WA 98101"
+    assert state_valid_at(record, 9) == True
+    assert state_valid_at(b"ZZ") == False
+    assert state_valid_at(b"wa") == False
+
+def test_tables_area_code_column():
+    assert area_codes_valid([253, 0, 800, 1253, -1]) == bytearray([1, 0, 1, 0, 0])
+
+def test_tables_state_column():
+    assert states_valid([b"WA", b"ZZ", b"DC", b"W"]) == bytearray([1, 0, 1, 0])
+
+def test_tables_numpy_columns():
+    np = pytest.importorskip('numpy')
+    assert area_codes_valid(np.array([253, 0, 1253, -5])).tolist() == [True, False, False, False]
+    letters = np.frombuffer(b"WAZZDCa!", dtype=np.uint8).reshape(-1, 2)
+    assert states_valid(letters).tolist() == [True, False, True, False]
+
+
+# --- REFERENCE DATA ---
+import json as json_module
+import regex_validators
+from regex_validators import (DEFAULT_REFERENCE_DATA, ReferenceData, current_reference_data,
+                              install_reference_data, load_reference_data, map_reference_tables,
+                              reload_reference_data, write_reference_tables)
+
+@pytest.fixture
+def restore_reference_data():
+    yield
+    install_reference_data(DEFAULT_REFERENCE_DATA)
+
+def test_reference_default_installed():
+    assert current_reference_data() is DEFAULT_REFERENCE_DATA
+    assert regex_validators.VALID_AREA_CODES == VALID_AREA_CODES
+
+def test_reference_sets_are_replaced_not_mutated(restore_reference_data):
+    with pytest.raises(AttributeError):
+        regex_validators.VALID_AREA_CODES.add("999")
+    install_reference_data(ReferenceData(regex_validators.VALID_AREA_CODES | {"999"}, regex_validators.VALID_STATES))
+    assert validate_phone("(999)123-4567") == True
+    assert validate_phone("(253)123-4567") == True
+
+def test_reference_reload_json(tmp_path, restore_reference_data):
+    path = tmp_path / "reference.json"
+    path.write_text(json_module.dumps({"area_codes": ["999"], "states": ["ZZ"]}))
+    assert reload_reference_data(path) == True
+    assert validate_phone("(999)123-4567") == True
+    assert validate_phone("(253)123-4567") == False
+    assert validate_city_state_zip("Nowhere, ZZ 99999") == True
+    assert area_code_valid_at(b"999") == True
+
+def test_reference_reload_csv(tmp_path, restore_reference_data):
+    path = tmp_path / "reference.csv"
+    path.write_text("area_code,253\nstate,WA\n\n")
+    reload_reference_data(path)
+    assert current_reference_data().area_codes == {"253"}
+    assert validate_city_state_zip("Austin, TX 78701") == False
+
+def test_reference_reload_only_if_changed(tmp_path, restore_reference_data):
+    path = tmp_path / "reference.csv"
+    path.write_text("area_code,253\nstate,WA\n")
+    assert reload_reference_data(path, only_if_changed=True) == True
+    assert reload_reference_data(path, only_if_changed=True) == False
+
+def test_reference_malformed_entries(tmp_path):
+    path = tmp_path / "reference.csv"
+    path.write_text("area_code,25\nstate,wa\n")
+    with pytest.raises(ValueError):
+        load_reference_data(path)
+
+def test_reference_bad_load_keeps_installed_data(tmp_path):
+    path = tmp_path / "reference.csv"
+    path.write_text("zip,98101\n")
+    with pytest.raises(ValueError):
+        reload_reference_data(path)
+    assert current_reference_data() is DEFAULT_REFERENCE_DATA
+
+def test_reference_mapped_tables(tmp_path, restore_reference_data):
+    path = tmp_path / "tables.bin"
+    write_reference_tables(path, ReferenceData(["253", "800"], ["WA"]))
+    data = map_reference_tables(path)
+    assert data.area_codes == {"253", "800"}
+    assert data.states == {"WA"}
+    install_reference_data(data)
+    assert validate_phone("(800)555-1234") == True
+    assert validate_phone("(206)555-1234") == False
+    assert state_valid_at(b"WA") == True
+
+def test_reference_mapped_tables_bad_file(tmp_path):
+    path = tmp_path / "tables.bin"
+    path.write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        map_reference_tables(path)
+
+
+# --- RESULT CACHE ---
+from regex_validators import ResultCache, cache_info, disable_cache, enable_cache
+
+@pytest.fixture
+def email_cache():
+    cache = enable_cache('email', maxsize=2, max_length=20)
+    yield cache
+    disable_cache('email')
+
+def test_cache_disabled_by_default():
+    assert cache_info('url') is None
+
+def test_cache_counts_hits_and_misses(email_cache):
+    assert validate_email("linda@uw.edu") == True
+    assert validate_email("linda@uw.edu") == True
+    assert validate_email("user@domain") == False
+    info = cache_info('email')
+    assert (info['hits'], info['misses'], info['evictions']) == (1, 2, 0)
+
+def test_cache_evicts_least_recently_used(email_cache):
+    for text in ("a@b.com", "c@d.com", "a@b.com", "e@f.com", "a@b.com"):
+        validate_email(text)
+    info = cache_info('email')
+    assert info['evictions'] == 1
+    assert info['hits'] == 2
+    assert info['size'] == 2
+
+def test_cache_skips_long_inputs(email_cache):
+    long_email = "x" * 30 + "@uw.edu"
+    assert validate_email(long_email) == True
+    info = cache_info('email')
+    assert info['uncached'] == 1
+    assert info['size'] == 0
+
+def test_cache_used_by_validate_many(email_cache):
+    assert validate_many('email', ["linda@uw.edu"] * 3) == bytearray([1, 1, 1])
+    assert cache_info('email')['hits'] == 2
+
+def test_cache_keeps_fast_path():
+    enable_cache('ssn')
+    try:
+        assert validate_ssn("123-45-6789") == True
+        assert validate_ssn("1٢3-45-6789") == True
+    finally:
+        disable_cache('ssn')
+    assert get_validator('ssn').cache is None
+
+def test_cache_cleared_on_reference_reload(restore_reference_data):
+    enable_cache('phone')
+    try:
+        assert validate_phone("(253)123-4567") == True
+        install_reference_data(ReferenceData(["800"], ["WA"]))
+        assert validate_phone("(253)123-4567") == False
+    finally:
+        disable_cache('phone')
+
+def test_cache_bad_size():
+    with pytest.raises(ValueError):
+        ResultCache(validate_email, maxsize=0)
+
+
+# --- LINEAR-TIME URL AND EMAIL ---
+from regex_validators import MAX_EMAIL_LENGTH, MAX_URL_LENGTH
+
+def _mutations(seeds, alphabet, count, seed=483):
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = list(rng.choice(seeds))
+        for _ in range(rng.randint(0, 4)):
+            pos = rng.randint(0, len(text))
+            action = rng.random()
+            if action < 0.4:
+                text.insert(pos, rng.choice(alphabet))
+            elif text and action < 0.7:
+                text[min(pos, len(text) - 1)] = rng.choice(alphabet)
+            elif text:
+                del text[min(pos, len(text) - 1)]
+        yield ''.join(text)
+
+def test_linear_url_matches_regex():
+    validator = get_validator('url')
+    # Long seeds so that the parser (not the short-input regex) does the work
+    long_label = "sub-domain-" * 4 + "x"
+    seeds = ["google.com", "https://www.google.com/search", "http://a-b.c-d.co/x/y?z=1", "a.bc", "1.2.3.de/"]
+    seeds += [f"{long_label}.{seed}" for seed in seeds] + [f"https://{long_label}.{long_label}.com/{long_label}"]
+    for text in _mutations(seeds, "a-Z0./:\nhttps_é", 30000):
+        assert validator(text) == validator.check_regex(text), text
+
+def test_linear_email_matches_regex():
+    validator = get_validator('email')
+    long_part = "first.last-name_" * 4
+    seeds = ["linda@uw.edu", "john.doe@company.com", "a_b-c@x-y.z.museum", "a@b.co", "..@..de"]
+    seeds += [long_part + seed for seed in seeds] + [f"{long_part}@{long_part}.example.com"]
+    for text in _mutations(seeds, "a-Z0._@\n é", 30000):
+        assert validator(text) == validator.check_regex(text), text
+
+def test_linear_url_trailing_newline_like_regex():
+    assert validate_url("google.com\n") == True
+    assert validate_url("google.com/a\n\n") == False
+
+def test_linear_url_length_cap():
+    host = "a" * 60 + "."
+    assert validate_url(host * (MAX_URL_LENGTH // len(host) + 1) + "com") == False
+    assert validate_url("a.com/" + "x" * (MAX_URL_LENGTH - 6)) == True
+
+def test_linear_email_length_cap():
+    assert validate_email("a" * (MAX_EMAIL_LENGTH - 7) + "@uw.edu") == True
+    assert validate_email("a" * (MAX_EMAIL_LENGTH - 6) + "@uw.edu") == False
+
+def test_linear_url_crafted_hostname():
+    assert validate_url("aa." * 600 + "a") == False
+    assert validate_url("a-" * 900 + "a.com") == True
+
+# --- CLASSIFIER ---
+from regex_validators import VALIDATORS, Prefilter, classify, classify_column, register_validator
+
+def _classify_slowly(text):
+    return tuple(name for name, validator in VALIDATORS.items() if validator(text))
+
+def test_classify_single_kinds():
+    assert classify("(253)123-4567") == ('phone',)
+    assert classify("linda@uw.edu") == ('email',)
+    assert classify("$1,234.56") == ('currency',)
+    assert classify("Smith, John") == ('roster_name',)
+
+def test_classify_several_kinds():
+    assert classify("2359") == ('military_time',)
+    assert classify("01-02-2024") == ('date', 'date_dmy')
+    assert classify("union") == ('ion_words',)
+
+def test_classify_nothing():
+    assert classify("") == ()
+    assert classify("hello world") == ()
+
+def test_classify_matches_every_validator():
+    seeds = ["0000", "$1,234.56", "google.com", "123-45-6789", "(253)123-4567", "linda@uw.edu",
+             "Smith, John, L.", "123 Main St", "Seattle, WA 98101", "2/29/2024", "2024-02-29",
+             "31/12/1999", "Ab1!Cd2@Ef", "union", "A, B", "1 A St"]
+    for text in _mutations(seeds, "0123456789-/ ()$,.@:aAzZ\n\t٣ ion", 20000):
+        assert classify(text) == _classify_slowly(text), text
+
+def test_classify_runs_validators_without_prefilter():
+    try:
+        register_validator('test_anything', r'.*')
+        assert classify("") == ('test_anything',)
+        assert classify("été") == ('test_anything',)
+    finally:
+        del VALIDATORS['test_anything']
+        regex_validators._classifier_table = None
+
+def test_classify_uses_registered_prefilter():
+    try:
+        register_validator('test_x', r'^x+$', prefilter=Prefilter('x', min_length=2))
+        assert classify("xx") == ('test_x',)
+        assert classify("x") == ()
+    finally:
+        del VALIDATORS['test_x']
+        regex_validators._classifier_table = None
+
+def test_classify_column_all_values():
+    assert classify_column(["(253)123-4567", "253-123-4567", None, "", "2531234567"]) == ('phone',)
+
+def test_classify_column_one_bad_value():
+    assert classify_column(["(253)123-4567", "253-123-4567", "n/a"]) == ()
+    assert classify_column(["(253)123-4567", "253-123-4567", "n/a"], min_ratio=0.6) == ('phone',)
+
+def test_classify_column_dates_by_ratio():
+    assert classify_column(["01-02-2024", "2024-01-02", "12/31/1999"] * 10, min_ratio=0.6) == ('date',)
+
+def test_classify_column_samples_iterators():
+    assert classify_column(iter(["2359"] * 1000 + ["nope"]), sample_size=50) == ('military_time',)
+
+def test_classify_column_empty():
+    assert classify_column([]) == ()
+    assert classify_column([None, ""]) == ()
+
+def test_classify_column_bad_ratio():
+    with pytest.raises(ValueError):
+        classify_column(["x"], min_ratio=0)
+
+# --- BYTES INPUT ---
+import mmap
+from regex_validators import validate_bytes, validate_spans
+
+def test_bytes_every_kind_matches_str():
+    seeds = ["0000", "$1,234.56", "google.com", "123-45-6789", "(253)123-4567", "linda@uw.edu",
+             "Smith, John, L.", "123 Main St", "Seattle, WA 98101", "2/29/2024", "2024-02-29",
+             "31/12/1999", "Ab1!Cd2@Ef", "union", "1 A St"]
+    for text in _mutations(seeds, "0123456789-/ ()$,.@:aAzZ\n\t٣\x1cé", 5000):
+        raw = text.encode()
+        buffer = b"x\n" + raw + b"9\n"
+        for name, validator in VALIDATORS.items():
+            assert validator.check_bytes(buffer, 2, 2 + len(raw)) == validator(text), (name, text)
+
+def test_bytes_buffer_types():
+    raw = b"id,(253)123-4567,end"
+    for data in (raw, bytearray(raw), memoryview(raw)):
+        assert validate_bytes('phone', data, 3, 16) == True
+        assert validate_bytes('phone', data, 3, 17) == False
+
+def test_bytes_mmap(tmp_path):
+    path = tmp_path / "fields.bin"
+    path.write_bytes(b"123-45-6789|666-12-3456|union")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert validate_spans('ssn', mapped, [(0, 11), (12, 23)]) == bytearray([1, 0])
+        assert validate_bytes('ion_words', mapped, 24) == True
+
+def test_bytes_whole_object():
+    assert validate_bytes('currency', b"$1,234.56") == True
+    assert validate_bytes('date', bytearray(b"02/29/2023")) == False
+
+def test_bytes_offset_is_anchored():
+    # The field starts at the offset even though ^ only matches at 0
+    assert validate_bytes('address', b"xx123 Main St", 2) == True
+    assert validate_bytes('address', b"xx123 Main St", 1) == False
+
+def test_bytes_area_code_and_state_lookups():
+    assert validate_bytes('phone', b"(000)123-4567") == False
+    assert validate_bytes('city_state_zip', b"Nowhere, ZZ 99999") == False
+    assert b"253" in regex_validators.VALID_AREA_CODES_BYTES
+    assert b"WA" in regex_validators.VALID_STATES_BYTES
+
+def test_bytes_unicode_digits_decode():
+    assert validate_bytes('phone', "(253)123-456٣".encode()) == validate_phone("(253)123-456٣")
+
+def test_bytes_invalid_utf8():
+    assert validate_bytes('roster_name', b"Smith, J\xff") == False
+
+def test_bytes_follow_reloaded_reference_data(restore_reference_data):
+    regex_validators.install_reference_data(regex_validators.ReferenceData(["999"], ["ZZ"]))
+    assert validate_bytes('phone', b"(999)123-4567") == True
+    assert validate_bytes('city_state_zip', b"Nowhere, ZZ 99999") == True
+
+def test_bytes_and_str_agree_after_reload(tmp_path, restore_reference_data):
+    rows = [b"(999)123-4567", b"(253)123-4567", b"Oz, ZZ 12345", b"Oz, WA 12345"]
+    kinds = ['phone', 'phone', 'city_state_zip', 'city_state_zip']
+    path = tmp_path / "reference.snapshot"
+    write_reference_snapshot(path, ReferenceData(["999"], ["ZZ"]))
+    for data in (ReferenceData(["999"], ["ZZ"]), load_reference_snapshot(path),
+                 regex_validators.DEFAULT_REFERENCE_DATA):
+        install_reference_data(data)
+        for kind, row in zip(kinds, rows):
+            expected = get_validator(kind).check(row.decode())
+            assert validate_bytes(kind, row) == expected
+            assert validate_bytes(kind, bytearray(b"#" + row), 1) == expected
+            assert validate_bytes(kind, memoryview(row + b"#"), 0, len(row)) == expected
+        assert regex_validators.VALID_AREA_CODES_BYTES == {code.encode() for code in data.area_codes}
+        assert regex_validators.VALID_STATES_BYTES == {state.encode() for state in data.states}
+        assert area_code_valid_at(b"999") == ("999" in data.area_codes)
+
+# --- INSTRUMENTATION ---
+from regex_validators import (disable_metrics, enable_metrics, metrics_snapshot, prometheus_text,
+                              reject_reason, reset_metrics, write_prometheus)
+
+@pytest.fixture
+def phone_metrics():
+    enable_metrics('phone')
+    yield
+    disable_metrics()
+
+def test_metrics_disabled_by_default():
+    assert metrics_snapshot() == {}
+    assert get_validator('phone').check == get_validator('phone').uncached_check
+
+def test_metrics_count_calls_and_reasons(phone_metrics):
+    for text in ("(253)123-4567", "(000)123-4567", "253.123.4567", "(253)123-4567"):
+        validate_phone(text)
+    counters = metrics_snapshot()['phone']
+    assert (counters['calls'], counters['rejects']) == (4, 2)
+    assert counters['reasons'] == {'area_code': 1, 'pattern': 1}
+    assert counters['buckets'][-1] == (float('inf'), 4)
+    assert counters['total_time'] > 0
+
+def test_metrics_count_batch_calls(phone_metrics):
+    validate_many('phone', ["(253)123-4567", "abc"] * 300)
+    assert metrics_snapshot()['phone']['calls'] == 600
+
+def test_metrics_disable_restores_check(phone_metrics):
+    disable_metrics('phone')
+    assert metrics_snapshot() == {}
+    assert validate_phone("(253)123-4567") == True
+
+def test_metrics_with_cache(phone_metrics):
+    enable_cache('phone')
+    try:
+        validate_phone("(253)123-4567")
+        validate_phone("(253)123-4567")
+        assert metrics_snapshot()['phone']['calls'] == 2
+        assert cache_info('phone')['hits'] == 1
+    finally:
+        disable_cache('phone')
+    assert get_validator('phone').metrics is not None
+
+def test_metrics_reset(phone_metrics):
+    validate_phone("abc")
+    reset_metrics()
+    assert metrics_snapshot()['phone']['calls'] == 0
+
+def test_reject_reason_ssn_rules():
+    assert reject_reason('ssn', "123-45-6789") is None
+    assert reject_reason('ssn', "666-12-3456") == 'ssn_area'
+    assert reject_reason('ssn', "123-00-4567") == 'ssn_group'
+    assert reject_reason('ssn', "123-45-0000") == 'ssn_serial'
+    assert reject_reason('ssn', "123-45 6789") == 'pattern'
+
+def test_reject_reason_other_rules():
+    assert reject_reason('city_state_zip', "Nowhere, ZZ 99999") == 'state'
+    assert reject_reason('date', "13/01/2024") == 'month'
+    assert reject_reason('date_dmy', "30/02/2024") == 'day'
+    assert reject_reason('ion_words', "action") == 'even_length'
+    assert reject_reason('url', "a" * (MAX_URL_LENGTH + 1) + ".com") == 'too_long'
+    assert reject_reason('military_time', "2400") == 'pattern'
+
+def test_reject_reason_password():
+    assert reject_reason('password', "Ab1!") == 'too_short'
+    assert reject_reason('password', "Abcdefgh1!") == 'lowercase_run'
+    assert reject_reason('password', "ABCDEFGHIJ1!") == 'missing_lower'
+    assert reject_reason('password', "Ab1!Cd2@Ef") is None
+
+def test_prometheus_text(phone_metrics):
+    validate_phone("(000)123-4567")
+    text = prometheus_text()
+    assert 'regex_validator_calls_total{validator="phone"} 1\n' in text
+    assert 'regex_validator_rejects_total{validator="phone",reason="area_code"} 1\n' in text
+    assert 'regex_validator_latency_seconds_bucket{validator="phone",le="+Inf"} 1\n' in text
+    assert '# TYPE regex_validator_latency_seconds histogram\n' in text
+
+def test_write_prometheus(phone_metrics, tmp_path):
+    path = tmp_path / "validators.prom"
+    write_prometheus(path)
+    assert path.read_text() == prometheus_text()
+
+# --- LAZY CONSTRUCTION ---
+import os
+import subprocess
+import sys
+from regex_validators import SNAPSHOT_ENV, load_reference_snapshot, write_reference_snapshot
+
+_COUNT_COMPILED = """
+import sys, regex_validators as rv
+def compiled():
+    # Reads the slot directly, so an unfilled one does not get compiled here
+    count = 0
+    for validator in rv.VALIDATORS.values():
+        try:
+            rv.Validator.regex.__get__(validator)
+            count += 1
+        except AttributeError:
+            pass
+    return count
+"""
+
+def _fresh_python(code, **env):
+    # Runs code in a new interpreter that imports regex_validators from this directory
+    return subprocess.run([sys.executable, "-c", _COUNT_COMPILED + code],
+                          cwd=os.path.dirname(os.path.abspath(__file__)), env=dict(os.environ, **env),
+                          check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+
+def test_import_builds_no_pattern_and_skips_optional_modules():
+    output = _fresh_python("print(compiled(), [m for m in ('numpy', 'json', 'csv', 'mmap', 'datetime') if m in sys.modules])")
+    assert output == ["0", "[]"]
+
+def test_first_use_compiles_only_that_validator():
+    output = _fresh_python("print(rv.validate_phone('(253)123-4567'), compiled())")
+    assert output == ["True", "1"]
+
+def test_lazy_validator_answers_like_eager():
+    for name in ("ssn", "phone", "date", "ion_words", "url"):
+        eager = get_validator(name)
+        lazy = Validator(name, eager.pattern, eager.rule, eager.regex.flags, eager.lines_regex is not None,
+                         eager.fast, eager.prefilter, eager.bytes_rule, lazy=True)
+        assert lazy.pattern == eager.pattern
+        for text in ("123-45-6789", "(253)123-4567", "2/29/2024", "union", "google.com", "x"):
+            assert lazy(text) == eager(text)
+        assert lazy.check_bytes(b"123-45-6789") == eager.check_bytes(b"123-45-6789")
+
+def test_lazy_registration_defers_pattern_errors():
+    try:
+        validator = register_validator("test_lazy_bad", r"^(unclosed$", lazy=True)
+        with pytest.raises(re.error):
+            validator("x")
+        with pytest.raises(re.error):
+            register_validator("test_lazy_bad", r"^(unclosed$")
+    finally:
+        VALIDATORS.pop("test_lazy_bad", None)
+        regex_validators._classifier_table = None
+
+def test_reference_tables_built_on_first_access():
+    data = ReferenceData(["253", "800"], ["WA"])
+    with pytest.raises(AttributeError):
+        ReferenceData.area_code_table.__get__(data)
+    assert data.area_code_table[253] == 1 and sum(data.area_code_table) == 2
+    assert data.states_bytes == {b"WA"}
+    assert data.area_codes_bytes == {b"253", b"800"}
+    assert sum(data.state_table) == 1
+
+def test_reference_module_attributes_follow_installed_data(restore_reference_data):
+    install_reference_data(ReferenceData(["253"], ["WA"]))
+    assert regex_validators.VALID_AREA_CODES_BYTES == {b"253"}
+    assert sum(regex_validators.AREA_CODE_TABLE) == 1
+    assert sum(regex_validators.STATE_TABLE) == 1
+    with pytest.raises(AttributeError):
+        regex_validators.NO_SUCH_TABLE
+
+def test_reference_rejects_smuggled_entries():
+    with pytest.raises(ValueError):
+        ReferenceData(["201\n202"], [])
+    with pytest.raises(ValueError):
+        ReferenceData([], ["WA\n"])
+
+def test_reference_snapshot_round_trip(tmp_path, restore_reference_data):
+    path = tmp_path / "reference.snapshot"
+    write_reference_snapshot(path, ReferenceData(["253", "800"], ["WA"]))
+    data = load_reference_snapshot(path)
+    assert (data.area_codes, data.states) == ({"253", "800"}, {"WA"})
+    assert data.area_codes_bytes == {b"253", b"800"}
+    assert data.source == str(path)
+    install_reference_data(data)
+    assert validate_phone("(800)555-1234") == True
+    assert validate_phone("(206)555-1234") == False
+    assert area_code_valid_at(b"800") == True
+
+def test_reference_snapshot_bad_file(tmp_path):
+    path = tmp_path / "reference.snapshot"
+    path.write_bytes(b"RVS2garbage")
+    with pytest.raises(ValueError):
+        load_reference_snapshot(path)
+    path.write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        load_reference_snapshot(path)
+
+def test_reference_snapshot_from_environment(tmp_path):
+    path = tmp_path / "reference.snapshot"
+    write_reference_snapshot(path, ReferenceData(["999"], ["ZZ"]))
+    output = _fresh_python("print(rv.validate_phone('(999)123-4567'), rv.validate_phone('(253)123-4567'))",
+                           **{SNAPSHOT_ENV: str(path)})
+    assert output == ["True", "False"]
+
+def test_reference_snapshot_import_skips_default_tables(tmp_path):
+    path = tmp_path / "reference.snapshot"
+    write_reference_snapshot(path, ReferenceData(["999"], ["ZZ"]))
+    output = _fresh_python("print('DEFAULT_REFERENCE_DATA' in vars(rv), '253' in rv.DEFAULT_REFERENCE_DATA.area_codes,"
+                           " rv.current_reference_data() is rv.DEFAULT_REFERENCE_DATA)",
+                           **{SNAPSHOT_ENV: str(path)})
+    assert output == ["False", "True", "False"]
+
+# --- PARSING ---
+import datetime
+from regex_validators import ParseResult, parse_currency, parse_date, parse_phone, parse_ssn, reject_reason
+
+def test_parse_ssn():
+    assert parse_ssn("123-45-6789") == ParseResult(True, None, "123456789")
+    assert parse_ssn("123 45 6789").value == "123456789"
+    assert parse_ssn("123456789\n").value == "123456789"
+    assert parse_ssn("666-12-3456") == ParseResult(False, "ssn_area", None)
+    assert parse_ssn("123-00-4567").reason == "ssn_group"
+    assert parse_ssn("123-45 6789").reason == "pattern"
+
+def test_parse_phone_e164():
+    for text in ("(253)123-4567", "253-123-4567", "253 123 4567", "2531234567", "(253)1234567\n"):
+        assert parse_phone(text).value == "+12531234567", text
+    assert parse_phone("253١٢٣٤٥٦٧").value == "+12531234567"
+    assert parse_phone("(000)123-4567") == ParseResult(False, "area_code", None)
+    assert parse_phone("253.123.4567").reason == "pattern"
+
+def test_parse_currency_cents():
+    assert parse_currency("$0.01").value == 1
+    assert parse_currency("$1,234.56").value == 123456
+    assert parse_currency("$123,456,789.23\n").value == 12345678923
+    assert parse_currency("$12,34.56") == ParseResult(False, "pattern", None)
+
+def test_parse_date():
+    assert parse_date("2/29/2024").value == datetime.date(2024, 2, 29)
+    assert parse_date("12-31-1999").value == datetime.date(1999, 12, 31)
+    assert parse_date("2/29/2023").reason == "day"
+    assert parse_date("13/01/2024").reason == "month"
+    assert parse_date("01/15-2026").reason == "pattern"
+    # Accepted by validate_date, but datetime.date has no year 0
+    assert parse_date("1/1/0000") == ParseResult(True, None, None)
+
+def test_parse_result_unpacks_and_tests_false():
+    valid, reason, value = parse_phone("(000)123-4567")
+    assert (valid, reason, value) == (False, "area_code", None)
+    assert not parse_phone("(000)123-4567")
+    assert parse_phone("(253)123-4567")
+    assert repr(parse_ssn("x")) == "ParseResult(valid=False, reason='pattern', value=None)"
+
+_PARSERS = {"ssn": parse_ssn, "phone": parse_phone, "currency": parse_currency, "date": parse_date}
+
+@pytest.mark.parametrize("kind", sorted(_PARSERS))
+def test_parse_agrees_with_validators(kind):
+    # Random edits of the samples: validity and reason must match validate_*/reject_reason
+    samples = {"ssn": ["123-45-6789", "666-12-3456", "123 45 6789"],
+               "phone": ["(253)123-4567", "253-123-4567", "(000)123-4567"],
+               "currency": ["$1,234.56", "$0.01", "$123,456.78"],
+               "date": ["2/29/2024", "12-31-1999", "02/30/2026"]}[kind]
+    validator = get_validator(kind)
+    rng = random.Random(483)
+    for _ in range(3000):
+        text = rng.choice(samples)
+        pos = rng.randrange(len(text) + 1)
+        text = text[:pos] + rng.choice(_FAST_ALPHABET + "$,./()") + text[pos + rng.randint(0, 1):]
+        result = _PARSERS[kind](text)
+        assert result.valid == validator(text), text
+        assert result.reason == reject_reason(kind, text), text
+        assert (result.value is None) == (not result.valid), text
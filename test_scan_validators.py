@@ -0,0 +1,73 @@
+import pytest
+import regex_validators
+from scan_validators import SCAN_PATTERNS, scan
+
+TEXT = ("Call (253)123-4567 or (000)000-0000. SSN 123-45-6789, not 666-12-3456. "
+        "Mail linda@uw.edu; card 4111 1111 1111 1111, not 4111 1111 1111 1112.")
+
+def _found(text, kinds=None):
+    spans = scan(text) if kinds is None else scan(text, kinds)
+    return [(kind, text[start:end]) for kind, start, end in spans]
+
+def test_scan_finds_default_kinds_in_order():
+    assert _found(TEXT) == [('phone', '(253)123-4567'), ('ssn', '123-45-6789'),
+                            ('email', 'linda@uw.edu'), ('card', '4111 1111 1111 1111')]
+
+def test_scan_spans_pass_the_validators():
+    for kind, start, end in scan(TEXT, ('ssn', 'phone', 'email')):
+        assert regex_validators.get_validator(kind)(TEXT[start:end]) == True
+
+def test_scan_applies_ssn_rules():
+    assert _found("000-12-3456 123-00-4567 123-45-0000 900-12-3456 246813579") == [('ssn', '246813579')]
+
+def test_scan_applies_area_code_rule():
+    assert _found("(253)123-4567 (999)123-4567 253 123 4567", 'phone') == [('phone', '(253)123-4567'), ('phone', '253 123 4567')]
+
+def test_scan_applies_state_rule():
+    # The city part is letters and spaces, so up to a few preceding words are included
+    assert _found("ship to Seattle, WA 98101 or Nowhere, ZZ 99999", 'city_state_zip') == [('city_state_zip', 'ship to Seattle, WA 98101')]
+
+def test_scan_checks_calendar_dates():
+    assert _found("due 2/29/2024, not 2/29/2023 or 13/01/2024", 'date') == [('date', '2/29/2024')]
+
+def test_scan_currency():
+    assert _found("paid $1,234.56 and $12,34.56 and $5.00", 'currency') == [('currency', '$1,234.56'), ('currency', '$5.00')]
+
+def test_scan_card_luhn():
+    assert _found("4111-1111-1111-1111 4111111111111112 378282246310005", 'card') == [
+        ('card', '4111-1111-1111-1111'), ('card', '378282246310005')]
+
+def test_scan_ignores_values_inside_longer_tokens():
+    assert _found("id x123-45-6789 1234-45-6789 123-45-67890 a253-123-4567") == []
+
+def test_scan_rejected_candidate_does_not_hide_later_match():
+    assert _found("666-12-3456 then 123-45-6789") == [('ssn', '123-45-6789')]
+
+def test_scan_rejected_candidate_does_not_hide_other_kind_at_same_offset():
+    assert scan("666 12 3456 7890 10", ('ssn', 'card')) == [('card', 0, 19)]
+    assert scan("666-12-3456 (253)123-4567", ('ssn', 'phone')) == [('phone', 12, 25)]
+
+def test_scan_empty_and_clean_text():
+    assert scan("") == []
+    assert scan("nothing to see here") == []
+
+def test_scan_all_kinds_in_one_pass():
+    text = "Seattle, WA 98101 on 01-15-2026 for $10.00"
+    assert _found(text, tuple(SCAN_PATTERNS)) == [
+        ('city_state_zip', 'Seattle, WA 98101'), ('date', '01-15-2026'), ('currency', '$10.00')]
+
+def test_scan_follows_reloaded_area_codes():
+    previous = regex_validators.install_reference_data(
+        regex_validators.ReferenceData({'999'}, regex_validators.VALID_STATES))
+    try:
+        assert _found("(999)123-4567", 'phone') == [('phone', '(999)123-4567')]
+    finally:
+        regex_validators.install_reference_data(previous)
+
+def test_scan_unknown_kind():
+    with pytest.raises(KeyError):
+        scan("x", ('ssn', 'nope'))
+
+def test_scan_long_runs_without_values():
+    for text in ('a' * 100_000, '1 ' * 50_000, 'a@' * 50_000, 'Seattle ' * 12_500):
+        scan(text, tuple(SCAN_PATTERNS))
@@ -0,0 +1,129 @@
+import pytest
+from regex_validators import Validator, validate_email, validate_phone, validate_ssn
+from schema_validators import Schema
+
+FIELDS = {'name': 'roster_name', 'phone': 'phone', 'email': 'email', 'ssn': 'ssn'}
+GOOD = {'name': "Smith, John", 'phone': "(253)123-4567", 'email': "linda@uw.edu", 'ssn': "123-45-6789"}
+
+def _record(**changes):
+    record = dict(GOOD, **changes)
+    return {key: value for key, value in record.items() if value is not Ellipsis}
+
+RECORDS = [
+    _record(),
+    _record(ssn="000-12-3456"),
+    _record(phone="(000)123-4567", ssn="666-12-3456"),
+    _record(email=None),
+    _record(email=""),
+    _record(email=Ellipsis),
+    _record(name=Ellipsis),
+    _record(phone=None),
+    _record(name="smith, John", email="user@domain"),
+]
+
+def _by_hand(record):
+    email = record.get('email')
+    return [key for key, ok in (('name', record.get('name') == "Smith, John"),
+                                ('phone', record.get('phone') is not None and validate_phone(record['phone'])),
+                                ('email', email in ("", None) or validate_email(email)),
+                                ('ssn', validate_ssn(record['ssn'])))
+            if not ok]
+
+# --- SINGLE RECORDS ---
+
+def test_schema_check_and_errors():
+    schema = Schema(FIELDS, optional=['email'])
+    for record in RECORDS:
+        assert schema.errors(record) == tuple(_by_hand(record)), record
+        assert schema.check(record) == (not _by_hand(record)), record
+        assert schema(record) == schema.check(record)
+
+def test_schema_errors_in_declared_order():
+    schema = Schema(FIELDS, order=['ssn', 'phone', 'email', 'name'])
+    assert schema.errors(_record(name="x", ssn="000-12-3456")) == ('name', 'ssn')
+
+def test_schema_missing_and_none_are_invalid_unless_optional():
+    schema = Schema(FIELDS)
+    assert schema.check(_record(email=None)) == False
+    assert schema.errors(_record(email=Ellipsis)) == ('email',)
+    assert Schema(FIELDS, optional=['email']).check(_record(email=Ellipsis)) == True
+
+def test_schema_check_and_errors_agree_on_none_and_non_str():
+    fields = {'ssn': 'ssn', 'time': 'military_time', 'phone': 'phone',
+              'digits': Validator('test_digits', r'^\d+$', fast=lambda text: text.isdigit())}
+    good = {'ssn': "123-45-6789", 'time': "1200", 'phone': "(253)123-4567", 'digits': "42"}
+    for optional in ((), fields):
+        schema = Schema(fields, optional=optional)
+        for key in fields:
+            record = dict(good, **{key: None})
+            assert schema.check(record) == (not schema.errors(record)) == bool(optional), (key, optional)
+    schema = Schema(fields)
+    for key in ('ssn', 'time', 'phone'):
+        for value in (123, b"1200"):
+            record = dict(good, **{key: value})
+            with pytest.raises(TypeError):
+                schema.errors(record)
+            with pytest.raises(TypeError):
+                schema.check(record)
+
+def test_schema_tuple_records():
+    schema = Schema({0: 'ssn', 2: 'phone'}, optional=[2])
+    assert schema.check(("123-45-6789", "anything", "(253)123-4567")) == True
+    assert schema.check(("123-45-6789",)) == True
+    assert schema.errors(("000-12-3456", "x", "253")) == (0, 2)
+
+def test_schema_rejects_bad_arguments():
+    with pytest.raises(KeyError):
+        Schema({'ssn': 'no_such_validator'})
+    with pytest.raises(ValueError):
+        Schema(FIELDS, optional=['fax'])
+    with pytest.raises(ValueError):
+        Schema(FIELDS, order=['ssn', 'ssn', 'phone', 'name'])
+
+def test_schema_empty():
+    schema = Schema({})
+    assert schema.check({'x': 1}) == True and schema.errors(()) == ()
+    assert list(schema.validate_many([{}, ()])) == [1, 1]
+
+# --- ORDERING ---
+
+def test_schema_tune_puts_selective_checks_first():
+    schema = Schema(FIELDS)
+    records = [_record(phone="(000)123-4567") if i % 2 else _record() for i in range(200)]
+    order = schema.tune(records)
+    assert order[0] == 'phone' and sorted(order) == sorted(FIELDS)
+    assert schema.order == order
+    assert [schema.check(record) for record in records] == [i % 2 == 0 for i in range(200)]
+
+def test_schema_validate_many_tunes_once():
+    schema = Schema(FIELDS)
+    schema.validate_many([_record(ssn="000-12-3456")] * 50)
+    assert schema.order[0] == 'ssn'
+    schema.validate_many([_record(phone="(000)123-4567")] * 50)
+    assert schema.order[0] == 'ssn'
+
+def test_schema_given_order_is_kept():
+    schema = Schema(FIELDS, order=['name', 'email', 'phone', 'ssn'])
+    schema.validate_many([_record(ssn="000-12-3456")] * 50)
+    assert schema.order == ('name', 'email', 'phone', 'ssn')
+
+# --- BULK ---
+
+def test_schema_validate_many_matches_check():
+    schema = Schema(FIELDS, optional=['email'])
+    records = RECORDS * 30
+    assert list(schema.validate_many(records)) == [not _by_hand(record) for record in records]
+    assert list(schema.validate_many(iter(records), chunk_rows=7)) == [not _by_hand(record) for record in records]
+
+def test_schema_validate_many_collect():
+    schema = Schema(FIELDS, optional=['email'])
+    records = RECORDS * 30
+    assert schema.validate_many(records, collect=True, chunk_rows=11) == [tuple(_by_hand(r)) for r in records]
+    assert schema.order == tuple(FIELDS)  # collecting every failure needs no tuning
+
+def test_schema_validate_many_tuples_and_empty():
+    schema = Schema({0: 'phone', 1: 'ssn'})
+    rows = [("(253)123-4567", "123-45-6789"), ("(253)123-4567",), ("(000)123-4567", "000-12-3456")]
+    assert list(schema.validate_many(rows)) == [1, 0, 0]
+    assert schema.validate_many(rows, collect=True) == [(), (1,), (0, 1)]
+    assert schema.validate_many([]) == bytearray()
@@ -0,0 +1,168 @@
+import asyncio
+import socket
+import struct
+import threading
+
+import pytest
+import server_validators
+from regex_validators import VALIDATORS, validate_many
+from server_validators import (ValidationClient, ValidationServer, _decode_request, decode_reply,
+                               encode_request, load_test, main)
+
+ROWS = ["0000", "2359\n", "$1,234.56", "google.com", "123-45-6789", "666-12-3456", "(253)123-4567",
+        "(000)123-4567", "linda@uw.edu", "Smith, John", "123 Main St", "Seattle, WA 98101", "2/29/2024",
+        "2024-02-29", "Ab1!Cd2@Ef", "union", "١٢٣-45-6789", "", "x\ny"]
+
+def _serve(test, address=None, **options):
+    # Runs test(server) in a thread while the server runs on the event loop
+    async def run(path):
+        async with ValidationServer(address or path, **options) as server:
+            return await asyncio.to_thread(test, server)
+    return run
+
+def _run(tmp_path, test, address=None, **options):
+    return asyncio.run(_serve(test, address, **options)(str(tmp_path / "v.sock")))
+
+def _raw_reply(sock):
+    (length,) = struct.unpack('>I', sock.recv(4, socket.MSG_WAITALL))
+    return sock.recv(length, socket.MSG_WAITALL)
+
+# --- PROTOCOL ---
+
+def test_request_round_trip():
+    rows = ["(253)123-4567", "", "é\n", "١٢٣"]
+    message = encode_request('phone', rows)
+    assert struct.unpack('>I', message[:4])[0] == len(message) - 4
+    assert _decode_request(message[4:]) == ('phone', rows, [])
+    assert _decode_request(encode_request('ssn', [])[4:]) == ('ssn', [], [])
+
+def test_malformed_requests():
+    body = encode_request('phone', ["abc"])[4:]
+    for bad in (b'', body[:3], body[:-1], body + b'x', b'\x05ph'):
+        with pytest.raises(ValueError):
+            _decode_request(bad)
+
+def test_invalid_utf8_rows_are_reported():
+    body = b'\x03url' + struct.pack('>4I', 3, 1, 10, 11) + b'\xff' + b'google.com' + b'bing.com/\xc3\xa9'
+    kind, rows, undecodable = _decode_request(body)
+    assert kind == 'url' and rows[1:] == ["google.com", "bing.com/é"] and undecodable == [0]
+
+def test_decode_reply():
+    assert decode_reply(b'\x00\x01\x00') == bytearray([1, 0])
+    with pytest.raises(ValueError, match='boom'):
+        decode_reply(b'\x01boom')
+
+# --- SERVER ---
+
+def test_server_matches_validate_many_for_every_kind(tmp_path):
+    def test(server):
+        with ValidationClient(server.address) as client:
+            return {name: client.validate_many(name, ROWS) for name in VALIDATORS}
+    assert _run(tmp_path, test, workers=1) == {name: validate_many(name, ROWS) for name in VALIDATORS}
+
+def test_server_errors_keep_the_connection(tmp_path):
+    def test(server):
+        with ValidationClient(server.address) as client:
+            with pytest.raises(ValueError, match='unknown validator'):
+                client.validate_many('nope', ["x"])
+            return client.validate_many('ssn', ["123-45-6789", "000-12-3456"])
+    assert _run(tmp_path, test, workers=1) == bytearray([1, 0])
+
+def test_server_rejects_undecodable_rows(tmp_path):
+    def test(server):
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(server.address)
+            body = b'\x03url' + struct.pack('>3I', 2, 1, 1) + b'\xff' + b'g'
+            sock.sendall(struct.pack('>I', len(body)) + body)
+            return decode_reply(_raw_reply(sock))
+    assert _run(tmp_path, test, workers=1) == bytearray([0, 0])
+
+def test_server_pipelined_replies_in_order(tmp_path):
+    requests = [('phone', ["(253)123-4567"] * 3), ('ssn', ["000-12-3456"]), ('email', ["a@b.co", "x"])]
+    def test(server):
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(server.address)
+            sock.sendall(b''.join(encode_request(kind, rows) for kind, rows in requests))
+            return [decode_reply(_raw_reply(sock)) for _ in requests]
+    assert _run(tmp_path, test, workers=1) == [bytearray([1, 1, 1]), bytearray([0]), bytearray([1, 0])]
+
+def test_server_oversized_message(tmp_path, monkeypatch):
+    monkeypatch.setattr(server_validators, 'MAX_MESSAGE_BYTES', 100)
+    def test(server):
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(server.address)
+            sock.sendall(encode_request('phone', ["x" * 200]))
+            with pytest.raises(ValueError, match='limit'):
+                decode_reply(_raw_reply(sock))
+            return sock.recv(1)
+    assert _run(tmp_path, test, workers=1) == b''
+
+def test_server_combines_concurrent_requests(tmp_path):
+    samples = ["(253)123-4567", "253.123.4567", "(000)123-4567"]
+    def test(server):
+        report = asyncio.run(load_test(server.address, 'phone', samples, clients=8, requests=20, rows_per_request=5))
+        return report, server.stats
+    report, stats = _run(tmp_path, test, workers=1)
+    assert len(report.latencies) == 160 and report.rows == 800
+    assert 0 < report.p50 <= report.p99 and report.requests_per_sec > 0
+    assert stats.requests == 160 and stats.rows == 800 and stats.batches < 160
+    report, stats = _run(tmp_path, test, workers=1, batching=False)
+    assert stats.batches == stats.requests == 160
+
+def test_server_single_worker_keeps_serving_during_a_batch(tmp_path, monkeypatch):
+    started, release, finished = threading.Event(), threading.Event(), threading.Event()
+    original = server_validators.regex_validators.validate_many
+
+    def slow_validate_many(kind, rows):
+        started.set()
+        release.wait(5)
+        try:
+            return original(kind, rows)
+        finally:
+            finished.set()
+
+    monkeypatch.setattr(server_validators.regex_validators, 'validate_many', slow_validate_many)
+    def test(server):
+        with socket.socket(socket.AF_UNIX) as busy, ValidationClient(server.address) as other:
+            busy.connect(server.address)
+            busy.sendall(encode_request('phone', ["(253)123-4567"] * 1000))
+            assert started.wait(5)
+            # Answered by the event loop while the batch above is still running
+            with pytest.raises(ValueError, match='unknown validator'):
+                other.validate_many('nope', ["x"])
+            answered_during_batch = not finished.is_set()
+            release.set()
+            return answered_during_batch, decode_reply(_raw_reply(busy))
+    assert _run(tmp_path, test, workers=1) == (True, bytearray([1]) * 1000)
+
+def test_server_worker_pool_over_tcp():
+    def test(server):
+        host, port = server.address
+        assert port != 0
+        with ValidationClient(server.address) as client:
+            return client.validate_many('date', ["2/29/2024", "2/29/2023"] * 5000)
+    result = asyncio.run(_serve(test, ('127.0.0.1', 0), workers=2)(None))
+    assert result == bytearray([1, 0]) * 5000
+
+def test_server_replaces_stale_socket_only(tmp_path):
+    path = tmp_path / "v.sock"
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(str(path))
+    stale.close()
+    def test(server):
+        with ValidationClient(server.address) as client:
+            return client.validate_many('ssn', [""])
+    assert _run(tmp_path, test, workers=1) == bytearray([0])
+    assert not path.exists()
+    regular = tmp_path / "file.sock"
+    regular.write_text("keep")
+    with pytest.raises(OSError):
+        asyncio.run(_serve(lambda server: None, str(regular), workers=1)(None))
+    assert regular.read_text() == "keep"
+
+# --- COMMAND LINE ---
+
+def test_main_usage():
+    assert main([]) == 2
+    assert main(['serve']) == 2
+    assert main(['load', 'x.sock', 'phone', '--clients']) == 2
@@ -0,0 +1,59 @@
+import io
+
+import pytest
+from stream_validators import StreamStats, iter_chunks, validate_csv, validate_rows
+
+CSV_TEXT = (
+    "name,ssn,phone\n"
+    "Ann,123-45-6789,(253)123-4567\n"
+    "Bob,666-12-3456,(253)123-4567\n"
+    "Cy,123-45-6789,(000)000-0000\n"
+    "Di\n"
+)
+
+def test_stream_chunks_are_bounded():
+    chunks = list(iter_chunks(iter(range(25)), chunk_rows=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+def test_stream_chunk_size_must_be_positive():
+    with pytest.raises(ValueError):
+        list(iter_chunks(iter([]), chunk_rows=0))
+
+def test_stream_all_rows_by_index():
+    results = list(validate_csv(io.StringIO(CSV_TEXT), {1: 'ssn', 2: 'phone'}, header=True))
+    assert [(number, failed) for number, row, failed in results] == [
+        (2, ()), (3, (1,)), (4, (2,)), (5, (1, 2)),
+    ]
+
+def test_stream_invalid_only_by_name():
+    results = list(validate_csv(io.StringIO(CSV_TEXT), {'ssn': 'ssn'}, header=True, invalid_only=True))
+    assert [row[0] for number, row, failed in results] == ["Bob", "Di"]
+
+def test_stream_small_chunks_give_same_results():
+    columns = {1: 'ssn', 2: 'phone'}
+    expected = list(validate_csv(io.StringIO(CSV_TEXT), columns, header=True))
+    assert list(validate_csv(io.StringIO(CSV_TEXT), columns, header=True, chunk_rows=1)) == expected
+
+def test_stream_name_without_header():
+    with pytest.raises(ValueError):
+        list(validate_csv(io.StringIO(CSV_TEXT), {'ssn': 'ssn'}))
+
+def test_stream_unknown_header_name():
+    with pytest.raises(ValueError):
+        list(validate_csv(io.StringIO(CSV_TEXT), {'zip': 'ssn'}, header=True))
+
+def test_stream_stats_count_rows():
+    stats = StreamStats()
+    list(validate_csv(io.StringIO(CSV_TEXT), {1: 'ssn'}, header=True, stats=stats))
+    assert stats.rows == 4
+    assert stats.invalid_rows == 2
+    assert stats.rows_per_sec > 0
+
+def test_stream_reads_path(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text("0000\n2400\n")
+    assert [failed for number, row, failed in validate_csv(str(path), {0: 'military_time'})] == [(), (0,)]
+
+def test_stream_rows_iterator():
+    rows = iter([["linda@uw.edu"], ["user@domain"]])
+    assert [failed for number, row, failed in validate_rows(rows, {0: 'email'})] == [(), (0,)]